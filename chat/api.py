@@ -1,10 +1,15 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+from ninja import Query
+from ninja.errors import HttpError
+
 from chat.models import ChatReport
-from chat.schemas import ChatReportIn
+from chat.schemas import ChatMessageBufferStatsOut, ChatMessageListOut, ChatReportIn
 from cores.schemas import MessageOut
-from cores.utils import URLBugFixedRouter
-from users.auth import AuthBearer, has_authority
+from cores.utils import URLBugFixedRouter, censor_text
+from users.auth import AuthBearer, has_authority, is_admin
 
-from .mongodb import get_message
+from .mongodb import chat_message_buffer, get_message, get_messages
 
 router = URLBugFixedRouter(tags=["채팅 관련 API"], auth=AuthBearer())
 
@@ -32,3 +37,47 @@ def report_chat_message(request, body: ChatReportIn):
     has_authority(request, user_id=message_data["sender_id"], self_check=True)
     ChatReport.objects.create(reporter_user_id=request.auth.id, **body.dict())
     return 200, {"message": "success"}
+
+
+@router.get(
+    "/rooms/{room_id}/messages",
+    response={200: ChatMessageListOut},
+    summary="채팅방 이전 메시지 조회(커서 방식)",
+)
+def get_chat_messages(
+    request, room_id: str, before: str = None, limit: int = Query(30, ge=1, le=100)
+):
+    """
+    채팅방 이전 메시지 커서 페이지네이션 조회, 한 번에 30개씩
+    - 처음에는 before 없이 요청해서 가장 최근 메시지를 받고,
+      더 이전 메시지는 응답의 next_cursor를 before로 넣어서 요청
+    - next_cursor가 null이면 첫 메시지까지 모두 받은 것
+    - items는 보낸 순서(오래된 것부터), text는 욕설을 *로 바꾼 메시지
+    """
+    has_authority(request)
+    try:
+        before_id = ObjectId(before) if before else None
+    except (InvalidId, TypeError) as error:
+        raise HttpError(400, "invalid cursor") from error
+
+    messages, next_cursor = get_messages(room_id, before_id, limit)
+    for message in messages:
+        message["message"] = censor_text(message["message"])
+    return 200, {"items": messages, "next_cursor": next_cursor}
+
+
+@router.get(
+    "/message-buffer-stats",
+    response={200: ChatMessageBufferStatsOut},
+    summary="채팅 메시지 저장 버퍼 상태 조회",
+)
+def get_chat_message_buffer_stats(request):
+    """
+    요청을 처리한 서버 프로세스의 채팅 메시지 저장 버퍼 상태 조회, 관리자만 가능
+    - depth: 아직 MongoDB에 저장 안 된 메시지 수, max_depth: 지금까지 가장 많이 쌓였던 수
+    - saved/dropped: 저장한 메시지 수/문서 오류로 버린 메시지 수
+    - failed_flushes: MongoDB 오류로 저장하지 못하고 다시 시도한 횟수
+    - backpressure_waits: 버퍼가 가득 차서 메시지 전송이 기다린 횟수
+    """
+    is_admin(request)
+    return 200, chat_message_buffer.stats()
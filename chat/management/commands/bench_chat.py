@@ -0,0 +1,136 @@
+import asyncio
+import statistics
+import time
+
+import socketio
+from django.core.management.base import BaseCommand
+
+BENCH_TIME_PREFIX = "bench:"
+
+
+class Command(BaseCommand):
+    help = (
+        "채팅 서버 부하 측정: 클라이언트 여러 개가 한 방에 들어가서 메시지를 보내고 "
+        "초당 처리 메시지 수와 fan-out 지연(보낸 뒤 방의 모든 클라이언트가 받기까지) p50/p99를 출력, "
+        "같은 옵션으로 eventlet 서버와 ASGI(uvicorn) 서버를 각각 측정해서 비교, "
+        "--url을 여러 개 주면 클라이언트를 채팅 서버 프로세스마다 나눠서 접속(메시지 큐로 방을 공유할 때)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url", nargs="+", default=["http://127.0.0.1:8000"], help="채팅 서버 주소들"
+        )
+        parser.add_argument(
+            "--token", required=True, help="접속할 사용자의 JWT 액세스 토큰(로그인 응답의 access_token)"
+        )
+        parser.add_argument("--clients", type=int, default=50, help="방에 들어가는 클라이언트 수")
+        parser.add_argument(
+            "--senders", type=int, default=5, help="그중 메시지를 보내는 클라이언트 수"
+        )
+        parser.add_argument(
+            "--messages", type=int, default=200, help="보내는 클라이언트당 메시지 수"
+        )
+        parser.add_argument(
+            "--rate", type=float, default=0, help="보내는 클라이언트당 초당 메시지 수(0이면 최대한 빨리)"
+        )
+        parser.add_argument(
+            "--room", default="bench", help="측정용 채팅방, 메시지는 MongoDB에 저장됨"
+        )
+        parser.add_argument("--timeout", type=float, default=60)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run_benchmark(**options))
+
+    async def connect_clients(self, options, on_message):
+        clients = []
+        for index in range(options["clients"]):
+            client = socketio.AsyncClient(reconnection=False)
+            client.on("add_message", on_message)
+            clients.append(client)
+        urls = options["url"]
+        await asyncio.gather(
+            *(
+                client.connect(
+                    urls[index % len(urls)],
+                    auth={"token": options["token"]},
+                    transports=["websocket"],
+                )
+                for index, client in enumerate(clients)
+            )
+        )
+        for index, client in enumerate(clients):
+            await client.emit(
+                "join", {"room": options["room"], "nickname": f"bench{index}"}
+            )
+        return clients
+
+    async def send_messages(self, client, index, options):
+        interval = 1 / options["rate"] if options["rate"] else 0
+        for number in range(options["messages"]):
+            await client.emit(
+                "send_message",
+                (
+                    f"bench message {number}",
+                    f"bench{index}",
+                    options["room"],
+                    f"{BENCH_TIME_PREFIX}{time.perf_counter()}",
+                    "none",
+                    "",
+                    # 보낸 사람 id는 서버가 연결할 때 인증한 사용자로 정함
+                    None,
+                ),
+            )
+            await asyncio.sleep(interval)
+
+    async def run_benchmark(self, **options):
+        latencies = []
+        expected = options["clients"] * options["senders"] * options["messages"]
+        received_all = asyncio.Event()
+
+        async def on_message(data):
+            sent_at = str(data.get("time", ""))
+            if not sent_at.startswith(BENCH_TIME_PREFIX):
+                return
+            latencies.append(
+                time.perf_counter() - float(sent_at[len(BENCH_TIME_PREFIX) :])
+            )
+            if len(latencies) >= expected:
+                received_all.set()
+
+        clients = await self.connect_clients(options, on_message)
+        # 입장 메시지가 모두 지나간 뒤에 측정 시작
+        await asyncio.sleep(1)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(
+            *(
+                self.send_messages(client, index, options)
+                for index, client in enumerate(clients[: options["senders"]])
+            )
+        )
+        sent_seconds = time.perf_counter() - started_at
+        try:
+            await asyncio.wait_for(received_all.wait(), options["timeout"])
+        except asyncio.TimeoutError:
+            pass
+        delivered_seconds = time.perf_counter() - started_at
+        await asyncio.gather(*(client.disconnect() for client in clients))
+
+        sent = options["senders"] * options["messages"]
+        self.stdout.write(
+            f"servers={len(options['url'])} "
+            f"clients={options['clients']} senders={options['senders']} "
+            f"sent={sent} delivered={len(latencies)}/{expected}"
+        )
+        self.stdout.write(
+            f"messages/sec={sent / delivered_seconds:.1f} "
+            f"(send only: {sent / sent_seconds:.1f}) "
+            f"deliveries/sec={len(latencies) / delivered_seconds:.1f}"
+        )
+        if len(latencies) >= 2:
+            percentiles = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f"fan-out latency p50={percentiles[49] * 1000:.1f}ms "
+                f"p99={percentiles[98] * 1000:.1f}ms "
+                f"max={max(latencies) * 1000:.1f}ms"
+            )
@@ -0,0 +1,55 @@
+import asyncio
+import pickle
+from collections import defaultdict
+from typing import Optional
+from urllib.parse import urlparse
+
+import socketio
+from socketio.asyncio_pubsub_manager import AsyncPubSubManager
+
+
+class AsyncMemoryPubSubManager(AsyncPubSubManager):
+    """
+    같은 프로세스 안의 채팅 서버(AsyncServer)끼리 메시지를 주고받는 client manager
+    - Redis 없이 여러 서버가 방을 공유하는 동작을 확인하는 테스트, 로컬 개발용
+    - 같은 channel을 쓰는 서버끼리만 메시지를 주고받음
+    """
+
+    name = "memory"
+    _subscribers = defaultdict(set)
+
+    async def _publish(self, data):
+        message = pickle.dumps(data)
+        for queue in list(self._subscribers[self.channel]):
+            queue.put_nowait(message)
+
+    async def _listen(self):
+        queue = asyncio.Queue()
+        self._subscribers[self.channel].add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[self.channel].discard(queue)
+
+
+def get_client_manager(url: str, channel: str) -> Optional[socketio.AsyncManager]:
+    """
+    메시지 큐 주소로 채팅 서버의 client manager를 만듦
+    - 빈 값이면 None(방과 접속 정보를 프로세스 메모리에만 두는 기본 manager, 채팅 서버 프로세스 하나)
+    - redis://, rediss://: Redis pub/sub(redis 패키지의 redis.asyncio 사용)
+    - amqp://: RabbitMQ(aio_pika 패키지 필요)
+    - memory://: 같은 프로세스 안에서만 공유(AsyncMemoryPubSubManager)
+    - 어느 프로세스에서 보낸 emit(..., to=room)도 모든 프로세스의 방 참가자에게 전달됨,
+      세션(save_session)은 접속한 프로세스에만 있으므로 로드밸런서는 websocket만 쓰거나 sticky session 사용
+    """
+    if not url:
+        return None
+    scheme = urlparse(url).scheme
+    if scheme in ("redis", "rediss"):
+        return socketio.AsyncRedisManager(url, channel=channel)
+    if scheme == "amqp":
+        return socketio.AsyncAioPikaManager(url, channel=channel)
+    if scheme == "memory":
+        return AsyncMemoryPubSubManager(channel=channel)
+    raise ValueError(f"unsupported chat message queue url: {url}")
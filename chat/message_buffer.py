@@ -0,0 +1,205 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+import bson
+from bson import ObjectId
+from bson.errors import InvalidDocument
+from pymongo.errors import BulkWriteError, PyMongoError
+
+DUPLICATE_KEY_ERROR = 11000
+SHUTDOWN_FLUSH_ATTEMPTS = 3
+# MongoDB 오류가 아닌 예외로 저장에 연달아 실패하면 이 횟수 뒤에 그 메시지들을 버림
+MAX_FLUSH_ERRORS = 3
+
+
+def is_encodable(document: dict) -> bool:
+    try:
+        bson.encode(document)
+    except (InvalidDocument, OverflowError):
+        return False
+    return True
+
+
+class ChatMessageBuffer:
+    """
+    채팅 메시지 write-behind 버퍼(채팅 서버 프로세스 메모리, asyncio)
+    - ObjectId를 서버에서 바로 만들어서 message_id는 MongoDB 왕복 없이 반환
+    - max_batch개가 모이거나 flush_interval초가 지나면 insert_many(ordered=False) 한 번으로 저장
+    - 저장이 밀려서 저장 안 된 메시지가 max_pending개 이상이면 add()가 자리가 날 때까지 기다림(backpressure)
+    - 연결 오류 등으로 저장하지 못한 메시지는 버퍼에 되돌려서 다시 저장,
+      이미 저장된 메시지는 _id가 같아서 중복 키 오류로 걸러짐
+    - 문서 자체의 오류(중복 키 외)로 저장되지 않는 메시지는 버리고 dropped로 셈,
+      BSON으로 바꿀 수 없는 메시지는 add()에서 바로 거부함
+    - close(): 서버 종료(ASGI lifespan shutdown) 때 남은 메시지를 모두 저장
+    """
+
+    def __init__(
+        self, collection, max_batch: int, flush_interval: float, max_pending: int
+    ):
+        self.collection = collection
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[ObjectId, dict] = {}
+        self._flushing: Dict[ObjectId, dict] = {}
+        self._stats = Counter()
+        self._loop = None
+        self._closed = False
+        self._error_streak = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending) + len(self._flushing)
+
+    def _ensure_started(self):
+        # asyncio 객체는 만든 이벤트 루프에서만 쓸 수 있으므로 처음 쓰는 루프에서 만듦
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._flush_lock = asyncio.Lock()
+        self._space = asyncio.Condition()
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self._flusher = loop.create_task(self._run())
+
+    async def add(self, document: dict) -> str:
+        """
+        메시지를 버퍼에 넣고 새로 만든 ObjectId 문자열을 반환
+        - BSON으로 바꿀 수 없는 메시지(8바이트를 넘는 정수 등)는 InvalidDocument 예외
+        """
+        if not is_encodable(document):
+            self._stats["dropped"] += 1
+            raise InvalidDocument("chat message cannot be encoded")
+        self._ensure_started()
+        if self.depth >= self.max_pending:
+            self._stats["backpressure_waits"] += 1
+            async with self._space:
+                await self._space.wait_for(lambda: self.depth < self.max_pending)
+
+        document["_id"] = ObjectId()
+        self._pending[document["_id"]] = document
+        self._stats["max_depth"] = max(self._stats["max_depth"], self.depth)
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+        return str(document["_id"])
+
+    def get(self, message_id: ObjectId) -> Optional[dict]:
+        """
+        아직 저장 안 된 메시지 조회
+        """
+        return self._pending.get(message_id) or self._flushing.get(message_id)
+
+    async def _run(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not await self._flush_once():
+                # MongoDB가 응답하지 않으면 바로 다시 시도하지 않음
+                await asyncio.sleep(self.flush_interval)
+
+    async def _flush_once(self) -> bool:
+        """
+        모아둔 메시지를 한 번 저장하고, 다시 시도할 메시지가 없으면 True를 반환
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return True
+            self._flushing, self._pending = self._pending, {}
+            documents = list(self._flushing.values())
+            retry, failed = self._flushing, []
+            started_at = time.perf_counter()
+            try:
+                await self.collection.insert_many(documents, ordered=False)
+                retry, self._error_streak = {}, 0
+            except BulkWriteError as error:
+                retry, self._error_streak = {}, 0
+                failed = [
+                    documents[write_error["index"]]
+                    for write_error in error.details["writeErrors"]
+                    if write_error["code"] != DUPLICATE_KEY_ERROR
+                ]
+                self._stats["dropped"] += len(failed)
+            except PyMongoError:
+                self._stats["failed_flushes"] += 1
+            except Exception:
+                # MongoDB에 보내기 전의 오류(BSON 변환 등), 같은 메시지로 계속 실패하지 않도록
+                # 바꿀 수 없는 메시지는 버리고, 연달아 실패하면 나머지도 버림
+                self._stats["failed_flushes"] += 1
+                self._error_streak += 1
+                if self._error_streak >= MAX_FLUSH_ERRORS:
+                    failed, self._error_streak = documents, 0
+                else:
+                    failed = [
+                        document for document in documents if not is_encodable(document)
+                    ]
+                failed_ids = {document["_id"] for document in failed}
+                retry = {
+                    message_id: document
+                    for message_id, document in retry.items()
+                    if message_id not in failed_ids
+                }
+                self._stats["dropped"] += len(failed)
+            finally:
+                elapsed_ms = (time.perf_counter() - started_at) * 1000
+                self._stats["flushes"] += 1
+                self._stats["flush_total_ms"] += elapsed_ms
+                self._stats["flush_max_ms"] = max(
+                    self._stats["flush_max_ms"], elapsed_ms
+                )
+                # 실패한 메시지가 새로 들어온 메시지보다 먼저 저장되도록 앞에 둠
+                self._pending = {**retry, **self._pending}
+                self._flushing = {}
+            self._stats["saved"] += len(documents) - len(retry) - len(failed)
+
+        async with self._space:
+            self._space.notify_all()
+        return not retry
+
+    async def flush(self) -> bool:
+        """
+        지금까지 모아둔 메시지를 바로 저장, 모두 저장했으면 True
+        """
+        self._ensure_started()
+        return await self._flush_once()
+
+    async def close(self):
+        """
+        주기적인 저장을 멈추고 남은 메시지를 저장, 실패하면 SHUTDOWN_FLUSH_ATTEMPTS번까지 다시 시도
+        """
+        if self._loop is None:
+            return
+        self._closed = True
+        # 저장 중이면 끝날 때까지 기다렸다가 주기적인 저장을 멈춤
+        async with self._flush_lock:
+            self._flusher.cancel()
+        await asyncio.gather(self._flusher, return_exceptions=True)
+        for _ in range(SHUTDOWN_FLUSH_ATTEMPTS):
+            if await self._flush_once():
+                break
+            await asyncio.sleep(self.flush_interval)
+        self._loop = None
+
+    def stats(self) -> dict:
+        flushes = self._stats["flushes"]
+        return {
+            "depth": self.depth,
+            "max_depth": self._stats["max_depth"],
+            "saved": self._stats["saved"],
+            "dropped": self._stats["dropped"],
+            "flushes": flushes,
+            "failed_flushes": self._stats["failed_flushes"],
+            "backpressure_waits": self._stats["backpressure_waits"],
+            "avg_flush_ms": (
+                round(self._stats["flush_total_ms"] / flushes, 3) if flushes else 0.0
+            ),
+            "max_flush_ms": round(self._stats["flush_max_ms"], 3),
+        }
+
+    def reset_stats(self):
+        self._stats = Counter()
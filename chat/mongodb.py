@@ -1,40 +1,122 @@
+import asyncio
 import os
 from datetime import datetime, timezone
+from typing import Optional, Tuple
 
 from bson import ObjectId
 from bson.errors import InvalidId
 from django.conf import settings
-from pymongo import DESCENDING, MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel, MongoClient
+from pymongo.errors import PyMongoError
+
+from .message_buffer import ChatMessageBuffer
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "togedog_dj.settings")
 
-client = MongoClient(settings.MONGODB_ADDRESS)
+# created_at을 UTC 시간대가 있는 datetime으로 읽음
+client = MongoClient(settings.MONGODB_ADDRESS, tz_aware=True)
 
 chat_db = client.get_database("mbtichat")
 messages_collection = chat_db.get_collection("messages")
 room_members_collection = chat_db.get_collection("room_members")
 
+# 방별 최신순 메시지 조회(get_messages)에 쓰는 인덱스, 채팅 서버가 시작할 때 ensure_indexes()로 만듦
+# 만들지 못하면 ENSURE_INDEXES_RETRY_INTERVAL초마다 다시 시도
+ENSURE_INDEXES_RETRY_INTERVAL = 30
+MESSAGE_INDEXES = [
+    IndexModel([("room_id", ASCENDING), ("_id", DESCENDING)], name="room_id_1__id_-1"),
+]
+# 채팅 기록에서 클라이언트가 화면에 그리는 필드만 읽음
+MESSAGE_HISTORY_PROJECTION = {
+    "message": True,
+    "sender_nickname": True,
+    "sender_id": True,
+    "created_at": True,
+}
+
+# 채팅 서버(chat.socketio, asyncio)용 비동기 클라이언트, 실제 연결은 처음 요청할 때 맺음
+async_client = AsyncIOMotorClient(settings.MONGODB_ADDRESS)
+async_messages_collection = async_client.get_database("mbtichat").get_collection(
+    "messages"
+)
+
+chat_message_buffer = ChatMessageBuffer(
+    async_messages_collection,
+    max_batch=settings.CHAT_MESSAGE_BATCH_SIZE,
+    flush_interval=settings.CHAT_MESSAGE_FLUSH_INTERVAL_MS / 1000,
+    max_pending=settings.CHAT_MESSAGE_BUFFER_MAX_PENDING,
+)
+
+
+async def ensure_indexes():
+    """
+    메시지 컬렉션에 MESSAGE_INDEXES를 만듦, 이미 같은 인덱스가 있으면 그대로 둠
+    """
+    await async_messages_collection.create_indexes(MESSAGE_INDEXES)
+
+
+async def retry_ensure_indexes(interval: float = ENSURE_INDEXES_RETRY_INTERVAL):
+    while True:
+        try:
+            await ensure_indexes()
+            return
+        except PyMongoError:
+            await asyncio.sleep(interval)
+
+
+async def start_ensure_indexes():
+    """
+    서버가 시작할 때(ASGI lifespan startup) 인덱스 생성을 백그라운드 작업으로 시작
+    - startup이 실패하면 Django API까지 서버 전체가 뜨지 않으므로 MongoDB에 연결할 수 없어도 기다리지 않음
+    """
+    asyncio.get_running_loop().create_task(retry_ensure_indexes())
 
-def save_message(message, nickname, sender_id, room_id):
-    return str(
-        messages_collection.insert_one(
-            {
-                "message": message,
-                "sender_nickname": nickname,
-                "sender_id": sender_id,
-                "room_id": room_id,
-                "created_at": datetime.now(timezone.utc),
-            }
-        ).inserted_id
+
+def normalize_room_id(room_id) -> str:
+    """
+    채팅방 id를 문자열로 맞춤, socket.io 클라이언트는 방 번호를 숫자나 문자열로 보냄
+    """
+    return str(room_id)
+
+
+def room_id_filter(room_id):
+    """
+    room_id 방 메시지 조회 조건, 문자열로 맞추기 전에 숫자로 저장된 메시지도 찾음
+    """
+    room_id = normalize_room_id(room_id)
+    if room_id.isdigit():
+        return {"$in": [room_id, int(room_id)]}
+    return room_id
+
+
+async def save_message(message, nickname, sender_id, room_id):
+    """
+    채팅 메시지를 저장 버퍼에 넣고 ObjectId 문자열을 바로 반환
+    - MongoDB에는 chat_message_buffer가 모아서 insert_many로 저장함
+    """
+    return await chat_message_buffer.add(
+        {
+            "message": message,
+            "sender_nickname": nickname,
+            "sender_id": sender_id,
+            "room_id": normalize_room_id(room_id),
+            "created_at": datetime.now(timezone.utc),
+        }
     )
 
 
 def get_message(message_id):
+    """
+    - 아직 버퍼에 있는(MongoDB에 저장되기 전) 메시지도 찾음
+    """
     try:
-        message_data = messages_collection.find_one({"_id": ObjectId(message_id)})
+        object_id = ObjectId(message_id)
     except InvalidId:
         return False
-    return message_data
+    return chat_message_buffer.get(object_id) or messages_collection.find_one(
+        {"_id": object_id}
+    )
 
 
 def add_room_member(room_id, user_id):
@@ -54,14 +136,24 @@ def remove_room_member(room_id, user_id):
     )
 
 
-def get_messages(room_id, page_size=10, page=0):
-    offset = page * page_size
+def get_messages(
+    room_id, before: Optional[ObjectId] = None, limit: int = 30
+) -> Tuple[list, Optional[str]]:
+    """
+    room_id 방에서 before보다 먼저 보낸 메시지를 최근 것부터 limit개 가져와서 보낸 순서로 반환
+    - (room_id, _id) 인덱스를 따라 읽으므로 앞 페이지를 건너뛰는(skip) 비용이 없음
+    - limit + 1개를 읽어서 더 이전 메시지가 있을 때만 next_cursor(가져온 메시지 중 가장 오래된 id)를 만듦
+    """
+    query = {"room_id": room_id_filter(room_id)}
+    if before is not None:
+        query["_id"] = {"$lt": before}
     messages = list(
-        messages_collection.find({"room_id": room_id})
+        messages_collection.find(query, MESSAGE_HISTORY_PROJECTION)
         .sort("_id", DESCENDING)
-        .limit(page_size)
-        .skip(offset)
+        .limit(limit + 1)
     )
-    for message in messages:
-        message["created_at"] = message["created_at"].strftime("%d %b, %H:%M")
-    return messages[::-1]
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_cursor = str(messages[-1]["_id"])
+    return messages[::-1], next_cursor
@@ -1,4 +1,8 @@
-from ninja import Schema
+from datetime import datetime
+from typing import List, Optional
+
+from ninja import Field, Schema
+from pydantic import validator
 
 
 class ChatReportIn(Schema):
@@ -6,3 +10,32 @@ class ChatReportIn(Schema):
     message_id: str
     message_text: str
     content: str
+
+
+class ChatMessageOut(Schema):
+    message_id: str = Field(..., alias="_id")
+    sender_id: Optional[int]
+    sender_nickname: str
+    text: str = Field(..., alias="message")
+    created_at: datetime
+
+    @validator("message_id", pre=True)
+    def validate_message_id(cls, value):
+        return str(value)
+
+
+class ChatMessageListOut(Schema):
+    items: List[ChatMessageOut]
+    next_cursor: Optional[str]
+
+
+class ChatMessageBufferStatsOut(Schema):
+    depth: int
+    max_depth: int
+    saved: int
+    dropped: int
+    flushes: int
+    failed_flushes: int
+    backpressure_waits: int
+    avg_flush_ms: float
+    max_flush_ms: float
@@ -1,93 +1,212 @@
+import asyncio
 import os
+from http.cookies import SimpleCookie
+from typing import Optional
+from urllib.parse import urlparse
 
 import django
 import socketio
+from asgiref.sync import sync_to_async
+from bson.errors import InvalidDocument
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections
+from ninja.errors import HttpError
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "togedog_dj.settings")
 django.setup()
 
 from cores.models import UserStatus
-from cores.utils import censor_text
+from cores.profanity import bad_word_store
+from users.auth import chat_jwt_authenticator
 from users.models import User
 
-from .mongodb import save_message
+from .managers import get_client_manager
+from .mongodb import normalize_room_id, save_message
 
-sio = socketio.Server(
-    async_mode="eventlet",
+ADMIN_NICKNAME = "함께하개 관리자"
+
+
+def check_user_backend(queue_url: str, user_backend):
+    """
+    채팅 서버 프로세스가 여러 개(CHAT_MESSAGE_QUEUE_URL 사용)면 연결 인증용 사용자 캐시도 프로세스 사이에 공유해야 함
+    - 프로세스 메모리 캐시면 한 프로세스에서 차단한 사용자가 다른 프로세스에서는 캐시가 만료될 때까지 연결됨
+    - CACHES에 Redis 등 공유 캐시를 설정하지 않았으면 ImproperlyConfigured
+    """
+    if not queue_url or urlparse(queue_url).scheme == "memory":
+        return
+    if not getattr(user_backend, "is_shared", True):
+        raise ImproperlyConfigured(
+            "CHAT_MESSAGE_QUEUE_URL requires a shared user cache (CACHES with Redis)"
+        )
+
+
+check_user_backend(settings.CHAT_MESSAGE_QUEUE_URL, chat_jwt_authenticator.user_backend)
+
+# ASGI(uvicorn)에서 실행되는 asyncio 채팅 서버, togedog_dj.asgi에서 Django 앱과 함께 서비스
+# CHAT_MESSAGE_QUEUE_URL을 설정하면 여러 채팅 서버 프로세스가 메시지 큐로 방을 공유
+sio = socketio.AsyncServer(
+    async_mode="asgi",
+    client_manager=get_client_manager(
+        settings.CHAT_MESSAGE_QUEUE_URL, settings.CHAT_MESSAGE_QUEUE_CHANNEL
+    ),
     cors_allowed_origins=settings.CORS_ALLOWED_ORIGINS,
 )
 
 
+def get_handshake_token(environ, auth) -> Optional[str]:
+    """
+    socket.io 연결 요청의 JWT 액세스 토큰
+    - 클라이언트가 auth={"token": 액세스 토큰}으로 넘긴 값, 없으면 로그인할 때 저장된 access_token 쿠키
+    """
+    if isinstance(auth, dict) and auth.get("token"):
+        return str(auth["token"])
+    cookie = SimpleCookie()
+    cookie.load(environ.get("HTTP_COOKIE", ""))
+    if "access_token" in cookie:
+        return cookie["access_token"].value
+    return None
+
+
+def authenticate_handshake(environ, auth) -> Optional[User]:
+    """
+    REST API와 같은 JWT 검증(chat_jwt_authenticator)으로 연결한 사용자를 확인, 인증 실패나 차단된 사용자면 None
+    - 사용자는 프로세스 사이에 공유되는 캐시(users.cache.chat_user_backend)에 두므로
+      재접속이 몰려도 캐시가 만료될 때까지 사용자당 DB 조회는 한 번
+    - 사용자가 차단되면 users.signals에서 공유 캐시를 지우므로 모든 채팅 서버 프로세스에서 다음 연결부터 거부됨
+    """
+    token = get_handshake_token(environ, auth)
+    if not token:
+        return None
+    try:
+        user = chat_jwt_authenticator.authenticate_token(token)
+    except HttpError:
+        return None
+    if user.status == UserStatus.BANNED.value:
+        return None
+    return user
+
+
+def authenticate_handshake_in_worker(environ, auth) -> Optional[User]:
+    """
+    워커 스레드에서 authenticate_handshake를 실행
+    - socket.io 이벤트에는 Django 요청 시작/끝 신호가 없으므로 HTTP 요청처럼
+      앞뒤로 close_old_connections를 불러서 끊기거나 오래된 DB 연결을 닫음(DB 재시작 후에도 다시 연결)
+    """
+    close_old_connections()
+    try:
+        return authenticate_handshake(environ, auth)
+    finally:
+        close_old_connections()
+
+
+# 욕설 목록 버전을 확인하는 백그라운드 작업, 한 번에 하나만 실행
+_bad_words_refresh: Optional[asyncio.Task] = None
+
+
+def censor_message(text: str) -> str:
+    """
+    채팅 메시지의 욕설을 현재 욕설 목록 스냅샷으로 이벤트 루프에서 바로 가림
+    - 메시지마다 스레드로 넘기면 Django의 sync_to_async 스레드 하나에 모든 메시지가 줄을 섬
+    - 목록 버전 확인(DB 조회)이 필요하면 백그라운드 작업으로 맡기고, 새 목록은 그 뒤 메시지부터 적용됨
+    """
+    global _bad_words_refresh
+    if bad_word_store.needs_refresh() and (
+        _bad_words_refresh is None or _bad_words_refresh.done()
+    ):
+        _bad_words_refresh = asyncio.get_running_loop().create_task(
+            sync_to_async(bad_word_store.refresh)()
+        )
+    return bad_word_store.get_cached_matcher().censor(text)
+
+
 @sio.event
-def connect(sid, environ, auth):
+async def connect(sid, environ, auth):
     """
     socket.io 클라이언트가 연결되면 아래 코드를 실행한다
-    - environ: http 헤더를 포함한 http 리퀘스트 데이터를 담는 WSGI 표준 딕셔너리
-    - auth: 클라이언트에서 넘겨준 인증 데이터, 데이터가 없으면 None이 된다
+    - environ: http 헤더를 포함한 http 리퀘스트 데이터를 담는 ASGI scope 기반 딕셔너리
+    - auth: 클라이언트에서 넘겨준 인증 데이터({"token": JWT 액세스 토큰}), 데이터가 없으면 None이 된다
+    - 캐시(Redis)나 DB를 조회하므로 이벤트 루프를 막지 않도록 스레드 풀에서 실행,
+      thread_sensitive=False라서 재접속이 몰려도 연결 인증이 스레드 하나에 줄을 서지 않음
+    - 인증한 사용자 id를 세션에 저장해서 메시지 보낸 사람으로 씀
     """
-    user = User.objects.filter(id=auth["userId"])
-    if not user.exists() or user.get().status == UserStatus.BANNED.value:
+    user = await sync_to_async(
+        authenticate_handshake_in_worker, thread_sensitive=False
+    )(environ, auth)
+    if user is None:
         return False
+    await sio.save_session(sid, {"user_id": user.id})
 
 
 @sio.on("join")
-def handle_join(sid, data):
+async def handle_join(sid, data):
     """
     유저가 인증을 통과하여 채팅방에 입장하면 아래 코드를 실행한다
     브라우저에서 채팅방 입장시 connect 이벤트를 거쳐서 join 이벤트가 발생한다
-    - save_session(sid, data): 채팅방에 접속한 클라이언트의 sid를 기준으로 data를 세션 데이터로 저장
+    - session(sid): 채팅방에 접속한 클라이언트의 sid별 세션 데이터에 닉네임과 방 번호를 추가
     """
-    sio.save_session(sid, data)
-    sio.enter_room(sid, room=data["room"])
+    room = normalize_room_id(data["room"])
+    async with sio.session(sid) as session:
+        session.update(nickname=data["nickname"], room=room)
+    sio.enter_room(sid, room=room)
 
-    sio.emit(
+    await sio.emit(
         "add_message",
-        {
-            "user_nickname": "함께하개 관리자", 
-            "text": f"{data['nickname']}님이 들어왔어요."
-        },
-        to=data["room"],
+        {"user_nickname": ADMIN_NICKNAME, "text": f"{data['nickname']}님이 들어왔어요."},
+        to=room,
     )
 
 
 @sio.on("send_message")
-def handle_send_message(
+async def handle_send_message(
     sid, message, nickname, room, currentTime, userMbti, userImage, userId
 ):
     """
     send_message 이벤트로 받은 데이터를 MongoDB에 저장하고 add_message로 emit한다
-    - censor_text(): 욕설 필터링 함수, 채팅 메시지에 욕설이 있으면
+    - censor_message(): 욕설 필터링 함수, 채팅 메시지에 욕설이 있으면
     - 그 부분만 *으로 수정한 문자열을 반환함
-    - save_message(): MongoDB에 메시지 데이터를 저장하고 고유한 ObjectId(24자리 문자열)반환
+    - save_message(): 메시지를 저장 버퍼에 넣고 고유한 ObjectId(24자리 문자열)를 바로 반환,
+      MongoDB 저장은 버퍼가 모아서 함
+    - 보낸 사람은 클라이언트가 보낸 userId가 아니라 연결할 때 인증한 사용자
+    - 저장할 수 없는 메시지(8바이트를 넘는 정수 등)는 보내지 않음
     """
+    session = await sio.get_session(sid)
+    user_id = session["user_id"]
+    room = normalize_room_id(room)
+    try:
+        message_id = await save_message(message, nickname, user_id, room)
+    except InvalidDocument:
+        return
     data = {
         "user_nickname": nickname,
-        "user_id": userId,
+        "user_id": user_id,
         "user_mbti": userMbti,
         "user_image": userImage,
-        "text": censor_text(message),
-        "message_id": save_message(message, nickname, userId, room),
+        "text": censor_message(message),
+        "message_id": message_id,
         "time": currentTime,
     }
-    sio.emit("add_message", data, to=room)
+    await sio.emit("add_message", data, to=room)
 
 
 @sio.event
-def disconnect(sid):
+async def disconnect(sid):
     """
     socket.io 클라이언트가 연결 해제되면 아래 코드를 실행한다
     - get_session(sid): 위에서 save_session으로 저장한 sid별 세션 데이터 딕셔너리를 반환함
     - disconnected_username: 연결 해제된 sid의 유저 닉네임
-    - room_number: 연결 해제된 sid가 있던 방 번호
+    - room_number: 연결 해제된 sid가 있던 방 번호, 채팅방에 들어가기 전이면 알리지 않음
     """
-    disconnected_username = sio.get_session(sid).get("nickname", "")
-    room_number = sio.get_session(sid).get("room")
-    sio.emit(
+    session = await sio.get_session(sid)
+    disconnected_username = session.get("nickname", "")
+    room_number = session.get("room")
+    if room_number is None:
+        return
+    await sio.emit(
         "add_message",
         {
-            "user_nickname": "함께하개 관리자", 
-            "text": f"{disconnected_username}님이 퇴장하셨어요."
+            "user_nickname": ADMIN_NICKNAME,
+            "text": f"{disconnected_username}님이 퇴장하셨어요.",
         },
         to=room_number,
     )
@@ -1,11 +1,37 @@
+import asyncio
 import json
-from unittest.mock import patch
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import socketio
+from asgiref.sync import async_to_sync, sync_to_async
+from bson import ObjectId
+from bson.errors import InvalidDocument
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
 from django.urls import reverse
+from pymongo.errors import AutoReconnect, BulkWriteError, ServerSelectionTimeoutError
 
+from cores.models import BadWord
+from cores.profanity import bad_word_store
+from users.auth import chat_jwt_authenticator
+from users.cache import DjangoCacheUserBackend, LocalUserBackend
 from users.tests import UserTest
 
+from . import socketio as chat_server
+from .managers import AsyncMemoryPubSubManager, get_client_manager
+from .message_buffer import DUPLICATE_KEY_ERROR, MAX_FLUSH_ERRORS, ChatMessageBuffer
 from .models import ChatReport
+from .mongodb import (
+    MESSAGE_HISTORY_PROJECTION,
+    MESSAGE_INDEXES,
+    ensure_indexes,
+    get_message,
+    get_messages,
+    retry_ensure_indexes,
+    save_message,
+    start_ensure_indexes,
+)
 
 
 class ChatTest(UserTest):
@@ -125,3 +151,481 @@ class ReportChatMessageTest(ChatTest):
         )
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.json(), {"message": "message not found"})
+
+
+@patch.object(chat_server.sio, "emit", new_callable=AsyncMock)
+class ChatServerTest(ChatTest):
+    def setUp(self):
+        super().setUp()
+        # 연결 인증은 워커 스레드에서 실행되지만 테스트 DB의 데이터는 테스트 트랜잭션 안에 있으므로
+        # 테스트 스레드에서 실행하고, 테스트 DB 연결도 닫지 않음
+        for target, new in [
+            ("chat.socketio.sync_to_async", lambda func, **kwargs: sync_to_async(func)),
+            ("chat.socketio.close_old_connections", MagicMock()),
+        ]:
+            patcher = patch(target, new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def connect(self, auth, environ=None):
+        return async_to_sync(chat_server.connect)("sid", environ or {}, auth)
+
+    @patch.object(chat_server.sio, "save_session", new_callable=AsyncMock)
+    def test_connect(self, mock_save_session, mock_emit):
+        self.assertIsNone(self.connect({"token": self.user_jwt}))
+        mock_save_session.assert_awaited_once_with(
+            "sid", {"user_id": self.test_user_1.id}
+        )
+        # 재접속은 캐시된 토큰과 사용자로 인증
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.connect({"token": self.user_jwt}))
+        self.assertIsNone(
+            self.connect(None, {"HTTP_COOKIE": f"access_token={self.user_jwt}"})
+        )
+
+    def test_connect_runs_in_worker_thread(self, mock_emit):
+        with patch("chat.socketio.sync_to_async", wraps=sync_to_async) as mock_sync:
+            self.assertFalse(self.connect(None))
+        self.assertEqual(mock_sync.call_args.kwargs, {"thread_sensitive": False})
+        # 요청 시작/끝처럼 인증 앞뒤로 오래된 DB 연결을 닫음
+        self.assertEqual(chat_server.close_old_connections.call_count, 2)
+
+    @patch.object(chat_server.sio, "save_session", new_callable=AsyncMock)
+    def test_fail_connect(self, mock_save_session, mock_emit):
+        self.assertFalse(self.connect(None))
+        self.assertFalse(self.connect({"token": "abc"}))
+        self.assertFalse(self.connect({"userId": self.test_user_1.id}))
+
+        self.test_user_1.status = "banned"
+        self.test_user_1.save()
+        self.assertFalse(self.connect({"token": self.user_jwt}))
+        mock_save_session.assert_not_awaited()
+
+    @patch.object(chat_server.sio, "save_session", new_callable=AsyncMock)
+    def test_ban_clears_shared_user_cache(self, mock_save_session, mock_emit):
+        # 연결 인증용 사용자 캐시는 Django 캐시에 있어서 다른 채팅 서버 프로세스와 공유됨
+        user_backend = chat_jwt_authenticator.user_backend
+        self.assertIsInstance(user_backend, DjangoCacheUserBackend)
+        self.assertIsNone(self.connect({"token": self.user_jwt}))
+        self.assertIsNotNone(user_backend.get(self.test_user_1.id))
+
+        self.test_user_1.status = "banned"
+        self.test_user_1.save()
+        self.assertIsNone(user_backend.get(self.test_user_1.id))
+        self.assertFalse(self.connect({"token": self.user_jwt}))
+
+    def test_check_user_backend(self, mock_emit):
+        local_backend = LocalUserBackend(maxsize=10, ttl=30)
+        chat_server.check_user_backend("", local_backend)
+        chat_server.check_user_backend("memory://", local_backend)
+        with self.assertRaises(ImproperlyConfigured):
+            chat_server.check_user_backend("redis://localhost:6379/0", local_backend)
+        # 테스트의 기본 캐시(locmem)도 프로세스 메모리 캐시
+        with self.assertRaises(ImproperlyConfigured):
+            chat_server.check_user_backend(
+                "redis://localhost:6379/0", DjangoCacheUserBackend(maxsize=10, ttl=30)
+            )
+
+    @patch.object(chat_server.sio, "get_session", new_callable=AsyncMock)
+    @patch("chat.socketio.save_message", new_callable=AsyncMock)
+    def test_send_message(self, mock_save_message, mock_get_session, mock_emit):
+        mock_save_message.return_value = "6350c0ffee0000000000abcd"
+        mock_get_session.return_value = {"user_id": 1}
+
+        # 클라이언트가 보낸 userId(999) 대신 연결할 때 인증한 사용자 id를 씀
+        async_to_sync(chat_server.handle_send_message)(
+            "sid", "병신 테스트", "테스트", "room1", "10:00", "none", "", 999
+        )
+
+        mock_save_message.assert_awaited_once_with("병신 테스트", "테스트", 1, "room1")
+        event, data = mock_emit.await_args.args
+        self.assertEqual(event, "add_message")
+        self.assertEqual(data["user_id"], 1)
+        self.assertEqual(data["text"], "** 테스트")
+        self.assertEqual(data["message_id"], "6350c0ffee0000000000abcd")
+        self.assertEqual(mock_emit.await_args.kwargs, {"to": "room1"})
+
+    @patch.object(chat_server.sio, "enter_room")
+    @patch.object(chat_server.sio, "save_session", new_callable=AsyncMock)
+    @patch.object(chat_server.sio, "get_session", new_callable=AsyncMock)
+    @patch("chat.socketio.save_message", new_callable=AsyncMock)
+    def test_room_id_is_normalized(
+        self,
+        mock_save_message,
+        mock_get_session,
+        mock_save_session,
+        mock_enter_room,
+        mock_emit,
+    ):
+        # 클라이언트가 방 번호를 숫자로 보내도 문자열로 보낸 사용자와 같은 방
+        mock_save_message.return_value = "6350c0ffee0000000000abcd"
+        mock_get_session.return_value = {"user_id": 1}
+
+        async_to_sync(chat_server.handle_join)("sid", {"nickname": "테스트", "room": 7})
+        async_to_sync(chat_server.handle_send_message)(
+            "sid", "테스트", "테스트", 7, "10:00", "none", "", 1
+        )
+
+        mock_enter_room.assert_called_once_with("sid", room="7")
+        mock_save_message.assert_awaited_once_with("테스트", "테스트", 1, "7")
+        self.assertEqual(mock_emit.await_args.kwargs, {"to": "7"})
+
+    def test_censor_message_refreshes_bad_words_in_background(self, mock_emit):
+        self.addCleanup(bad_word_store.invalidate)
+        BadWord.objects.create(word="짖지마")
+        bad_word_store.invalidate()
+
+        async def send_messages():
+            # 이벤트 루프에서는 DB를 확인하지 않고 지금 스냅샷으로 가림
+            first = chat_server.censor_message("멍멍 짖지마")
+            await chat_server._bad_words_refresh
+            return first, chat_server.censor_message("멍멍 짖지마")
+
+        self.assertEqual(async_to_sync(send_messages)(), ("멍멍 짖지마", "멍멍 ***"))
+
+    @patch.object(chat_server.sio, "get_session", new_callable=AsyncMock)
+    def test_disconnect_before_join(self, mock_get_session, mock_emit):
+        mock_get_session.return_value = {}
+        async_to_sync(chat_server.disconnect)("sid")
+        mock_emit.assert_not_awaited()
+
+        mock_get_session.return_value = {"nickname": "테스트", "room": "room1"}
+        async_to_sync(chat_server.disconnect)("sid")
+        self.assertEqual(mock_emit.await_args.kwargs, {"to": "room1"})
+
+
+class ChatMessageBufferTest(SimpleTestCase):
+    def setUp(self):
+        self.collection = AsyncMock()
+        self.buffer = ChatMessageBuffer(
+            self.collection, max_batch=3, flush_interval=60, max_pending=5
+        )
+
+    def run_async(self, coroutine_function):
+        async def run():
+            try:
+                return await coroutine_function()
+            finally:
+                await self.buffer.close()
+
+        return async_to_sync(run)()
+
+    def test_add_returns_object_id_and_flushes_batch(self):
+        async def scenario():
+            message_ids = [
+                await self.buffer.add({"message": str(number)}) for number in range(3)
+            ]
+            # 배치가 다 차면 기다리지 않고 저장
+            await asyncio.sleep(0)
+            return message_ids
+
+        message_ids = self.run_async(scenario)
+
+        self.collection.insert_many.assert_awaited_once()
+        documents = self.collection.insert_many.await_args.args[0]
+        self.assertEqual([str(document["_id"]) for document in documents], message_ids)
+        self.assertEqual(
+            self.collection.insert_many.await_args.kwargs, {"ordered": False}
+        )
+        self.assertEqual(self.buffer.stats()["saved"], 3)
+        self.assertEqual(self.buffer.stats()["depth"], 0)
+
+    def test_failed_flush_is_retried(self):
+        self.collection.insert_many.side_effect = [
+            AutoReconnect("connection lost"),
+            BulkWriteError(
+                {
+                    "writeErrors": [
+                        {"index": 0, "code": DUPLICATE_KEY_ERROR},
+                        {"index": 1, "code": 121},
+                    ]
+                }
+            ),
+        ]
+
+        async def scenario():
+            message_id = await self.buffer.add({"message": "test"})
+            await self.buffer.add({"message": "invalid"})
+            self.assertFalse(await self.buffer.flush())
+            self.assertIsNotNone(self.buffer.get(ObjectId(message_id)))
+            self.assertTrue(await self.buffer.flush())
+
+        self.run_async(scenario)
+
+        first, second = self.collection.insert_many.await_args_list
+        self.assertEqual(first.args[0], second.args[0])
+        stats = self.buffer.stats()
+        self.assertEqual(stats["failed_flushes"], 1)
+        self.assertEqual(stats["saved"], 1)
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["depth"], 0)
+
+    def test_backpressure(self):
+        self.buffer.max_batch = 10
+        self.buffer.max_pending = 2
+        mongo_available = asyncio.Event()
+
+        async def slow_insert_many(documents, ordered):
+            await mongo_available.wait()
+
+        self.collection.insert_many.side_effect = slow_insert_many
+
+        async def scenario():
+            await self.buffer.add({"message": "1"})
+            await self.buffer.add({"message": "2"})
+            flush = asyncio.ensure_future(self.buffer.flush())
+            blocked = asyncio.ensure_future(self.buffer.add({"message": "3"}))
+            await asyncio.sleep(0.01)
+            self.assertFalse(blocked.done())
+
+            mongo_available.set()
+            await flush
+            await blocked
+
+        self.run_async(scenario)
+
+        stats = self.buffer.stats()
+        self.assertEqual(stats["backpressure_waits"], 1)
+        self.assertEqual(stats["max_depth"], 2)
+        self.assertEqual(stats["saved"], 3)
+
+    def test_reject_oversized_integer(self):
+        async def scenario():
+            with self.assertRaises(InvalidDocument):
+                await self.buffer.add({"message": 2**64, "room_id": "room1"})
+            await self.buffer.add({"message": "test", "room_id": 2**63 - 1})
+
+        self.run_async(scenario)
+
+        self.collection.insert_many.assert_awaited_once()
+        self.assertEqual(len(self.collection.insert_many.await_args.args[0]), 1)
+        self.assertEqual(self.buffer.stats()["dropped"], 1)
+
+    def test_drop_unencodable_message_on_flush(self):
+        self.collection.insert_many.side_effect = [OverflowError, None]
+
+        async def scenario():
+            await self.buffer.add({"message": "test"})
+            # add()를 거치지 않고 들어간 저장할 수 없는 메시지
+            message_id = ObjectId()
+            self.buffer._pending[message_id] = {"_id": message_id, "message": 2**64}
+            self.assertFalse(await self.buffer.flush())
+            self.assertTrue(await self.buffer.flush())
+
+        self.run_async(scenario)
+
+        self.assertEqual(
+            self.collection.insert_many.await_args.args[0][0]["message"], "test"
+        )
+        stats = self.buffer.stats()
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["saved"], 1)
+        self.assertEqual(stats["depth"], 0)
+
+    def test_unexpected_flush_errors_are_capped(self):
+        self.collection.insert_many.side_effect = RuntimeError
+
+        async def scenario():
+            await self.buffer.add({"message": "test"})
+            for _ in range(MAX_FLUSH_ERRORS - 1):
+                self.assertFalse(await self.buffer.flush())
+            self.assertTrue(await self.buffer.flush())
+
+        self.run_async(scenario)
+
+        stats = self.buffer.stats()
+        self.assertEqual(stats["failed_flushes"], MAX_FLUSH_ERRORS)
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["depth"], 0)
+
+    def test_close_flushes_pending_messages(self):
+        async def scenario():
+            await self.buffer.add({"message": "test"})
+
+        self.run_async(scenario)
+
+        self.collection.insert_many.assert_awaited_once()
+        self.assertEqual(self.buffer.stats()["depth"], 0)
+
+    def test_get_message_from_buffer(self):
+        async def scenario():
+            return await self.buffer.add({"message": "test", "sender_id": 1})
+
+        self.collection.insert_many.side_effect = AutoReconnect("connection lost")
+        self.buffer.flush_interval = 0.01
+        with patch("chat.mongodb.chat_message_buffer", self.buffer):
+            message_id = self.run_async(scenario)
+            self.assertEqual(get_message(message_id)["sender_id"], 1)
+
+
+class GetChatMessagesTest(ChatTest):
+    def setUp(self):
+        super().setUp()
+        self.message_ids = [ObjectId() for _ in range(3)]
+        self.messages = [
+            {
+                "_id": message_id,
+                "message": f"병신 메시지{number}",
+                "sender_nickname": "테스트",
+                "sender_id": self.test_user_1.id,
+                "created_at": datetime(2022, 10, 1, tzinfo=timezone.utc),
+            }
+            for number, message_id in enumerate(self.message_ids)
+        ]
+
+    @patch("chat.mongodb.messages_collection")
+    def test_get_messages(self, mock_collection):
+        cursor = mock_collection.find.return_value.sort.return_value.limit.return_value
+        cursor.__iter__.return_value = self.messages[::-1]
+
+        messages, next_cursor = get_messages("room1", self.message_ids[0], limit=2)
+
+        mock_collection.find.assert_called_once_with(
+            {"room_id": "room1", "_id": {"$lt": self.message_ids[0]}},
+            MESSAGE_HISTORY_PROJECTION,
+        )
+        mock_collection.find.return_value.sort.assert_called_once_with("_id", -1)
+        mock_collection.find.return_value.sort.return_value.limit.assert_called_once_with(
+            3
+        )
+        self.assertEqual(messages, self.messages[1:])
+        self.assertEqual(next_cursor, str(self.message_ids[1]))
+
+    @patch("chat.mongodb.messages_collection")
+    def test_get_messages_of_numeric_room(self, mock_collection):
+        # 문자열로 맞추기 전에 숫자로 저장된 메시지도 조회
+        get_messages(7, None, limit=2)
+
+        mock_collection.find.assert_called_once_with(
+            {"room_id": {"$in": ["7", 7]}}, MESSAGE_HISTORY_PROJECTION
+        )
+
+    @patch("chat.mongodb.chat_message_buffer")
+    def test_save_message_normalizes_room_id(self, mock_buffer):
+        mock_buffer.add = AsyncMock(return_value="6350c0ffee0000000000abcd")
+
+        async_to_sync(save_message)("테스트", "테스트", 1, 7)
+
+        self.assertEqual(mock_buffer.add.await_args.args[0]["room_id"], "7")
+
+    @patch("chat.mongodb.async_messages_collection")
+    def test_ensure_indexes(self, mock_collection):
+        mock_collection.create_indexes = AsyncMock()
+        async_to_sync(ensure_indexes)()
+        mock_collection.create_indexes.assert_awaited_once_with(MESSAGE_INDEXES)
+        self.assertEqual(MESSAGE_INDEXES[0].document["key"], {"room_id": 1, "_id": -1})
+
+    @patch("chat.mongodb.async_messages_collection")
+    def test_retry_ensure_indexes(self, mock_collection):
+        # MongoDB에 연결할 수 없으면 연결될 때까지 다시 시도
+        mock_collection.create_indexes = AsyncMock(
+            side_effect=[ServerSelectionTimeoutError("down"), None]
+        )
+
+        async_to_sync(retry_ensure_indexes)(interval=0)
+
+        self.assertEqual(mock_collection.create_indexes.await_count, 2)
+
+    @patch("chat.mongodb.retry_ensure_indexes", new_callable=AsyncMock)
+    def test_start_ensure_indexes_does_not_wait(self, mock_retry):
+        async def start():
+            await start_ensure_indexes()
+            mock_retry.assert_not_awaited()
+            await asyncio.sleep(0)
+
+        async_to_sync(start)()
+
+        mock_retry.assert_awaited_once_with()
+
+    @patch("chat.api.get_messages")
+    def test_success_get_chat_messages(self, mock_get_messages):
+        mock_get_messages.return_value = (self.messages, str(self.message_ids[0]))
+        response = self.client.get(
+            reverse("api-1.0.0:get_chat_messages", kwargs={"room_id": "room1"}),
+            {"before": str(self.message_ids[2]), "limit": 3},
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertEqual(response.status_code, 200)
+        mock_get_messages.assert_called_once_with("room1", self.message_ids[2], 3)
+        self.assertEqual(
+            response.json()["items"][0],
+            {
+                "message_id": str(self.message_ids[0]),
+                "sender_id": self.test_user_1.id,
+                "sender_nickname": "테스트",
+                "text": "** 메시지0",
+                "created_at": "2022-10-01T00:00:00Z",
+            },
+        )
+        self.assertEqual(response.json()["next_cursor"], str(self.message_ids[0]))
+
+    def test_fail_400_get_chat_messages_invalid_cursor(self):
+        response = self.client.get(
+            reverse("api-1.0.0:get_chat_messages", kwargs={"room_id": "room1"}),
+            {"before": "abc"},
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "invalid cursor"})
+
+
+class ChatMessageBufferStatsTest(ChatTest):
+    def test_success_get_chat_message_buffer_stats(self):
+        response = self.client.get(
+            reverse("api-1.0.0:get_chat_message_buffer_stats"),
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["depth"], 0)
+
+    def test_fail_403_get_chat_message_buffer_stats(self):
+        response = self.client.get(
+            reverse("api-1.0.0:get_chat_message_buffer_stats"),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+class ChatClientManagerTest(SimpleTestCase):
+    def test_get_client_manager(self):
+        self.assertIsNone(get_client_manager("", "chat"))
+        self.assertIsInstance(
+            get_client_manager("redis://localhost:6379/0", "chat"),
+            socketio.AsyncRedisManager,
+        )
+        manager = get_client_manager("memory://", "chat")
+        self.assertIsInstance(manager, AsyncMemoryPubSubManager)
+        self.assertEqual(manager.channel, "chat")
+        with self.assertRaises(ValueError):
+            get_client_manager("http://localhost", "chat")
+
+    def test_emit_to_room_on_other_server(self):
+        async def scenario():
+            servers = [
+                socketio.AsyncServer(
+                    async_mode="asgi",
+                    client_manager=AsyncMemoryPubSubManager(channel="test"),
+                )
+                for _ in range(2)
+            ]
+            for server in servers:
+                server._emit_internal = AsyncMock()
+                server.manager.initialize()
+            # 구독 시작
+            await asyncio.sleep(0)
+
+            sid = servers[0].manager.connect("eio_sid", "/")
+            servers[0].enter_room(sid, "room1")
+            await servers[1].emit("add_message", {"text": "test"}, to="room1")
+            await asyncio.sleep(0.01)
+
+            for server in servers:
+                server.manager.thread.cancel()
+            return servers
+
+        first, second = async_to_sync(scenario)()
+
+        first._emit_internal.assert_awaited_once_with(
+            "eio_sid", "add_message", {"text": "test"}, "/", None
+        )
+        second._emit_internal.assert_not_awaited()
@@ -1,8 +1,9 @@
 from django.shortcuts import get_object_or_404
-from ninja import Form
+from ninja import Form, Query
 
-from comments.models import Comment, CommentReport
-from comments.schemas import GetCommentOut
+from comments.models import COMMENT_ORDERING, Comment, CommentReport
+from comments.schemas import GetCommentListOut, GetCommentOut
+from cores.streaming import StreamingJSONResponse, stream_cursor_page
 from cores.schemas import ContentIn, MessageOut
 from cores.utils import URLBugFixedRouter
 from posts.models import Post
@@ -12,6 +13,28 @@ from users.auth import AuthBearer, has_authority, is_admin
 router = URLBugFixedRouter(tags=["댓글 관련 API"], auth=AuthBearer())
 
 
+@router.get(
+    "/{post_id}/comments", response={200: GetCommentListOut}, summary="댓글 목록 조회"
+)
+def get_comments(
+    request, post_id: int, cursor: str = None, limit: int = Query(20, ge=1, le=500)
+):
+    """
+    게시글의 삭제 안된 댓글을 작성순으로 limit개씩 조회
+    - 첫 페이지는 cursor 없이 요청하고, 다음 페이지는 응답의 next_cursor를 cursor로 넣어서 요청
+    - next_cursor가 null이면 마지막 페이지
+    - 한 페이지(최대 500개)의 댓글은 view에서 읽고, 응답 JSON은 댓글 하나씩 바꿔서 스트리밍으로 보냄
+    """
+    has_authority(request)
+    get_object_or_404(Post, id=post_id, is_deleted=False)
+    comments = Comment.objects.filter(post_id=post_id, is_deleted=False).select_related(
+        "user"
+    )
+    return StreamingJSONResponse(
+        stream_cursor_page(GetCommentOut, comments, COMMENT_ORDERING, cursor, limit)
+    )
+
+
 @router.post("/{post_id}/comments", response={200: GetCommentOut}, summary="댓글 작성")
 def create_comment(request, post_id: int, body: ContentIn = Form(...)):
     """
@@ -40,6 +63,7 @@ def delete_comment(request, post_id: int, comment_id: int):
     has_authority(request, user_id=comment.user_id, user_check=True)
     comment.is_deleted = True
     comment.save()
+    Post.adjust_counter(comment.post_id, "comments_count", -1)
 
     return 200, {"message": "success"}
 
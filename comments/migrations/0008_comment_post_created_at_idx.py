@@ -0,0 +1,21 @@
+# Generated by Django 4.1 on 2026-10-18 01:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0007_alter_comment_content"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["post", "created_at", "id"],
+                name="comment_post_created_at_idx",
+            ),
+        ),
+    ]
@@ -2,6 +2,9 @@ from django.db import models
 
 from cores.models import TimeStampedModel
 
+# 댓글 목록 정렬 기준(작성순), 마지막 id로 같은 시각 댓글의 순서를 정함
+COMMENT_ORDERING = ("created_at", "id")
+
 
 class Comment(TimeStampedModel):
     user = models.ForeignKey(
@@ -15,6 +18,13 @@ class Comment(TimeStampedModel):
 
     class Meta:
         db_table = "comment"
+        indexes = [
+            models.Index(
+                fields=["post", "created_at", "id"],
+                name="comment_post_created_at_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
 
 class CommentReport(TimeStampedModel):
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List, Optional
 
 from ninja import Field, ModelSchema, Schema
 
@@ -15,8 +16,13 @@ class GetCommentOut(ModelSchema):
     user_id: int
     post_id: int
     user_nickname: str = Field(..., alias="user.nickname")
-    user_thumbnail: str = Field(..., alias="user.thumbnail_url")
+    user_thumbnail: str = Field(..., alias="user.avatar_url")
 
     class Config:
         model = Comment
         model_exclude = ["is_deleted", "user", "post", "updated_at"]
+
+
+class GetCommentListOut(Schema):
+    items: List[GetCommentOut]
+    next_cursor: Optional[str]
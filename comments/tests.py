@@ -1,9 +1,14 @@
 import json
 
+from asgiref.sync import async_to_sync
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
 from django.urls import reverse
 
 from comments.models import Comment, CommentReport
 from posts.models import Post
+from users.models import User
+from togedog_dj.asgi import application
 from users.tests import UserTest
 
 
@@ -48,7 +53,7 @@ class CreateCommentTest(CommentTest):
         self.assertEqual(response.json(), results)
 
     def test_fail_405_create_comment_with_invalid_method(self):
-        response = self.client.get(
+        response = self.client.put(
             reverse("api-1.0.0:create_comment", kwargs={"post_id": self.test_post.id}),
             HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
         )
@@ -84,6 +89,128 @@ class CreateCommentTest(CommentTest):
         self.assertEqual(response.json(), {"detail": "Unauthorized"})
 
 
+class GetCommentsTest(CommentTest):
+    def add_comments(self, count):
+        user = User.objects.create(
+            nickname="댓글러", email="commenter@test.com", account_type="email"
+        )
+        return [
+            Comment.objects.create(user=user, post=self.test_post, content=f"{index}")
+            for index in range(count)
+        ]
+
+    def get_comments(self, **params):
+        return self.client.get(
+            reverse("api-1.0.0:get_comments", kwargs={"post_id": self.test_post.id}),
+            params,
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+
+    def test_success_get_comments(self):
+        response = self.get_comments()
+        comment = self.test_post_comment
+        results = {
+            "items": [
+                {
+                    "id": comment.id,
+                    "created_at": f"{comment.created_at.isoformat()[:-9]}Z",
+                    "content": comment.content,
+                    "user_id": comment.user_id,
+                    "post_id": comment.post_id,
+                    "user_nickname": comment.user.nickname,
+                    "user_thumbnail": comment.user.thumbnail_url,
+                }
+            ],
+            "next_cursor": None,
+        }
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(b"".join(response.streaming_content)), results)
+
+    def test_success_get_comments_through_asgi(self):
+        # uvicorn처럼 ASGI 앱을 직접 호출, 스트리밍 본문은 이벤트 루프에서 읽힘
+        # 테스트 트랜잭션 안의 DB 연결이 닫히지 않도록 Django 테스트 클라이언트처럼 신호를 끊음
+        for signal in (request_started, request_finished):
+            signal.disconnect(close_old_connections)
+            self.addCleanup(signal.connect, close_old_connections)
+        self.add_comments(2)
+        path = reverse("api-1.0.0:get_comments", kwargs={"post_id": self.test_post.id})
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"limit=2",
+            "headers": [(b"authorization", f"Bearer {self.user_jwt}".encode())],
+            "server": ("testserver", 80),
+            "client": ("127.0.0.1", 50000),
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        async_to_sync(application)(scope, receive, send)
+
+        self.assertEqual(messages[0]["status"], 200)
+        body = b"".join(
+            message.get("body", b"")
+            for message in messages
+            if message["type"] == "http.response.body"
+        )
+        response = json.loads(body)
+        self.assertEqual(len(response["items"]), 2)
+        self.assertIsNotNone(response["next_cursor"])
+
+    def test_success_get_comments_by_cursor(self):
+        comments = [self.test_post_comment, *self.add_comments(4)]
+        comments[2].is_deleted = True
+        comments[2].save()
+        expected_ids = [comment.id for comment in comments if not comment.is_deleted]
+
+        ids, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = json.loads(
+                b"".join(self.get_comments(**params).streaming_content)
+            )
+            ids += [comment["id"] for comment in response["items"]]
+            pages += 1
+            cursor = response["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(ids, expected_ids)
+        self.assertEqual(pages, 2)
+
+    def test_fail_400_get_comments_with_invalid_cursor(self):
+        response = self.get_comments(cursor="invalid")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "invalid cursor"})
+
+    def test_fail_404_get_comments_of_deleted_post(self):
+        self.test_post.is_deleted = True
+        self.test_post.save()
+        response = self.get_comments()
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"detail": "Not Found"})
+
+    def test_fail_401_get_comments(self):
+        response = self.client.get(
+            reverse("api-1.0.0:get_comments", kwargs={"post_id": self.test_post.id})
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"detail": "Unauthorized"})
+
+
 class DeleteCommentTest(CommentTest):
     def test_success_delete_comment(self):
         response = self.client.delete(
@@ -1,3 +1,164 @@
-from ninja import Router
+from datetime import timedelta
+from typing import List
 
-router = Router()
+from django.conf import settings
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from ninja.errors import HttpError
+
+from cores.models import BadWord, ImageUploadSession
+from cores.profanity import bad_word_store
+from cores.schemas import (
+    BadWordIn,
+    BadWordOut,
+    CompleteUploadIn,
+    CompleteUploadOut,
+    CreateUploadIn,
+    CreateUploadOut,
+    MessageOut,
+)
+from cores.utils import (
+    MAX_UPLOAD_FILE_SIZE,
+    URLBugFixedRouter,
+    create_upload_filename,
+    delete_existing_image,
+    enqueue_image_variants,
+    file_handler,
+    get_image_url,
+)
+from posts.models import Post
+from users.auth import AuthBearer, has_authority, is_admin
+from users.models import User
+
+router = URLBugFixedRouter(tags=["욕설 목록 관리 API"], auth=AuthBearer())
+
+
+@router.get("/bad-words", response=List[BadWordOut], summary="욕설 목록 조회")
+def get_bad_words(request):
+    """
+    욕설 필터링에 쓰이는 욕설 목록 조회, 관리자만 가능
+    """
+    is_admin(request)
+    return BadWord.objects.order_by("word")
+
+
+@router.post("/bad-words", response={200: MessageOut}, summary="욕설 추가")
+def add_bad_words(request, body: BadWordIn):
+    """
+    욕설 추가, 관리자만 가능(application/json)
+    - words: 추가할 욕설 목록, 비활성화된 욕설이면 다시 활성화
+    - 모든 서버 프로세스에 BAD_WORDS_RELOAD_INTERVAL초 안에 반영됨
+    """
+    is_admin(request)
+    with transaction.atomic():
+        for word in body.words:
+            BadWord.objects.update_or_create(word=word, defaults={"is_active": True})
+    bad_word_store.invalidate()
+    return 200, {"message": "success"}
+
+
+@router.delete(
+    "/bad-words/{bad_word_id}", response={200: MessageOut}, summary="욕설 비활성화"
+)
+def deactivate_bad_word(request, bad_word_id: int):
+    """
+    욕설 비활성화, 관리자만 가능
+    - DB에서 삭제하지 않고 is_active 값만 False로 바꿈
+    """
+    is_admin(request)
+    bad_word = get_object_or_404(BadWord, id=bad_word_id)
+    bad_word.is_active = False
+    bad_word.save()
+    bad_word_store.invalidate()
+    return 200, {"message": "success"}
+
+
+@router.post(
+    "/uploads",
+    response={200: CreateUploadOut},
+    tags=["이미지 업로드 API"],
+    summary="S3 직접 업로드 양식 발급",
+)
+def create_upload(request, body: CreateUploadIn):
+    """
+    사진을 서버를 거치지 않고 S3에 직접 올릴 수 있는 presigned POST 양식 발급(application/json)
+    - type: post_images(게시글 사진) 또는 user_thumbnail(프로필 사진)
+    - file_name: 원래 파일 이름(확장자 확인용), content_type: 사진 MIME 타입(image/png 등)
+    - 응답의 url로 fields 값들과 file을 multipart/form-data로 POST하면 S3에 올라감
+    - 업로드 용량은 50MB 제한이고 S3가 직접 검사함, 양식은 IMAGE_UPLOAD_EXPIRES초 동안 유효
+    - 업로드 후 완료 API(/uploads/{upload_id}/complete)를 호출해야 게시글/프로필에 반영됨
+    """
+    has_authority(request, banned_check=body.type == "post_images")
+    upload_filename = create_upload_filename(body.file_name)
+    upload_form = file_handler.create_upload_form(
+        body.type,
+        upload_filename,
+        body.content_type,
+        MAX_UPLOAD_FILE_SIZE,
+        settings.IMAGE_UPLOAD_EXPIRES,
+    )
+    upload = ImageUploadSession.objects.create(
+        user_id=request.auth.id,
+        type=body.type,
+        key=upload_filename,
+        content_type=body.content_type,
+        expires_at=timezone.now() + timedelta(seconds=settings.IMAGE_UPLOAD_EXPIRES),
+    )
+    return 200, {
+        "id": upload.id,
+        "url": upload_form["url"],
+        "fields": upload_form["fields"],
+        "expires_at": upload.expires_at,
+    }
+
+
+@router.post(
+    "/uploads/{upload_id}/complete",
+    response={200: CompleteUploadOut},
+    tags=["이미지 업로드 API"],
+    summary="S3 직접 업로드 완료",
+)
+def complete_upload(request, upload_id: int, body: CompleteUploadIn):
+    """
+    S3에 직접 올린 사진을 게시글 사진 또는 프로필 사진으로 반영(application/json)
+    - target_id: post_images면 게시글 id(글쓴이 본인 또는 관리자), user_thumbnail이면 사용자 id
+    - S3에 파일이 없으면 400 에러, 기존 사진은 S3 삭제 대기열에 넣음
+    - 이미 완료한 업로드면 404 에러
+    """
+    upload = get_object_or_404(
+        ImageUploadSession,
+        id=upload_id,
+        user_id=request.auth.id,
+        completed_at__isnull=True,
+    )
+    if upload.type == "post_images":
+        target = get_object_or_404(Post, id=body.target_id, is_deleted=False)
+        has_authority(request, user_id=target.user_id, user_check=True)
+        image_field = "image_url"
+    else:
+        has_authority(request, body.target_id, user_check=True, banned_check=False)
+        target = get_object_or_404(User, id=body.target_id)
+        image_field = "thumbnail_url"
+
+    file_info = file_handler.get_file_info(upload.type, upload.key)
+    if file_info is None:
+        raise HttpError(400, "uploaded file not found")
+    if file_info["size"] > MAX_UPLOAD_FILE_SIZE:
+        raise HttpError(400, "file size is too large")
+
+    image_url = get_image_url(upload.type, upload.key)
+    with transaction.atomic():
+        # 같은 업로드를 동시에 완료하는 요청 중 먼저 잠근 요청만 사진을 반영
+        upload = get_object_or_404(
+            ImageUploadSession.objects.select_for_update(),
+            id=upload.id,
+            completed_at__isnull=True,
+        )
+        delete_existing_image(getattr(target, image_field), upload.type)
+        enqueue_image_variants(image_url, upload.type)
+        setattr(target, image_field, image_url)
+        target.save()
+        upload.completed_at = timezone.now()
+        upload.save()
+    return 200, {"image_url": image_url}
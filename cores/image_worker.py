@@ -0,0 +1,170 @@
+from concurrent.futures import Executor, as_completed
+from io import BytesIO
+from typing import Dict, NamedTuple
+
+import botocore
+from django.conf import settings
+from ninja.errors import HttpError
+from PIL import Image, ImageOps
+
+from cores.images import IMAGE_VARIANT_SIZES, get_variant_key
+from cores.models import ImageVariantTask, S3DeleteTask
+from cores.s3_cleanup import claim_tasks, retry_tasks_later
+from cores.utils import file_handler, get_image_url
+from posts.models import Post
+from users.models import User
+
+WEBP_QUALITY = 80
+
+# 사진 종류별로 사진 주소와 줄인 사진 주소를 저장하는 모델 필드
+IMAGE_VARIANT_TARGETS = {
+    "post_images": (Post, "image_url", "image_variants"),
+    "user_thumbnail": (User, "thumbnail_url", "thumbnail_variants"),
+}
+
+RENDER_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+S3_ERRORS = (
+    botocore.exceptions.BotoCoreError,
+    botocore.exceptions.ClientError,
+    HttpError,
+)
+
+
+class VariantResult(NamedTuple):
+    generated: int
+    failed: int
+
+
+def render_webp_variants(data: bytes, sizes: Dict[str, int]) -> Dict[str, bytes]:
+    """
+    원본 사진(data)을 sizes의 크기(긴 변 px)별로 줄여서 WebP bytes로 만듦
+    - 프로세스 풀에서 실행되므로 Django나 DB를 쓰지 않음
+    - 휴대폰 사진의 EXIF 회전 정보를 반영하고, 원본보다 크게 늘리지는 않음
+    """
+    with Image.open(BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        variants = {}
+        for name, size in sizes.items():
+            variant = image.copy()
+            variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buffer = BytesIO()
+            variant.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+            variants[name] = buffer.getvalue()
+    return variants
+
+
+def save_variants_to_targets(type: str, variants: dict) -> int:
+    model, url_field, variants_field = IMAGE_VARIANT_TARGETS[type]
+    targets = list(model.objects.filter(**{url_field: variants["source"]}))
+    for target in targets:
+        setattr(target, variants_field, variants)
+        target.save(update_fields=[variants_field])
+    return len(targets)
+
+
+def copy_existing_variants(task: ImageVariantTask) -> bool:
+    """
+    같은 사진(중복 제거로 재사용된 key)의 줄인 사진이 이미 있으면 다시 만들지 않고 주소만 복사
+    """
+    model, url_field, variants_field = IMAGE_VARIANT_TARGETS[task.type]
+    source = get_image_url(task.type, task.key)
+    variants = (
+        model.objects.filter(**{url_field: source, f"{variants_field}__source": source})
+        .values_list(variants_field, flat=True)
+        .first()
+    )
+    if not variants:
+        return False
+    save_variants_to_targets(task.type, variants)
+    return True
+
+
+def save_image_variants(task: ImageVariantTask, rendered: Dict[str, bytes]) -> int:
+    """
+    줄인 사진을 S3에 올리고 원본 사진을 쓰는 게시글/사용자에 주소를 저장, 저장한 행 수를 반환
+    - 그 사이 사진이 바뀌었거나 삭제되어 쓰는 곳이 없으면 올린 사진도 삭제 대기열에 넣음
+    - save()로 저장하므로 게시글 목록 캐시 무효화 시그널이 그대로 동작함
+    """
+    variants = {"source": get_image_url(task.type, task.key)}
+    for name, data in rendered.items():
+        variant_key = get_variant_key(task.key, name)
+        file_handler.upload(
+            BytesIO(data),
+            task.type,
+            variant_key,
+            extra_args={
+                "ACL": "public-read",
+                "ContentType": "image/webp",
+                "CacheControl": "public, max-age=31536000, immutable",
+            },
+        )
+        variants[name] = get_image_url(task.type, variant_key)
+
+    saved = save_variants_to_targets(task.type, variants)
+    if not saved:
+        S3DeleteTask.objects.bulk_create(
+            S3DeleteTask(bucket=task.type, key=get_variant_key(task.key, name))
+            for name in rendered
+        )
+    return saved
+
+
+def generate_image_variants(
+    executor: Executor, batch_size: int = None
+) -> VariantResult:
+    """
+    줄인 WebP 사진 생성 대기열을 한 배치 처리하고 (생성 성공 수, 실패 수)를 반환
+    - 원본 다운로드, S3 업로드, DB 저장은 이 프로세스에서 하고
+      CPU를 많이 쓰는 변환(render_webp_variants)만 executor(프로세스 풀)에서 병렬로 실행
+    - 원본이 이미 삭제된 작업이나 같은 사진의 줄인 사진이 이미 있는 작업은 변환하지 않음
+    - S3 요청이 실패한 작업은 나중에 다시 시도(IMAGE_VARIANT_MAX_ATTEMPTS번까지)
+    - 변환이 실패한 사진(깨진 파일, Pillow가 모르는 형식)은 다시 시도해도 같으므로 작업을 지움
+    """
+    tasks = claim_tasks(
+        ImageVariantTask,
+        batch_size or settings.IMAGE_VARIANT_BATCH_SIZE,
+        settings.IMAGE_VARIANT_MAX_ATTEMPTS,
+    )
+    futures, done, dropped, errors = {}, [], [], {}
+    for task in tasks:
+        if copy_existing_variants(task):
+            done.append(task)
+            continue
+        try:
+            data = file_handler.download(task.type, task.key)
+        except S3_ERRORS as error:
+            errors[task.id] = str(error)
+            continue
+        if data is None:
+            done.append(task)
+            continue
+        future = executor.submit(
+            render_webp_variants, data, IMAGE_VARIANT_SIZES[task.type]
+        )
+        futures[future] = task
+
+    for future in as_completed(futures):
+        task = futures[future]
+        try:
+            rendered = future.result()
+        except RENDER_ERRORS:
+            dropped.append(task)
+            continue
+        try:
+            save_image_variants(task, rendered)
+            done.append(task)
+        except S3_ERRORS as error:
+            errors[task.id] = f"{type(error).__name__}: {error}"
+
+    ImageVariantTask.objects.filter(
+        id__in=[task.id for task in done + dropped]
+    ).delete()
+    retry_tasks_later(
+        [task for task in tasks if task.id in errors],
+        errors,
+        settings.IMAGE_VARIANT_RETRY_DELAY,
+    )
+    return VariantResult(len(done), len(dropped) + len(errors))
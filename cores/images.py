@@ -0,0 +1,43 @@
+from typing import Dict
+
+from PIL import Image
+
+# 업로드 사진 종류별로 만드는 WebP 사진 크기(긴 변 기준 px)
+# - feed: 게시글 목록 카드, detail: 게시글 상세, avatar: 댓글/목록의 40px 프로필 사진(고해상도 화면 2배)
+IMAGE_VARIANT_SIZES: Dict[str, Dict[str, int]] = {
+    "post_images": {"feed": 640, "detail": 1280},
+    "user_thumbnail": {"avatar": 80},
+}
+
+
+def can_generate_variants(upload_filename: str) -> bool:
+    """
+    Pillow로 열 수 있는 형식(확장자)의 사진인지 확인
+    - svg, 플러그인 없는 avif 등은 줄인 사진을 만들 수 없으므로 원본을 그대로 씀
+    """
+    extension = upload_filename.rsplit(".", 1)[-1].lower()
+    return f".{extension}" in Image.registered_extensions()
+
+
+def get_variant_key(upload_filename: str, name: str) -> str:
+    """
+    원본 key에서 줄인 사진 key를 만듦, 예: abc.png -> abc_feed.webp
+    """
+    return f'{upload_filename.rsplit(".", 1)[0]}_{name}.webp'
+
+
+def get_variant_keys(type: str, upload_filename: str):
+    return [
+        get_variant_key(upload_filename, name) for name in IMAGE_VARIANT_SIZES[type]
+    ]
+
+
+def get_image_variant_url(image_url: str, variants: dict, name: str) -> str:
+    """
+    image_url 사진의 name 크기 WebP 사진 주소, 아직 없으면 원본 주소
+    - variants는 만들 때의 원본 주소(source)를 같이 저장하므로
+      사진을 바꾼 뒤 새 사진의 variants가 만들어지기 전까지는 원본 주소를 반환
+    """
+    if variants and variants.get("source") == image_url and name in variants:
+        return variants[name]
+    return image_url
@@ -0,0 +1,100 @@
+import random
+import timeit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from cores.profanity import BadWordMatcher
+
+CHAT_MESSAGES = [
+    "안녕하세요 ENFP 강아지 키우는 사람입니다",
+    "오늘 산책하다가 비 와서 다 젖었어요 ㅠㅠ",
+    "우리 애는 간식 소리만 들으면 달려와요 ㅋㅋㅋㅋ",
+    "혹시 슬개골 수술 잘하는 병원 아시는 분 계신가요?",
+    "ISTJ 강아지들은 진짜 규칙적인 거 좋아하나봐요",
+    "주말에 애견카페 같이 가실 분~",
+    "사료 바꾸고 나서 설사를 해서 걱정이에요",
+    "아 진짜 옆집 개가 밤새 짖어서 잠을 못잤네",
+    "털 빠지는 거 때문에 청소기를 하루에 세 번 돌려요",
+    "산책 나가자고 하면 꼬리 흔드는 거 너무 귀엽지 않나요",
+]
+
+
+def legacy_censor_text(text: str, bad_words_list) -> str:
+    """
+    Aho-Corasick 검색기로 바꾸기 전의 censor_text 구현(비교용)
+    """
+    censored_text = text
+    for bad_word in bad_words_list:
+        bad_word_length = len(bad_word)
+        bad_word_index = text.find(bad_word)
+
+        while bad_word_index != -1:
+            censored_text = (
+                censored_text[:bad_word_index]
+                + "*" * bad_word_length
+                + censored_text[bad_word_index + bad_word_length :]
+            )
+            bad_word_index = text.find(bad_word, bad_word_index + 1)
+    return censored_text
+
+
+class Command(BaseCommand):
+    help = "기존 censor_text와 Aho-Corasick 욕설 검색기의 채팅 메시지 처리 속도 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        bad_words_list = [word for word in settings.BAD_WORDS_LIST if word]
+        rng = random.Random(options["seed"])
+        messages = []
+        for _ in range(options["messages"]):
+            message = rng.choice(CHAT_MESSAGES)
+            # 실제 채팅처럼 10개 중 1개 정도는 욕설을 섞어 넣음
+            if bad_words_list and rng.random() < 0.1:
+                position = rng.randrange(len(message) + 1)
+                message = (
+                    message[:position] + rng.choice(bad_words_list) + message[position:]
+                )
+            messages.append(message)
+
+        build_seconds = timeit.timeit(lambda: BadWordMatcher(bad_words_list), number=1)
+        matcher = BadWordMatcher(bad_words_list)
+
+        for message in messages:
+            if matcher.censor(message) != legacy_censor_text(message, bad_words_list):
+                self.stderr.write(f"result mismatch: {message}")
+
+        legacy_seconds = min(
+            timeit.repeat(
+                lambda: [legacy_censor_text(m, bad_words_list) for m in messages],
+                number=1,
+                repeat=options["repeat"],
+            )
+        )
+        matcher_seconds = min(
+            timeit.repeat(
+                lambda: [matcher.censor(m) for m in messages],
+                number=1,
+                repeat=options["repeat"],
+            )
+        )
+
+        count = len(messages)
+        self.stdout.write(
+            f"bad words: {len(bad_words_list)}, messages: {count}, "
+            f"matcher build: {build_seconds * 1000:.2f}ms"
+        )
+        self.stdout.write(
+            f"legacy censor_text : {legacy_seconds * 1000:.2f}ms "
+            f"({legacy_seconds / count * 1e6:.2f}us/message)"
+        )
+        self.stdout.write(
+            f"BadWordMatcher     : {matcher_seconds * 1000:.2f}ms "
+            f"({matcher_seconds / count * 1e6:.2f}us/message)"
+        )
+        if matcher_seconds:
+            self.stdout.write(f"speedup: x{legacy_seconds / matcher_seconds:.1f}")
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from cores.s3_cleanup import drain_s3_delete_tasks, expire_upload_sessions
+
+
+class Command(BaseCommand):
+    help = "S3 이미지 삭제 대기열(s3_delete_task)과 만료된 업로드 세션을 처리하는 백그라운드 워커"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="대기열을 한 번만 비우고 종료")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--interval", type=float, default=5, help="대기열이 비었을 때 다시 확인할 간격(초)"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            expired = expire_upload_sessions()
+            if expired:
+                self.stdout.write(f"expired_uploads={expired}")
+            result = drain_s3_delete_tasks(options["batch_size"])
+            if result.deleted or result.failed:
+                self.stdout.write(f"deleted={result.deleted} failed={result.failed}")
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
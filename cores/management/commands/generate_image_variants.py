@@ -0,0 +1,56 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from cores.image_worker import IMAGE_VARIANT_TARGETS, generate_image_variants
+from cores.models import ImageVariantTask
+from cores.utils import is_uploaded_image
+
+
+class Command(BaseCommand):
+    help = "업로드된 사진의 줄인 WebP 사진을 만드는 백그라운드 워커(image_variant_task 대기열 처리)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="대기열을 한 번만 비우고 종료")
+        parser.add_argument(
+            "--workers", type=int, default=settings.IMAGE_VARIANT_WORKERS
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--interval", type=float, default=5, help="대기열이 비었을 때 다시 확인할 간격(초)"
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="줄인 사진이 없는 기존 게시글/사용자 사진을 대기열에 넣고 시작",
+        )
+
+    def handle(self, *args, **options):
+        if options["backfill"]:
+            self.stdout.write(f"backfilled={self.backfill()}")
+
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            while True:
+                result = generate_image_variants(executor, options["batch_size"])
+                if result.generated or result.failed:
+                    self.stdout.write(
+                        f"generated={result.generated} failed={result.failed}"
+                    )
+                    continue
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+
+    def backfill(self):
+        tasks = []
+        for type, (model, url_field, _) in IMAGE_VARIANT_TARGETS.items():
+            urls = model.objects.values_list(url_field, flat=True).distinct()
+            tasks += [
+                ImageVariantTask(type=type, key=url.split("/")[-1])
+                for url in urls.iterator()
+                if is_uploaded_image(url, type)
+            ]
+        ImageVariantTask.objects.bulk_create(tasks, batch_size=1000)
+        return len(tasks)
@@ -0,0 +1,44 @@
+# Generated by Django 4.1 on 2026-10-18 01:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def seed_bad_words(apps, schema_editor):
+    BadWord = apps.get_model("cores", "BadWord")
+    BadWord.objects.bulk_create(
+        [BadWord(word=word) for word in dict.fromkeys(settings.BAD_WORDS_LIST) if word],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="BadWord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("word", models.CharField(max_length=50, unique=True)),
+                ("is_active", models.BooleanField(default=True)),
+            ],
+            options={
+                "db_table": "bad_word",
+            },
+        ),
+        migrations.RunPython(seed_bad_words, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.1 on 2026-10-18 01:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0013_user_nickname_trgm_idx"),
+        ("cores", "0002_s3deletetask"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageUploadSession",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("type", models.CharField(max_length=20)),
+                ("key", models.CharField(max_length=100, unique=True)),
+                ("content_type", models.CharField(max_length=100)),
+                ("expires_at", models.DateTimeField(db_index=True)),
+                ("completed_at", models.DateTimeField(null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="upload_sessions",
+                        to="users.user",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "image_upload_session",
+            },
+        ),
+    ]
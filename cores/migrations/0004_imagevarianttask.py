@@ -0,0 +1,43 @@
+# Generated by Django 4.1 on 2026-10-18 01:52
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cores", "0003_imageuploadsession"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageVariantTask",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                ("last_error", models.CharField(blank=True, max_length=500)),
+                ("type", models.CharField(max_length=20)),
+                ("key", models.CharField(max_length=100)),
+            ],
+            options={
+                "db_table": "image_variant_task",
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.1 on 2026-10-18 01:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cores", "0004_imagevarianttask"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredImage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("type", models.CharField(max_length=20)),
+                ("content_hash", models.CharField(max_length=64)),
+                ("key", models.CharField(max_length=100)),
+                ("refcount", models.PositiveIntegerField(default=1)),
+            ],
+            options={
+                "db_table": "stored_image",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="storedimage",
+            constraint=models.UniqueConstraint(
+                fields=("type", "content_hash"), name="unique_stored_image_hash"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="storedimage",
+            constraint=models.UniqueConstraint(
+                fields=("type", "key"), name="unique_stored_image_key"
+            ),
+        ),
+    ]
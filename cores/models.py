@@ -2,6 +2,7 @@ from enum import Enum
 
 from django.db import models
 from django.db.models import CharField
+from django.utils import timezone
 
 
 class TimeStampedModel(models.Model):
@@ -63,6 +64,120 @@ class EnumField(CharField):
         raise AttributeError("Not Found Enum Member")
 
 
+class BadWord(TimeStampedModel):
+    """
+    채팅 메시지, 이름/닉네임 욕설 필터링에 쓰이는 욕설 목록
+    - 각 프로세스가 주기적으로 변경 여부를 확인해서 욕설 검색기를 새로 만듦
+    - 삭제 대신 is_active=False로 바꿔도 필터링에서 빠짐
+    """
+
+    word = models.CharField(max_length=50, unique=True)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = "bad_word"
+
+    def __str__(self):
+        return self.word
+
+
+class QueuedTask(TimeStampedModel):
+    """
+    백그라운드 워커가 처리하는 작업 대기열 공통 필드
+    - 실패하면 attempts를 늘리고 next_attempt_at 이후에 다시 시도,
+      최대 횟수만큼 실패하면 더 시도하지 않고 남겨둠(last_error 확인용)
+    """
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+    last_error = models.CharField(max_length=500, blank=True)
+
+    class Meta:
+        abstract = True
+
+
+class S3DeleteTask(QueuedTask):
+    """
+    S3 이미지 삭제 대기열(outbox)
+    - 요청 처리 중에는 삭제할 객체만 이 테이블에 기록하고, 실제 삭제는
+      drain_s3_delete_tasks 명령(백그라운드 워커)이 delete_objects로 모아서 처리
+    - 요청의 DB 작업과 같은 트랜잭션에 기록되므로 DB 작업이 롤백되면 삭제 요청도 같이 취소됨
+    - S3_DELETE_MAX_ATTEMPTS번까지 다시 시도
+    """
+
+    bucket = models.CharField(max_length=63)
+    key = models.CharField(max_length=1024)
+
+    class Meta:
+        db_table = "s3_delete_task"
+
+    def __str__(self):
+        return f"{self.bucket}/{self.key}"
+
+
+class ImageVariantTask(QueuedTask):
+    """
+    업로드된 사진(type 버킷의 key)의 줄인 WebP 사진 생성 대기열
+    - generate_image_variants 명령(백그라운드 워커)이 프로세스 풀에서 변환 후 S3에 올리고
+      그 사진을 쓰는 게시글/사용자의 image_variants, thumbnail_variants에 주소를 저장
+    - IMAGE_VARIANT_MAX_ATTEMPTS번까지 다시 시도
+    """
+
+    type = models.CharField(max_length=20)
+    key = models.CharField(max_length=100)
+
+    class Meta:
+        db_table = "image_variant_task"
+
+
+class StoredImage(TimeStampedModel):
+    """
+    서버를 거쳐 업로드된 사진의 내용 해시(sha256) -> S3 key 목록과 참조 수
+    - 같은 내용의 사진을 다시 올리면 S3에 새로 올리지 않고 기존 key를 같이 씀
+    - 게시글/사용자 사진으로 쓰일 때마다 refcount를 늘리고, 사진을 바꾸거나 지울 때 줄여서
+      0이 되면 행을 지우고 S3 삭제 대기열(S3DeleteTask)에 넣음
+    - refcount 변경은 select_for_update로 잠근 행에서만 함
+    """
+
+    type = models.CharField(max_length=20)
+    content_hash = models.CharField(max_length=64)
+    key = models.CharField(max_length=100)
+    refcount = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        db_table = "stored_image"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["type", "content_hash"], name="unique_stored_image_hash"
+            ),
+            models.UniqueConstraint(
+                fields=["type", "key"], name="unique_stored_image_key"
+            ),
+        ]
+
+
+class ImageUploadSession(TimeStampedModel):
+    """
+    S3 직접 업로드(presigned POST) 세션
+    - 클라이언트가 서버를 거치지 않고 S3에 사진을 올릴 수 있게 key와 업로드 양식을 발급한 기록
+    - 업로드 후 완료 API를 호출하면 S3에 올라간 사진을 확인하고 게시글/사용자 사진으로 연결,
+      completed_at을 기록함
+    - 완료되지 않고 만료된 세션은 drain_s3_delete_tasks 워커가 올라간 사진 삭제 요청과 함께 정리
+    """
+
+    user = models.ForeignKey(
+        "users.user", related_name="upload_sessions", on_delete=models.CASCADE
+    )
+    type = models.CharField(max_length=20)
+    key = models.CharField(max_length=100, unique=True)
+    content_type = models.CharField(max_length=100)
+    expires_at = models.DateTimeField(db_index=True)
+    completed_at = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = "image_upload_session"
+
+
 class UserType(Enum):
     ADMIN = "admin"
     NORMAL = "normal"
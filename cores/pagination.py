@@ -0,0 +1,186 @@
+import base64
+import binascii
+import hashlib
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q, QuerySet
+from ninja import Schema
+from ninja.errors import HttpError
+from ninja.pagination import PaginationBase
+
+
+def encode_cursor(values: Sequence[str]) -> str:
+    """
+    정렬 키 값 목록을 URL에 그대로 넣을 수 있는 불투명한(opaque) 문자열로 바꿈
+    """
+    data = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, model, ordering: Sequence[str]) -> List[Any]:
+    """
+    encode_cursor로 만든 문자열을 ordering 필드 타입에 맞는 값 목록으로 되돌림
+    - 형식이 틀린 커서는 400 에러
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        raw_values = json.loads(data)
+        if not isinstance(raw_values, list) or len(raw_values) != len(ordering):
+            raise ValueError
+        return [
+            model._meta.get_field(field.lstrip("-")).to_python(value)
+            for field, value in zip(ordering, raw_values)
+        ]
+    except (
+        binascii.Error,
+        UnicodeDecodeError,
+        TypeError,
+        ValueError,
+        ValidationError,
+        FieldDoesNotExist,
+    ) as error:
+        raise HttpError(400, "invalid cursor") from error
+
+
+def get_cursor_values(obj, ordering: Sequence[str]) -> List[str]:
+    """
+    obj의 정렬 키 값을 마이크로초까지 잃지 않도록 문자열로 꺼냄
+    """
+    return [
+        obj._meta.get_field(field.lstrip("-")).value_to_string(obj)
+        for field in ordering
+    ]
+
+
+def keyset_filter(ordering: Sequence[str], values: Sequence[Any]) -> Q:
+    """
+    (a, b, ...) 순서로 정렬된 목록에서 values 다음에 오는 행만 남기는 조건
+    - "-a"는 내림차순이므로 a < 값, "a"는 오름차순이므로 a > 값
+    - (a, b) 기준이면 a 다음 값 OR (a 같음 AND b 다음 값) 형태로 풀어서 만듦
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def order_after_cursor(
+    queryset: QuerySet, ordering: Sequence[str], cursor: Optional[str]
+) -> QuerySet:
+    """
+    queryset을 ordering으로 정렬하고 cursor 다음 행부터 남김
+    - ordering 마지막 필드는 id처럼 유일한 값이어야 같은 정렬 값끼리도 순서가 정해짐
+    - 커서가 잘못되었으면 쿼리를 실행하기 전에 바로 400 에러
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, ordering)
+        queryset = queryset.filter(keyset_filter(ordering, values))
+    return queryset
+
+
+def paginate_by_cursor(
+    queryset: QuerySet, ordering: Sequence[str], cursor: Optional[str], limit: int
+) -> Tuple[list, Optional[str]]:
+    """
+    OFFSET 없이 정렬 키(ordering) 기준으로 다음 limit개를 가져옴
+    - limit + 1개를 읽어서 다음 페이지가 있을 때만 next_cursor를 만듦
+    """
+    queryset = order_after_cursor(queryset, ordering, cursor)
+    items = list(queryset[: limit + 1])
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    return items, encode_cursor(get_cursor_values(items[-1], ordering))
+
+
+def estimate_table_count(queryset: QuerySet) -> Optional[int]:
+    """
+    PostgreSQL 통계(pg_class.reltuples)에 있는 테이블 전체 행 수 추정치
+    - 조건(WHERE) 없이 테이블 전체를 세는 경우에만 쓸 수 있음
+    - PostgreSQL이 아니거나 통계가 아직 없으면 None
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql" or queryset.query.where:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def get_cached_count(queryset: QuerySet) -> int:
+    """
+    목록 전체 개수를 페이지를 넘길 때마다 다시 COUNT(*) 하지 않고 재사용
+    - 큰 테이블 전체를 세는 경우에는 PostgreSQL 통계 추정치 사용
+    - 그 외에는 같은 조건의 개수를 PAGINATION_COUNT_CACHE_TTL초 동안 캐시에 저장
+    - 그래서 최근에 추가/삭제된 행은 잠시 개수에 반영되지 않을 수 있음
+    """
+    queryset = queryset.order_by()
+    estimated_count = estimate_table_count(queryset)
+    if (
+        estimated_count is not None
+        and estimated_count >= settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+    ):
+        return estimated_count
+
+    sql, params = queryset.query.sql_with_params()
+    key = "pagination:count:" + hashlib.md5(f"{sql}{params}".encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TTL)
+    return count
+
+
+class CursorPagination(PaginationBase):
+    """
+    관리자 페이지 목록용 커서(keyset) 페이지네이션
+    - 첫 페이지는 cursor 없이 요청하고, 다음 페이지는 응답의 next_cursor를 cursor로 넣어서 요청
+    - next_cursor가 null이면 마지막 페이지
+    - count는 get_cached_count()로 구한 값이라 정확한 값이 아닐 수 있음
+    - 정렬은 ordering으로 정하므로 view에서 order_by를 하지 않아도 됨
+    """
+
+    class Input(Schema):
+        cursor: Optional[str] = None
+
+    class Output(Schema):
+        items: List[Any]
+        count: int
+        next_cursor: Optional[str]
+
+    def __init__(
+        self,
+        ordering: Sequence[str] = ("-created_at", "-id"),
+        page_size: int = 10,
+        **kwargs: Any,
+    ):
+        self.ordering = tuple(ordering)
+        self.page_size = page_size
+        super().__init__(**kwargs)
+
+    def paginate_queryset(self, queryset: QuerySet, pagination: Input, **params):
+        items, next_cursor = paginate_by_cursor(
+            queryset, self.ordering, pagination.cursor, self.page_size
+        )
+        return {
+            "items": items,
+            "count": get_cached_count(queryset),
+            "next_cursor": next_cursor,
+        }
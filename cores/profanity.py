@@ -0,0 +1,193 @@
+import threading
+import time
+from collections import deque
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, Max
+
+from cores.models import BadWord
+
+MASK_CHAR = "*"
+
+
+class BadWordMatcher:
+    """
+    Aho-Corasick 오토마타 기반 욕설 검색기
+    - 욕설 목록으로 한 번만 만들어두고 여러 번 재사용
+    - 텍스트를 한 번만 훑으면서 모든 욕설(겹치는 욕설 포함)을 찾음
+    """
+
+    def __init__(self, words: Iterable[str]):
+        self.words = tuple(dict.fromkeys(word for word in words if word))
+        self._word_set = frozenset(self.words)
+        self._goto: List[dict] = [{}]
+        self._fail: List[int] = [0]
+        self._match_length: List[int] = [0]
+        self._build()
+
+    def _build(self):
+        for word in self.words:
+            state = 0
+            for char in word:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._match_length.append(0)
+                state = next_state
+            self._match_length[state] = max(self._match_length[state], len(word))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail_state = self._fail[state]
+                while fail_state and char not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                self._fail[next_state] = self._goto[fail_state].get(char, 0)
+                # 같은 위치에서 끝나는 욕설 중 가장 긴 것만 기억하면 짧은 것은 함께 가려짐
+                self._match_length[next_state] = max(
+                    self._match_length[next_state],
+                    self._match_length[self._fail[next_state]],
+                )
+
+    def _find_matches(
+        self, text: str, first_only: bool = False
+    ) -> List[Tuple[int, int]]:
+        """
+        text를 한 번 훑으면서 (욕설이 끝나는 위치, 그 위치에서 끝나는 가장 긴 욕설 길이)
+        목록을 반환
+        """
+        goto, fail, match_length = self._goto, self._fail, self._match_length
+        matches = []
+        state = 0
+        for index, char in enumerate(text):
+            next_state = goto[state].get(char)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(char)
+            state = next_state or 0
+            if match_length[state]:
+                matches.append((index, match_length[state]))
+                if first_only:
+                    break
+        return matches
+
+    def contains(self, text: str) -> bool:
+        """
+        text에 욕설이 하나라도 포함되어 있으면 True
+        """
+        return bool(self._find_matches(text, first_only=True))
+
+    def is_bad_word(self, text: str) -> bool:
+        """
+        text가 욕설 목록의 단어와 정확히 같으면 True
+        """
+        return text in self._word_set
+
+    def censor(self, text: str) -> str:
+        """
+        text에 포함된 욕설을 모두 MASK_CHAR로 바꾼 문자열을 반환
+        - 욕설이 없으면 새 문자열을 만들지 않고 text를 그대로 반환
+        - 찾은 욕설을 뒤에서부터 가리면서 이미 가린 위치는 건너뛰므로
+          전체 작업량은 text 길이에 비례함
+        """
+        matches = self._find_matches(text)
+        if not matches:
+            return text
+
+        buffer = list(text)
+        masked_from = len(buffer)
+        for end, length in reversed(matches):
+            start = end - length + 1
+            for position in range(start, min(end + 1, masked_from)):
+                buffer[position] = MASK_CHAR
+            masked_from = min(masked_from, start)
+        return "".join(buffer)
+
+
+class BadWordSnapshot(NamedTuple):
+    version: Optional[tuple]
+    matcher: BadWordMatcher
+
+
+class BadWordStore:
+    """
+    DB(bad_word 테이블)에 저장된 욕설 목록으로 만든 검색기를 프로세스마다 들고 있는 저장소
+    - reload_interval초마다 한 번씩만 DB에서 목록의 버전(행 개수, 마지막 수정시간)을 확인
+    - 버전이 바뀌었으면 새 검색기를 만든 뒤 스냅샷을 통째로 바꿔치기 함
+    - 메시지마다 드는 비용은 시간 비교 한 번뿐이고, 워커 재시작 없이 목록 변경이 반영됨
+    - DB를 쓸 수 없으면 마지막 스냅샷(처음에는 settings.BAD_WORDS_LIST)을 계속 사용
+    """
+
+    def __init__(self, reload_interval: float):
+        self.reload_interval = reload_interval
+        self._snapshot = BadWordSnapshot(None, BadWordMatcher(settings.BAD_WORDS_LIST))
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[tuple]:
+        return self._snapshot.version
+
+    def get_matcher(self) -> BadWordMatcher:
+        if self.needs_refresh():
+            self.refresh()
+        return self._snapshot.matcher
+
+    def get_cached_matcher(self) -> BadWordMatcher:
+        """
+        DB를 확인하지 않고 현재 스냅샷의 검색기를 반환(asyncio 이벤트 루프에서 사용)
+        - 목록 버전 확인은 needs_refresh()를 보고 호출하는 쪽에서 따로 refresh()
+        """
+        return self._snapshot.matcher
+
+    def needs_refresh(self) -> bool:
+        return time.monotonic() >= self._next_check
+
+    def invalidate(self):
+        """
+        다음 get_matcher() 호출 때 DB의 욕설 목록 버전을 바로 다시 확인하게 함
+        """
+        self._next_check = 0.0
+
+    def refresh(self, force: bool = False):
+        # 다른 스레드가 이미 새 검색기를 만들고 있으면 기존 스냅샷을 그대로 씀
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self.reload_interval
+            try:
+                version = self._load_version()
+                if not force and version == self._snapshot.version:
+                    return
+                words = BadWord.objects.filter(is_active=True).values_list(
+                    "word", flat=True
+                )
+                self._snapshot = BadWordSnapshot(version, BadWordMatcher(words))
+            except DatabaseError:
+                return
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _load_version() -> tuple:
+        version = BadWord.objects.aggregate(
+            count=Count("id"), last_updated_at=Max("updated_at")
+        )
+        return version["count"], version["last_updated_at"]
+
+
+bad_word_store = BadWordStore(settings.BAD_WORDS_RELOAD_INTERVAL)
+
+
+def get_bad_words_matcher() -> BadWordMatcher:
+    """
+    현재 욕설 목록 스냅샷의 검색기를 반환
+    """
+    return bad_word_store.get_matcher()
@@ -0,0 +1,117 @@
+from datetime import timedelta
+from typing import List, NamedTuple
+
+import botocore
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from cores.models import ImageUploadSession, S3DeleteTask
+from cores.utils import file_handler
+
+
+class DrainResult(NamedTuple):
+    deleted: int
+    failed: int
+
+
+def claim_tasks(model, batch_size: int, max_attempts: int) -> list:
+    """
+    model 대기열(QueuedTask)에서 처리할 때가 된 작업을 batch_size개까지 가져오고
+    S3_DELETE_LEASE_SECONDS초 동안 선점
+    - skip_locked로 다른 워커가 가져가는 중인 행은 건너뛰므로 워커를 여러 개 띄워도 됨
+    - S3 요청은 트랜잭션 밖에서 하므로 행 잠금을 오래 잡고 있지 않음
+    - 워커가 처리 중에 죽으면 선점 시간이 지난 뒤 다시 처리됨
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        tasks = list(
+            model.objects.select_for_update(skip_locked=True)
+            .filter(next_attempt_at__lte=now, attempts__lt=max_attempts)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        model.objects.filter(id__in=[task.id for task in tasks]).update(
+            next_attempt_at=now + timedelta(seconds=settings.S3_DELETE_LEASE_SECONDS)
+        )
+    return tasks
+
+
+def retry_tasks_later(tasks: list, errors: dict, retry_delay: float):
+    """
+    실패한 작업의 attempts를 늘리고 재시도 시각을 지수적으로 늦춤
+    - errors: 작업 id별 에러 메시지
+    """
+    now = timezone.now()
+    for task in tasks:
+        type(task).objects.filter(id=task.id).update(
+            attempts=F("attempts") + 1,
+            next_attempt_at=now + timedelta(seconds=retry_delay * 2**task.attempts),
+            last_error=errors[task.id][:500],
+        )
+
+
+def delete_s3_objects(bucket: str, tasks: List[S3DeleteTask]) -> DrainResult:
+    keys = list(dict.fromkeys(task.key for task in tasks))
+    try:
+        errors = file_handler.delete_many(bucket, keys)
+    except (
+        botocore.exceptions.BotoCoreError,
+        botocore.exceptions.ClientError,
+    ) as error:
+        errors = dict.fromkeys(keys, str(error))
+
+    failed_tasks = [task for task in tasks if task.key in errors]
+    S3DeleteTask.objects.filter(
+        id__in=[task.id for task in tasks if task.key not in errors]
+    ).delete()
+    retry_tasks_later(
+        failed_tasks,
+        {task.id: errors[task.key] for task in failed_tasks},
+        settings.S3_DELETE_RETRY_DELAY,
+    )
+    return DrainResult(len(tasks) - len(failed_tasks), len(failed_tasks))
+
+
+def drain_s3_delete_tasks(batch_size: int = None) -> DrainResult:
+    """
+    S3 삭제 대기열을 한 배치 처리하고 (삭제 성공 수, 실패 수)를 반환
+    - 버킷별로 모아서 delete_objects 한 번에 최대 S3_DELETE_BATCH_SIZE(1000)개씩 삭제
+    - 삭제 성공한 작업은 대기열에서 지우고, 실패한 작업은 나중에 다시 시도
+    - 이미 없는 객체를 지우는 것도 S3에서는 성공이므로 같은 작업을 두 번 처리해도 괜찮음
+    """
+    batch_size = min(batch_size or settings.S3_DELETE_BATCH_SIZE, 1000)
+    tasks_by_bucket = {}
+    tasks = claim_tasks(S3DeleteTask, batch_size, settings.S3_DELETE_MAX_ATTEMPTS)
+    for task in tasks:
+        tasks_by_bucket.setdefault(task.bucket, []).append(task)
+
+    deleted, failed = 0, 0
+    for bucket, tasks in tasks_by_bucket.items():
+        result = delete_s3_objects(bucket, tasks)
+        deleted += result.deleted
+        failed += result.failed
+    return DrainResult(deleted, failed)
+
+
+def expire_upload_sessions(batch_size: int = 1000) -> int:
+    """
+    완료되지 않고 만료된 지 IMAGE_UPLOAD_CLEANUP_DELAY초가 지난 S3 직접 업로드 세션을 정리
+    - 클라이언트가 업로드만 하고 완료 API를 호출하지 않았을 수 있으므로 key 삭제를 대기열에 넣음
+    - 완료된 세션 기록도 같은 기준으로 지움
+    """
+    deadline = timezone.now() - timedelta(seconds=settings.IMAGE_UPLOAD_CLEANUP_DELAY)
+    with transaction.atomic():
+        uploads = list(
+            ImageUploadSession.objects.select_for_update(skip_locked=True)
+            .filter(completed_at__isnull=True, expires_at__lt=deadline)
+            .values_list("id", "type", "key")[:batch_size]
+        )
+        S3DeleteTask.objects.bulk_create(
+            [S3DeleteTask(bucket=type, key=key) for _, type, key in uploads]
+        )
+        ImageUploadSession.objects.filter(
+            id__in=[upload_id for upload_id, _, _ in uploads]
+        ).delete()
+        ImageUploadSession.objects.filter(completed_at__lt=deadline).delete()
+    return len(uploads)
@@ -1,11 +1,16 @@
 import re
-from typing import List
+from datetime import datetime
+from typing import ClassVar, List, Set
 
-from django.conf import settings
+from django.db.models import QuerySet
 from ninja import Field, ModelSchema, Schema
 from pydantic import validator
 
 from comments.models import CommentReport
+from cores.models import BadWord
+from cores.profanity import get_bad_words_matcher
+from cores.search import search_by_nickname
+from cores.utils import IMAGE_EXTENSIONS_LIST
 from posts.models import PostReport
 from users.models import NAME_AND_NICKNAME_MAX_LENGTH
 
@@ -23,7 +28,7 @@ SORT_TYPES = [
 
 
 def validate_name(value: str):
-    if value in settings.BAD_WORDS_LIST:
+    if get_bad_words_matcher().is_bad_word(value):
         raise ValueError("name or nickname is not allowed")
     return (
         value
@@ -55,17 +60,29 @@ class ListFilters(Schema):
         "created_at__date__range", allow_reuse=True
     )(validate_filter_date)
 
+    # search 값으로 검색할 닉네임 필드 경로
+    search_field: ClassVar[str] = "nickname"
+
+    def filter_queryset(self, queryset: QuerySet, exclude: Set[str] = None):
+        """
+        입력된 조건으로 queryset을 거름
+        - 닉네임 검색(search)은 cores.search.search_by_nickname으로 처리
+        - exclude: 적용하지 않을 조건 이름
+        """
+        filters = self.dict(exclude_none=True, exclude={"search", *(exclude or ())})
+        return search_by_nickname(
+            queryset.filter(**filters), self.search_field, self.search
+        )
+
 
 class UserListFilters(ListFilters):
-    nickname__icontains: str = Field(
-        default=None, alias="search", description="사용자 닉네임 검색"
-    )
+    search: str = Field(default=None, description="사용자 닉네임 검색")
 
 
 class PostListFilters(ListFilters):
-    user__nickname__icontains: str = Field(
-        default=None, alias="search", description="글쓴이 닉네임 검색"
-    )
+    search: str = Field(default=None, description="글쓴이 닉네임 검색")
+
+    search_field: ClassVar[str] = "user__nickname"
 
 
 class MessageOut(Schema):
@@ -99,6 +116,23 @@ class NoticeReportOut(Schema):
     comment_reports: List[CommentReportOut] = []
 
 
+class BadWordIn(Schema):
+    words: List[str]
+
+    @validator("words", each_item=True)
+    def validate_word(cls, value):
+        value = value.strip()
+        if value and len(value) <= 50:
+            return value
+        raise ValueError("invalid bad word")
+
+
+class BadWordOut(ModelSchema):
+    class Config:
+        model = BadWord
+        model_fields = ["id", "word", "is_active", "updated_at"]
+
+
 class CheckNoticeIn(Schema):
     id: str
     type: str
@@ -116,3 +150,42 @@ class CheckNoticeIn(Schema):
         if value in REPORT_TYPES:
             return value
         raise ValueError("invalid report type")
+
+
+class CreateUploadIn(Schema):
+    type: str
+    file_name: str
+    content_type: str
+
+    @validator("type")
+    def validate_upload_type(cls, value):
+        if value in ["user_thumbnail", "post_images"]:
+            return value
+        raise ValueError("invalid type")
+
+    @validator("file_name")
+    def validate_file_name(cls, value):
+        if value.split(".")[-1].lower() in IMAGE_EXTENSIONS_LIST:
+            return value
+        raise ValueError("invalid file extension")
+
+    @validator("content_type")
+    def validate_content_type(cls, value):
+        if value.startswith("image/"):
+            return value
+        raise ValueError("invalid content type")
+
+
+class CreateUploadOut(Schema):
+    id: int
+    url: str
+    fields: dict
+    expires_at: datetime
+
+
+class CompleteUploadIn(Schema):
+    target_id: int
+
+
+class CompleteUploadOut(Schema):
+    image_url: str
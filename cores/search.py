@@ -0,0 +1,16 @@
+from django.db.models import QuerySet
+
+
+def search_by_nickname(queryset: QuerySet, field: str, term: str) -> QuerySet:
+    """
+    닉네임 부분 검색(대소문자 무시)
+    - field: queryset 기준 닉네임 필드 경로(예: "nickname", "user__nickname")
+    - PostgreSQL에서는 icontains가 만드는 UPPER(nickname::text) LIKE UPPER('%검색어%') 조건을
+      UPPER(nickname)에 만든 pg_trgm GIN 인덱스(user_nickname_trgm_idx)로 처리
+    - pg_trgm은 3글자 단위로 색인하므로 3글자 이상 검색어에서 효과가 큼
+    - SQLite(테스트 DB)에는 pg_trgm 인덱스가 없으므로 같은 조건을 LIKE 전체 스캔으로 처리
+    """
+    term = (term or "").strip()
+    if not term:
+        return queryset
+    return queryset.filter(**{f"{field}__icontains": term})
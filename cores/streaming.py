@@ -0,0 +1,55 @@
+import json
+from typing import Iterator, Optional, Sequence, Type
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from ninja import Schema
+from ninja.responses import NinjaJSONEncoder
+
+from cores.pagination import encode_cursor, get_cursor_values, order_after_cursor
+
+
+def serialize_json(schema: Type[Schema], obj) -> bytes:
+    """
+    ninja 응답과 같은 형식(NinjaJSONEncoder)으로 obj 하나를 JSON bytes로 만듦
+    """
+    return json.dumps(schema.from_orm(obj).dict(), cls=NinjaJSONEncoder).encode()
+
+
+def stream_cursor_page(
+    schema: Type[Schema],
+    queryset: QuerySet,
+    ordering: Sequence[str],
+    cursor: Optional[str],
+    limit: int,
+) -> Iterator[bytes]:
+    """
+    cores.pagination.paginate_by_cursor와 같은 {"items": [...], "next_cursor": ...} 응답을
+    스트리밍으로 만듦
+    - 행은 view 안에서(응답을 시작하기 전에) limit + 1개까지 읽음,
+      ASGI(uvicorn)에서는 스트리밍 본문을 이벤트 루프에서 읽으므로 본문을 만들 때 DB를 조회할 수 없음
+    - 응답 JSON은 한 번에 만들지 않고 객체 하나씩 직렬화해서 내보냄
+    - next_cursor는 limit + 1번째 행이 있을 때만 만듦
+    - 잘못된 커서는 응답을 시작하기 전에 400 에러
+    """
+    objects = list(order_after_cursor(queryset, ordering, cursor)[: limit + 1])
+    next_cursor = None
+    if len(objects) > limit:
+        objects = objects[:limit]
+        next_cursor = encode_cursor(get_cursor_values(objects[-1], ordering))
+
+    def generate():
+        yield b'{"items": ['
+        for index, obj in enumerate(objects):
+            if index:
+                yield b", "
+            yield serialize_json(schema, obj)
+        yield b'], "next_cursor": %s}' % json.dumps(next_cursor).encode()
+
+    return generate()
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    def __init__(self, streaming_content: Iterator[bytes], **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(streaming_content, **kwargs)
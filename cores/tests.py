@@ -1,12 +1,60 @@
+import json
 import unittest
+from datetime import timedelta
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import boto3
+import botocore
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
 from moto import mock_s3
+from ninja.errors import HttpError
+from PIL import Image
 
-from .models import EnumField
-from .utils import censor_text
+from users.models import User
+from users.tests import UserTest
+
+from posts.models import Post
+
+from .image_worker import generate_image_variants, render_webp_variants
+from .models import (
+    BadWord,
+    EnumField,
+    ImageUploadSession,
+    ImageVariantTask,
+    S3DeleteTask,
+    StoredImage,
+)
+from .pagination import (
+    decode_cursor,
+    encode_cursor,
+    get_cached_count,
+    get_cursor_values,
+    paginate_by_cursor,
+)
+from .profanity import BadWordMatcher, bad_word_store
+from .s3_cleanup import drain_s3_delete_tasks, expire_upload_sessions
+from .schemas import validate_name
+from .utils import (
+    FileHandler,
+    S3Service,
+    censor_text,
+    delete_existing_image,
+    enqueue_image_variants,
+    file_handler,
+    handle_upload_file,
+    reuse_stored_image,
+    s3_service,
+)
 
 
 def func_to_test(bucket_name, key, content):
@@ -50,6 +98,482 @@ class S3ServiceTest(unittest.TestCase):
         with self.assertRaises(Exception):
             test_object.get()["Body"].read()
 
+    def test_client_is_created_lazily_once(self):
+        service = S3Service()
+        self.assertNotIn("s3_client", service.__dict__)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            clients = list(executor.map(lambda _: service.s3_client, range(8)))
+
+        self.assertTrue(all(client is clients[0] for client in clients))
+        self.assertEqual(
+            clients[0].meta.config.max_pool_connections,
+            settings.S3_MAX_POOL_CONNECTIONS,
+        )
+
+    def test_file_handler_stats(self):
+        service = S3Service()
+        handler = FileHandler(service)
+
+        handler.upload(BytesIO(b"abc"), self.bucket_name, "dog.png", {})
+        self.assertEqual(handler.download(self.bucket_name, "dog.png"), b"abc")
+        with self.assertRaises(HttpError):
+            handler.delete("missing-bucket", "dog.png")
+        service.s3_client.meta.events.emit(
+            "after-call.s3.PutObject",
+            parsed={"ResponseMetadata": {"RetryAttempts": 2}},
+            model=SimpleNamespace(name="PutObject"),
+            context={},
+            http_response=None,
+        )
+
+        stats = handler.stats()
+        self.assertEqual(stats["operations"]["upload"]["count"], 1)
+        self.assertEqual(stats["operations"]["download"]["errors"], 0)
+        self.assertEqual(stats["operations"]["delete"]["errors"], 1)
+        self.assertGreater(stats["operations"]["upload"]["max_ms"], 0)
+        self.assertEqual(stats["retries"], {"PutObject": 2})
+
+        handler.reset_stats()
+        self.assertEqual(handler.stats(), {"operations": {}, "retries": {}})
+
+
+class S3TestCase(TestCase):
+    mock_s3 = mock_s3()
+    bucket_name = "post_images"
+
+    def setUp(self):
+        self.mock_s3.start()
+        self.s3_client = boto3.client("s3", region_name="ap-northeast-2")
+        self.s3_client.create_bucket(
+            Bucket=self.bucket_name,
+            CreateBucketConfiguration={"LocationConstraint": "ap-northeast-2"},
+        )
+        # s3_service 클라이언트는 mock_s3 시작 전에 만들어졌으므로 moto 클라이언트로 바꿔서 테스트
+        self.client_patcher = patch.object(s3_service, "s3_client", self.s3_client)
+        self.client_patcher.start()
+
+    def tearDown(self):
+        self.client_patcher.stop()
+        self.mock_s3.stop()
+
+    def put_images(self, count):
+        keys = [f"image{index}.png" for index in range(count)]
+        for key in keys:
+            self.s3_client.put_object(Bucket=self.bucket_name, Key=key, Body=b"abc")
+        return keys
+
+    def stored_keys(self):
+        response = self.s3_client.list_objects_v2(Bucket=self.bucket_name)
+        return sorted(item["Key"] for item in response.get("Contents", []))
+
+
+class S3DeleteTaskTest(S3TestCase):
+    @patch("cores.utils.file_handler")
+    def test_delete_existing_image_only_enqueues(self, mock_file_handler):
+        delete_existing_image(f"{settings.POST_IMAGES_URL}image0.png", "post_images")
+        delete_existing_image(settings.DEFAULT_POST_IMAGE_URL, "post_images")
+
+        mock_file_handler.delete.assert_not_called()
+        self.assertEqual(
+            list(S3DeleteTask.objects.values_list("bucket", "key")),
+            [
+                ("post_images", "image0.png"),
+                ("post_images", "image0_feed.webp"),
+                ("post_images", "image0_detail.webp"),
+            ],
+        )
+
+    def test_drain_deletes_objects_in_batches(self):
+        keys = self.put_images(3)
+        for key in keys:
+            S3DeleteTask.objects.create(bucket=self.bucket_name, key=key)
+
+        with patch.object(
+            self.s3_client, "delete_objects", wraps=self.s3_client.delete_objects
+        ) as delete_objects:
+            first = drain_s3_delete_tasks(batch_size=2)
+            second = drain_s3_delete_tasks(batch_size=2)
+
+        self.assertEqual((first.deleted, first.failed), (2, 0))
+        self.assertEqual((second.deleted, second.failed), (1, 0))
+        self.assertEqual(delete_objects.call_count, 2)
+        self.assertEqual(self.stored_keys(), [])
+        self.assertFalse(S3DeleteTask.objects.exists())
+
+    def test_drain_retries_failed_tasks_later(self):
+        task = S3DeleteTask.objects.create(bucket="missing-bucket", key="image0.png")
+
+        result = drain_s3_delete_tasks()
+        task.refresh_from_db()
+
+        self.assertEqual((result.deleted, result.failed), (0, 1))
+        self.assertEqual(task.attempts, 1)
+        self.assertIn("NoSuchBucket", task.last_error)
+        self.assertGreater(task.next_attempt_at, timezone.now())
+        self.assertEqual(drain_s3_delete_tasks(), (0, 0))
+
+        S3DeleteTask.objects.filter(id=task.id).update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1),
+            attempts=settings.S3_DELETE_MAX_ATTEMPTS,
+        )
+        self.assertEqual(drain_s3_delete_tasks(), (0, 0))
+
+    def test_drain_command_once(self):
+        keys = self.put_images(2)
+        S3DeleteTask.objects.create(bucket=self.bucket_name, key=keys[0])
+        out = StringIO()
+
+        call_command("drain_s3_delete_tasks", "--once", stdout=out)
+
+        self.assertEqual(out.getvalue().strip(), "deleted=1 failed=0")
+        self.assertEqual(self.stored_keys(), [keys[1]])
+
+
+class StoredImageTest(S3TestCase):
+    def upload(self, content=b"same image", name="dog.png"):
+        return handle_upload_file(
+            SimpleUploadedFile(name, content, content_type="image/png"),
+            self.bucket_name,
+        )
+
+    def test_same_content_reuses_uploaded_image(self):
+        first = self.upload()
+        second = self.upload(name="copy.png")
+        other = self.upload(content=b"other image")
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(len(self.stored_keys()), 2)
+        self.assertEqual(StoredImage.objects.get(key=first.split("/")[-1]).refcount, 2)
+
+    def test_delete_only_when_refcount_drops_to_zero(self):
+        image_url = self.upload()
+        self.upload()
+        key = image_url.split("/")[-1]
+
+        delete_existing_image(image_url, self.bucket_name)
+        self.assertEqual(StoredImage.objects.get(key=key).refcount, 1)
+        self.assertFalse(S3DeleteTask.objects.exists())
+
+        delete_existing_image(image_url, self.bucket_name)
+        self.assertFalse(StoredImage.objects.exists())
+        self.assertIn(key, S3DeleteTask.objects.values_list("key", flat=True))
+
+        self.assertNotEqual(self.upload(), image_url)
+
+    def test_concurrent_first_upload_keeps_one_image(self):
+        winner = StoredImage(type=self.bucket_name, key="winner.png")
+
+        def reuse_after_other_upload(type, content_hash):
+            if not winner.id:
+                winner.content_hash = content_hash
+                winner.save()
+                return None
+            return reuse_stored_image(type, content_hash)
+
+        with patch("cores.utils.reuse_stored_image", reuse_after_other_upload):
+            image_url = self.upload()
+
+        self.assertTrue(image_url.endswith("/winner.png"))
+        self.assertEqual(StoredImage.objects.get().refcount, 2)
+        self.assertEqual(
+            list(S3DeleteTask.objects.values_list("key", flat=True)),
+            [key for key in self.stored_keys() if key != "winner.png"],
+        )
+
+
+class ImageUploadTest(UserTest):
+    mock_s3 = mock_s3()
+
+    def setUp(self):
+        super().setUp()
+        self.mock_s3.start()
+        self.s3_client = boto3.client("s3", region_name="ap-northeast-2")
+        for bucket in ["post_images", "user_thumbnail"]:
+            self.s3_client.create_bucket(
+                Bucket=bucket,
+                CreateBucketConfiguration={"LocationConstraint": "ap-northeast-2"},
+            )
+        self.client_patcher = patch.object(s3_service, "s3_client", self.s3_client)
+        self.client_patcher.start()
+        self.test_post = Post.objects.create(
+            user=self.test_user_1,
+            subject="Test",
+            image_url=f"{settings.POST_IMAGES_URL}old.png",
+        )
+
+    def tearDown(self):
+        super().tearDown()
+        self.client_patcher.stop()
+        self.mock_s3.stop()
+
+    def create_upload(self, type="post_images", file_name="dog.png"):
+        return self.client.post(
+            reverse("api-1.0.0:create_upload"),
+            data={"type": type, "file_name": file_name, "content_type": "image/png"},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+
+    def complete_upload(self, upload_id, target_id, jwt=None):
+        return self.client.post(
+            reverse("api-1.0.0:complete_upload", kwargs={"upload_id": upload_id}),
+            data={"target_id": target_id},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {jwt or self.user_jwt}",
+        )
+
+    def test_success_upload_post_image(self):
+        response = self.create_upload()
+        upload = ImageUploadSession.objects.get(id=response.json()["id"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["fields"]["key"], upload.key)
+        self.assertEqual(response.json()["fields"]["Content-Type"], "image/png")
+        self.assertTrue(upload.key.endswith(".png"))
+
+        self.s3_client.put_object(Bucket="post_images", Key=upload.key, Body=b"abc")
+        response = self.complete_upload(upload.id, self.test_post.id)
+        image_url = f"{settings.POST_IMAGES_URL}{upload.key}"
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"image_url": image_url})
+        self.assertEqual(Post.objects.get(id=self.test_post.id).image_url, image_url)
+        self.assertTrue(
+            S3DeleteTask.objects.filter(bucket="post_images", key="old.png").exists()
+        )
+        self.assertEqual(
+            self.complete_upload(upload.id, self.test_post.id).status_code, 404
+        )
+
+    def test_complete_upload_only_once_when_completed_concurrently(self):
+        upload_id = self.create_upload().json()["id"]
+        upload = ImageUploadSession.objects.get(id=upload_id)
+        self.s3_client.put_object(Bucket="post_images", Key=upload.key, Body=b"abc")
+        get_file_info = file_handler.get_file_info
+
+        # 파일을 확인하는 사이 다른 요청이 같은 업로드를 먼저 완료함
+        def complete_concurrently(*args):
+            ImageUploadSession.objects.filter(id=upload_id).update(
+                completed_at=timezone.now()
+            )
+            return get_file_info(*args)
+
+        with patch.object(
+            file_handler, "get_file_info", side_effect=complete_concurrently
+        ):
+            response = self.complete_upload(upload_id, self.test_post.id)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            Post.objects.get(id=self.test_post.id).image_url,
+            f"{settings.POST_IMAGES_URL}old.png",
+        )
+        self.assertFalse(S3DeleteTask.objects.exists())
+
+    def test_success_upload_user_thumbnail(self):
+        upload_id = self.create_upload(type="user_thumbnail").json()["id"]
+        upload = ImageUploadSession.objects.get(id=upload_id)
+        self.s3_client.put_object(Bucket="user_thumbnail", Key=upload.key, Body=b"abc")
+
+        response = self.complete_upload(upload.id, self.test_user_1.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            User.objects.get(id=self.test_user_1.id).thumbnail_url,
+            f"{settings.PROFILE_IMAGES_URL}{upload.key}",
+        )
+
+    def test_complete_upload_enqueues_variants(self):
+        upload_id = self.create_upload(type="user_thumbnail").json()["id"]
+        upload = ImageUploadSession.objects.get(id=upload_id)
+        self.s3_client.put_object(Bucket="user_thumbnail", Key=upload.key, Body=b"a")
+
+        self.complete_upload(upload.id, self.test_user_1.id)
+
+        self.assertTrue(
+            ImageVariantTask.objects.filter(
+                type="user_thumbnail", key=upload.key
+            ).exists()
+        )
+
+    def test_fail_422_create_upload_with_invalid_extension(self):
+        response = self.create_upload(file_name="dog.exe")
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(ImageUploadSession.objects.exists())
+
+    def test_fail_400_complete_upload_without_file(self):
+        upload_id = self.create_upload().json()["id"]
+        response = self.complete_upload(upload_id, self.test_post.id)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "uploaded file not found"})
+        self.assertEqual(
+            Post.objects.get(id=self.test_post.id).image_url,
+            f"{settings.POST_IMAGES_URL}old.png",
+        )
+
+    def test_fail_403_complete_upload_for_other_users_post(self):
+        upload_id = self.create_upload().json()["id"]
+        self.test_post.user = self.test_admin
+        self.test_post.save()
+
+        response = self.complete_upload(upload_id, self.test_post.id)
+        self.assertEqual(response.status_code, 403)
+
+    def test_expire_upload_sessions(self):
+        upload_id = self.create_upload().json()["id"]
+        upload = ImageUploadSession.objects.get(id=upload_id)
+        ImageUploadSession.objects.filter(id=upload_id).update(
+            expires_at=timezone.now()
+            - timedelta(seconds=settings.IMAGE_UPLOAD_CLEANUP_DELAY + 1)
+        )
+
+        self.assertEqual(expire_upload_sessions(), 1)
+        self.assertFalse(ImageUploadSession.objects.exists())
+        self.assertTrue(S3DeleteTask.objects.filter(key=upload.key).exists())
+
+
+def make_png(width, height):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), "orange").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class ImageVariantTest(UserTest):
+    mock_s3 = mock_s3()
+
+    def setUp(self):
+        super().setUp()
+        self.mock_s3.start()
+        self.s3_client = boto3.client("s3", region_name="ap-northeast-2")
+        self.s3_client.create_bucket(
+            Bucket="post_images",
+            CreateBucketConfiguration={"LocationConstraint": "ap-northeast-2"},
+        )
+        self.client_patcher = patch.object(s3_service, "s3_client", self.s3_client)
+        self.client_patcher.start()
+        self.s3_client.put_object(
+            Bucket="post_images", Key="dog.png", Body=make_png(2000, 1000)
+        )
+        self.test_post = Post.objects.create(
+            user=self.test_user_1,
+            subject="Test",
+            image_url=f"{settings.POST_IMAGES_URL}dog.png",
+        )
+        ImageVariantTask.objects.create(type="post_images", key="dog.png")
+
+    def tearDown(self):
+        super().tearDown()
+        self.client_patcher.stop()
+        self.mock_s3.stop()
+
+    def generate(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return generate_image_variants(executor)
+
+    def test_render_webp_variants(self):
+        variants = render_webp_variants(
+            make_png(2000, 1000), {"feed": 640, "big": 4000}
+        )
+
+        with Image.open(BytesIO(variants["feed"])) as image:
+            self.assertEqual((image.format, image.size), ("WEBP", (640, 320)))
+        with Image.open(BytesIO(variants["big"])) as image:
+            self.assertEqual(image.size, (2000, 1000))
+
+    def test_generate_image_variants(self):
+        self.assertEqual(self.generate(), (1, 0))
+
+        post = Post.objects.get(id=self.test_post.id)
+        self.assertEqual(
+            post.image_variants,
+            {
+                "source": post.image_url,
+                "feed": f"{settings.POST_IMAGES_URL}dog_feed.webp",
+                "detail": f"{settings.POST_IMAGES_URL}dog_detail.webp",
+            },
+        )
+        head = self.s3_client.head_object(Bucket="post_images", Key="dog_feed.webp")
+        self.assertEqual(head["ContentType"], "image/webp")
+        self.assertFalse(ImageVariantTask.objects.exists())
+
+        response = self.client.get(
+            reverse("api-1.0.0:get_posts"),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertEqual(response.json()[0]["image_url"], post.image_variants["feed"])
+
+    def test_variants_ignored_after_image_changed(self):
+        self.generate()
+        new_image_url = f"{settings.POST_IMAGES_URL}cat.png"
+        Post.objects.filter(id=self.test_post.id).update(image_url=new_image_url)
+
+        post = Post.objects.get(id=self.test_post.id)
+        self.assertEqual(post.feed_image_url, new_image_url)
+        self.assertEqual(post.detail_image_url, new_image_url)
+
+    def test_generate_for_deleted_image_enqueues_variant_delete(self):
+        Post.objects.filter(id=self.test_post.id).update(
+            image_url=settings.DEFAULT_POST_IMAGE_URL
+        )
+
+        self.assertEqual(self.generate(), (1, 0))
+        self.assertEqual(
+            sorted(S3DeleteTask.objects.values_list("key", flat=True)),
+            ["dog_detail.webp", "dog_feed.webp"],
+        )
+
+    def test_generate_drops_invalid_image(self):
+        self.s3_client.put_object(Bucket="post_images", Key="dog.png", Body=b"abc")
+
+        # 열 수 없는 사진은 다시 시도하지 않음
+        self.assertEqual(self.generate(), (0, 1))
+        self.assertFalse(ImageVariantTask.objects.exists())
+        self.assertEqual(Post.objects.get(id=self.test_post.id).image_variants, {})
+
+    def test_generate_retries_s3_error_later(self):
+        with patch.object(
+            s3_service,
+            "download",
+            side_effect=botocore.exceptions.EndpointConnectionError(endpoint_url="s3"),
+        ):
+            self.assertEqual(self.generate(), (0, 1))
+        task = ImageVariantTask.objects.get()
+        self.assertEqual(task.attempts, 1)
+        self.assertIn("Could not connect", task.last_error)
+
+    def test_enqueue_only_images_pillow_can_open(self):
+        ImageVariantTask.objects.all().delete()
+        for key in ["dog.svg", "dog.jpeg"]:
+            enqueue_image_variants(f"{settings.POST_IMAGES_URL}{key}", "post_images")
+        self.assertEqual(
+            list(ImageVariantTask.objects.values_list("key", flat=True)), ["dog.jpeg"]
+        )
+
+    def test_generate_copies_variants_of_reused_image(self):
+        self.generate()
+        other_post = Post.objects.create(
+            user=self.test_admin, subject="Copy", image_url=self.test_post.image_url
+        )
+        ImageVariantTask.objects.create(type="post_images", key="dog.png")
+        self.s3_client.delete_object(Bucket="post_images", Key="dog.png")
+
+        self.assertEqual(self.generate(), (1, 0))
+        other_post.refresh_from_db()
+        self.assertEqual(
+            other_post.image_variants,
+            Post.objects.get(id=self.test_post.id).image_variants,
+        )
+
+    def test_generate_for_missing_original(self):
+        self.s3_client.delete_object(Bucket="post_images", Key="dog.png")
+
+        self.assertEqual(self.generate(), (1, 0))
+        self.assertFalse(ImageVariantTask.objects.exists())
+        self.assertEqual(Post.objects.get(id=self.test_post.id).image_variants, {})
+
 
 class EnumFieldTest(TestCase):
     def test_enumfield_requirement(self):
@@ -102,3 +626,154 @@ class CensorTextTest(unittest.TestCase):
 
         text = "This is a test."
         self.assertEqual(censor_text(text), "This is a test.")
+
+
+class BadWordMatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.matcher = BadWordMatcher(["시발", "개새끼", "새끼", "ab", "bc", ""])
+
+    def test_censor_korean_words(self):
+        self.assertEqual(self.matcher.censor("아 시발 진짜"), "아 ** 진짜")
+        self.assertEqual(self.matcher.censor("이 개새끼야 새끼야"), "이 ***야 **야")
+
+    def test_censor_overlapping_words(self):
+        self.assertEqual(self.matcher.censor("abc"), "***")
+        self.assertEqual(self.matcher.censor("xabx bcx"), "x**x **x")
+
+    def test_censor_returns_same_text_without_bad_words(self):
+        text = "우리 강아지 산책 가요"
+        self.assertIs(self.matcher.censor(text), text)
+        self.assertEqual(self.matcher.censor(""), "")
+
+    def test_contains(self):
+        self.assertTrue(self.matcher.contains("개새끼"))
+        self.assertTrue(self.matcher.contains("닉네임시발"))
+        self.assertFalse(self.matcher.contains("함께하개"))
+
+    def test_is_bad_word(self):
+        self.assertTrue(self.matcher.is_bad_word("개새끼"))
+        self.assertFalse(self.matcher.is_bad_word("닉네임시발"))
+        self.assertFalse(self.matcher.is_bad_word(""))
+
+
+class BadWordStoreTest(TestCase):
+    def tearDown(self):
+        bad_word_store.invalidate()
+
+    def test_reload_after_bad_words_changed(self):
+        bad_word_store.invalidate()
+        self.assertEqual(censor_text("멍멍 짖지마"), "멍멍 짖지마")
+        version = bad_word_store.version
+
+        BadWord.objects.create(word="짖지마")
+        # 확인 주기가 지나기 전에는 기존 스냅샷을 그대로 사용
+        self.assertEqual(censor_text("멍멍 짖지마"), "멍멍 짖지마")
+
+        bad_word_store.invalidate()
+        self.assertEqual(censor_text("멍멍 짖지마"), "멍멍 ***")
+        self.assertNotEqual(bad_word_store.version, version)
+
+    def test_no_reload_when_version_unchanged(self):
+        bad_word_store.invalidate()
+        matcher = bad_word_store.get_matcher()
+
+        bad_word_store.invalidate()
+        self.assertIs(bad_word_store.get_matcher(), matcher)
+
+    def test_validate_name_rejects_only_exact_bad_words(self):
+        BadWord.objects.create(word="짖지마")
+        bad_word_store.invalidate()
+
+        with self.assertRaises(ValueError):
+            validate_name("짖지마")
+        self.assertEqual(validate_name("멍멍짖지마"), "멍멍짖지마")
+
+
+class BadWordApiTest(UserTest):
+    def tearDown(self):
+        super().tearDown()
+        bad_word_store.invalidate()
+
+    def test_success_add_and_deactivate_bad_words(self):
+        response = self.client.post(
+            reverse("api-1.0.0:add_bad_words"),
+            json.dumps({"words": ["짖지마"]}),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"message": "success"})
+        self.assertEqual(censor_text("멍멍 짖지마"), "멍멍 ***")
+
+        bad_word = BadWord.objects.get(word="짖지마")
+        response = self.client.delete(
+            reverse(
+                "api-1.0.0:deactivate_bad_word", kwargs={"bad_word_id": bad_word.id}
+            ),
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(censor_text("멍멍 짖지마"), "멍멍 짖지마")
+
+    def test_fail_403_add_bad_words(self):
+        response = self.client.post(
+            reverse("api-1.0.0:add_bad_words"),
+            json.dumps({"words": ["짖지마"]}),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {"detail": "forbidden"})
+
+    def test_fail_422_add_bad_words(self):
+        response = self.client.post(
+            reverse("api-1.0.0:add_bad_words"),
+            json.dumps({"words": [" "]}),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertContains(response, "invalid bad word", status_code=422)
+
+
+class CursorPaginationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.bad_words = [
+            BadWord.objects.create(word=f"cursor-test-{index}") for index in range(5)
+        ]
+
+    def test_cursor_keeps_microseconds(self):
+        ordering = ("-updated_at", "-id")
+        values = get_cursor_values(self.bad_words[0], ordering)
+        self.assertEqual(
+            decode_cursor(encode_cursor(values), BadWord, ordering),
+            [self.bad_words[0].updated_at, self.bad_words[0].id],
+        )
+
+    def test_paginate_by_cursor(self):
+        queryset = BadWord.objects.filter(word__startswith="cursor-test-")
+        ordering = ("word", "id")
+        words, cursor = [], None
+        while True:
+            items, cursor = paginate_by_cursor(queryset, ordering, cursor, 2)
+            words += [item.word for item in items]
+            if cursor is None:
+                break
+        self.assertEqual(words, [f"cursor-test-{index}" for index in range(5)])
+
+    def test_get_cached_count(self):
+        queryset = BadWord.objects.filter(word__startswith="cursor-test-")
+        self.assertEqual(get_cached_count(queryset), 5)
+
+        BadWord.objects.create(word="cursor-test-5")
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_count(queryset), 5)
+
+        cache.clear()
+        self.assertEqual(get_cached_count(queryset), 6)
+
+    def test_decode_invalid_cursor(self):
+        for cursor in ["invalid", encode_cursor(["1"]), encode_cursor(["a", "b"])]:
+            with self.assertRaises(HttpError):
+                decode_cursor(cursor, BadWord, ("-updated_at", "-id"))
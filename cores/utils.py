@@ -1,12 +1,21 @@
+import hashlib
+import threading
+import time
 import uuid
+from collections import Counter
 from datetime import datetime, timedelta, timezone
+from functools import cached_property
 from typing import Iterator
 
 import boto3
 import botocore
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 import jwt
 import requests
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, QuerySet
 from django.http import JsonResponse
 from django.urls import URLPattern
 from django.urls import path as django_path
@@ -15,9 +24,13 @@ from ninja.files import UploadedFile
 from ninja.router import Router
 from ninja.utils import normalize_path, replace_path_param_notation
 
+from cores.images import can_generate_variants, get_variant_keys
+from cores.models import ImageVariantTask, S3DeleteTask, StoredImage
+from cores.profanity import get_bad_words_matcher
 from users.models import User
 
 MB = 1024 * 1024
+MAX_UPLOAD_FILE_SIZE = 50 * MB
 IMAGE_EXTENSIONS_LIST = ["jpg", "jpeg", "jfif", "png", "webp", "avif", "svg"]
 
 EXP_DAYS = 1
@@ -42,31 +55,148 @@ class URLBugFixedRouter(Router):
 
 
 class FileHandler:
+    """
+    파일 저장소(file_service) 요청 공통 인터페이스
+    - 요청 종류별 횟수, 실패 수, 걸린 시간(ms)과 저장소 API별 재시도 횟수를 stats()로 확인 가능
+    """
+
     def __init__(self, file_service):
         self.file_service = file_service
+        self._stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def _call(self, operation: str, *args):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = getattr(self.file_service, operation)(*args)
+            failed = False
+            return result
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._stats_lock:
+                self._stats[(operation, "count")] += 1
+                self._stats[(operation, "errors")] += failed
+                self._stats[(operation, "total_ms")] += elapsed_ms
+                self._stats[(operation, "max_ms")] = max(
+                    self._stats[(operation, "max_ms")], elapsed_ms
+                )
+
+    def stats(self) -> dict:
+        """
+        {"operations": {요청 종류: {count, errors, avg_ms, max_ms}}, "retries": {API: 재시도 횟수}}
+        """
+        with self._stats_lock:
+            operations = {}
+            for (operation, name), value in self._stats.items():
+                operations.setdefault(operation, {})[name] = value
+        for values in operations.values():
+            values["avg_ms"] = round(values.pop("total_ms") / values["count"], 3)
+            values["max_ms"] = round(values["max_ms"], 3)
+        return {
+            "operations": operations,
+            "retries": self.file_service.retry_stats(),
+        }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats.clear()
+        self.file_service.reset_retry_stats()
 
     def upload(self, file, type, upload_filename, extra_args):
-        return self.file_service.upload(file, type, upload_filename, extra_args)
+        return self._call("upload", file, type, upload_filename, extra_args)
 
     def delete(self, type, url):
-        return self.file_service.delete(type, url)
+        return self._call("delete", type, url)
+
+    def delete_many(self, type, keys):
+        return self._call("delete_many", type, keys)
+
+    def create_upload_form(
+        self, type, upload_filename, content_type, max_size, expires_in
+    ):
+        return self._call(
+            "create_upload_form",
+            type,
+            upload_filename,
+            content_type,
+            max_size,
+            expires_in,
+        )
+
+    def get_file_info(self, type, upload_filename):
+        return self._call("get_file_info", type, upload_filename)
+
+    def download(self, type, upload_filename):
+        return self._call("download", type, upload_filename)
 
 
 class S3Service:
+    """
+    S3 요청 처리
+    - boto3 클라이언트는 import 시점이 아니라 처음 S3 요청할 때 한 번만 만들고,
+      모든 스레드(eventlet green thread 포함)가 같은 클라이언트와 연결 풀을 같이 씀
+    - 연결 풀 크기, 재시도, timeout, multipart 업로드 설정은 settings의 S3_* 값 사용
+    - 재시도 횟수는 S3 API별로 retry_stats()에서 확인
+    """
+
     def __init__(self):
         self.endpoint_url = settings.AWS_S3_ENDPOINT_URL
         self.access_key = settings.AWS_ACCESS_KEY_ID
         self.secret_access_key = settings.AWS_SECRET_ACCESS_KEY
         self.region_name = settings.AWS_S3_REGION_NAME
 
-        self.s3_client = boto3.client(
-            "s3",
-            endpoint_url=self.endpoint_url,
-            aws_access_key_id=self.access_key,
-            aws_secret_access_key=self.secret_access_key,
-            region_name=self.region_name,
+        self._client_lock = threading.Lock()
+        self._retries = Counter()
+        self._retries_lock = threading.Lock()
+
+    @cached_property
+    def s3_client(self):
+        with self._client_lock:
+            if "s3_client" in self.__dict__:
+                return self.__dict__["s3_client"]
+            # boto3.client()가 쓰는 기본 세션은 스레드 안전하지 않으므로 세션을 따로 만듦
+            s3_client = boto3.session.Session().client(
+                "s3",
+                endpoint_url=self.endpoint_url,
+                aws_access_key_id=self.access_key,
+                aws_secret_access_key=self.secret_access_key,
+                region_name=self.region_name,
+                config=Config(
+                    max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                    connect_timeout=settings.S3_CONNECT_TIMEOUT,
+                    read_timeout=settings.S3_READ_TIMEOUT,
+                    retries={
+                        "mode": "standard",
+                        "max_attempts": settings.S3_MAX_ATTEMPTS,
+                    },
+                ),
+            )
+            s3_client.meta.events.register("after-call.s3", self._count_retries)
+            return s3_client
+
+    @cached_property
+    def transfer_config(self):
+        return TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=settings.S3_MAX_CONCURRENCY,
         )
 
+    def _count_retries(self, parsed, model, **kwargs):
+        retry_attempts = parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        if retry_attempts:
+            with self._retries_lock:
+                self._retries[model.name] += retry_attempts
+
+    def retry_stats(self) -> dict:
+        with self._retries_lock:
+            return dict(self._retries)
+
+    def reset_retry_stats(self):
+        with self._retries_lock:
+            self._retries.clear()
+
     def upload(self, file, type, upload_filename, extra_args):
         try:
             self.s3_client.upload_fileobj(
@@ -74,6 +204,7 @@ class S3Service:
                 Bucket=type,
                 Key=upload_filename,
                 ExtraArgs=extra_args,
+                Config=self.transfer_config,
             )
         except botocore.exceptions.ClientError as error:
             raise HttpError(400, "S3 service is not available") from error
@@ -85,6 +216,65 @@ class S3Service:
         except botocore.exceptions.ClientError as error:
             raise HttpError(400, "S3 service is not available") from error
 
+    def delete_many(self, type, keys):
+        """
+        delete_objects 한 번으로 keys(최대 1000개)를 삭제하고 삭제 실패한 key별 에러 메시지를 반환
+        - 요청 자체가 실패하면 botocore 예외를 그대로 올려보냄(워커에서 재시도)
+        """
+        response = self.s3_client.delete_objects(
+            Bucket=type,
+            Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+        )
+        return {
+            error["Key"]: f'{error.get("Code")}: {error.get("Message")}'
+            for error in response.get("Errors", [])
+        }
+
+    def create_upload_form(
+        self, type, upload_filename, content_type, max_size, expires_in
+    ):
+        """
+        클라이언트가 S3에 직접 올릴 수 있는 presigned POST 양식(url, fields) 발급
+        - PUT과 달리 업로드 용량(content-length-range)과 Content-Type을 S3가 직접 검사함
+        """
+        return self.s3_client.generate_presigned_post(
+            Bucket=type,
+            Key=upload_filename,
+            Fields={"acl": "public-read", "Content-Type": content_type},
+            Conditions=[
+                {"acl": "public-read"},
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_size],
+            ],
+            ExpiresIn=expires_in,
+        )
+
+    def get_file_info(self, type, upload_filename):
+        """
+        S3에 올라간 파일의 크기와 Content-Type, 파일이 없으면 None
+        """
+        try:
+            response = self.s3_client.head_object(Bucket=type, Key=upload_filename)
+        except botocore.exceptions.ClientError as error:
+            if error.response["Error"]["Code"] in ["404", "NoSuchKey", "NotFound"]:
+                return None
+            raise HttpError(400, "S3 service is not available") from error
+        return {
+            "size": response["ContentLength"],
+            "content_type": response["ContentType"],
+        }
+
+    def download(self, type, upload_filename):
+        """
+        S3 파일 내용(bytes), 파일이 없으면 None
+        - 요청 자체가 실패하면 botocore 예외를 그대로 올려보냄(워커에서 재시도)
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=type, Key=upload_filename)
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        return response["Body"].read()
+
 
 s3_service = S3Service()
 file_handler = FileHandler(s3_service)
@@ -97,64 +287,157 @@ def validate_upload_file(file: UploadedFile):
     if file.name.split(".")[-1].lower() not in IMAGE_EXTENSIONS_LIST:
         raise HttpError(400, "invalid file extension")
 
-    if file.size > 50 * MB:
+    if file.size > MAX_UPLOAD_FILE_SIZE:
         raise HttpError(400, "file size is too large")
 
     return True
 
 
 def delete_existing_image(url: str, type: str):
+    """
+    기존 이미지 삭제 요청, S3 삭제는 요청 처리 중에 하지 않고 S3DeleteTask 대기열에만 기록
+    - drain_s3_delete_tasks 명령(백그라운드 워커)이 모아서 삭제함
+    - 같은 내용으로 재사용 중인 사진(StoredImage)은 참조 수만 줄이고, 0이 될 때만 삭제
+    - StoredImage가 없는 사진(중복 제거 전 업로드, S3 직접 업로드)은 바로 삭제
+    """
     if type not in ["user_thumbnail", "post_images"]:
         raise HttpError(400, "invalid type")
 
-    if (
-        type == "user_thumbnail"
-        and url != settings.DEFAULT_USER_THUMBNAIL_URL
-        and url.startswith(settings.PROFILE_IMAGES_URL)
-    ):
-        file_handler.delete(type, url)
+    if not is_uploaded_image(url, type):
+        return
 
-    if type == "post_images" and url != settings.DEFAULT_POST_IMAGE_URL:
-        file_handler.delete(type, url)
+    upload_filename = url.split("/")[-1]
+    with transaction.atomic():
+        stored_image = (
+            StoredImage.objects.select_for_update()
+            .filter(type=type, key=upload_filename)
+            .first()
+        )
+        if stored_image and stored_image.refcount > 1:
+            stored_image.refcount = F("refcount") - 1
+            stored_image.save(update_fields=["refcount", "updated_at"])
+            return
+        if stored_image:
+            stored_image.delete()
+        S3DeleteTask.objects.bulk_create(
+            S3DeleteTask(bucket=type, key=key)
+            for key in [upload_filename, *get_variant_keys(type, upload_filename)]
+        )
 
 
-def handle_upload_file(file: UploadedFile, type: str):
-    if type not in ["user_thumbnail", "post_images"]:
-        raise HttpError(400, "invalid type")
+def is_uploaded_image(url: str, type: str):
+    """
+    기본 사진이나 소셜 로그인 프로필 사진이 아니라 S3에 업로드된 사진인지 확인
+    """
+    if type == "user_thumbnail":
+        return url != settings.DEFAULT_USER_THUMBNAIL_URL and url.startswith(
+            settings.PROFILE_IMAGES_URL
+        )
+    return url != settings.DEFAULT_POST_IMAGE_URL
+
+
+def enqueue_image_variants(url: str, type: str):
+    """
+    업로드된 사진의 줄인 WebP 사진(cores.images.IMAGE_VARIANT_SIZES) 생성 요청
+    - 사진 주소를 게시글/사용자에 저장하는 트랜잭션 안에서 호출해야 함
+    - generate_image_variants 명령(백그라운드 워커)이 만들어서 image_variants/thumbnail_variants에 저장
+    - Pillow로 열 수 없는 형식(svg 등)은 요청하지 않음
+    """
+    key = url.split("/")[-1]
+    if is_uploaded_image(url, type) and can_generate_variants(key):
+        ImageVariantTask.objects.create(type=type, key=key)
+
 
-    upload_filename = f'{str(uuid.uuid4())}.{file.name.split(".")[-1]}'
+def create_upload_filename(file_name: str):
+    return f'{str(uuid.uuid4())}.{file_name.split(".")[-1]}'
+
+
+def get_image_url(type: str, upload_filename: str):
     url_dict = {
         "user_thumbnail": f"{settings.PROFILE_IMAGES_URL}{upload_filename}",
         "post_images": f"{settings.POST_IMAGES_URL}{upload_filename}",
     }
+    return url_dict[type]
 
+
+def get_content_hash(file: UploadedFile) -> str:
+    """
+    업로드 파일 내용의 sha256, 파일 전체를 메모리에 올리지 않고 chunk 단위로 읽음
+    """
+    content_hash = hashlib.sha256()
+    for chunk in file.chunks():
+        content_hash.update(chunk)
+    file.seek(0)
+    return content_hash.hexdigest()
+
+
+def reuse_stored_image(type: str, content_hash: str):
+    """
+    같은 내용의 사진이 이미 올라가 있으면 참조 수를 늘리고 그 key를 반환, 없으면 None
+    """
+    with transaction.atomic():
+        stored_image = (
+            StoredImage.objects.select_for_update()
+            .filter(type=type, content_hash=content_hash)
+            .first()
+        )
+        if not stored_image:
+            return None
+        stored_image.refcount = F("refcount") + 1
+        stored_image.save(update_fields=["refcount", "updated_at"])
+        return stored_image.key
+
+
+def handle_upload_file(file: UploadedFile, type: str):
+    """
+    사진 파일을 S3에 올리고 주소를 반환
+    - 내용 해시(sha256)가 같은 사진이 이미 있으면 새로 올리지 않고 그 사진 주소를 반환(StoredImage)
+    - 같은 사진이 동시에 처음 올라오면 먼저 기록된 쪽을 쓰고 나중에 올린 사진은 삭제 대기열에 넣음
+    - 반환한 주소를 저장하지 않게 되면 delete_existing_image로 참조 수를 줄여야 함
+    """
+    if type not in ["user_thumbnail", "post_images"]:
+        raise HttpError(400, "invalid type")
+
+    content_hash = get_content_hash(file)
+    upload_filename = reuse_stored_image(type, content_hash)
+    if upload_filename:
+        return get_image_url(type, upload_filename)
+
+    upload_filename = create_upload_filename(file.name)
     file_handler.upload(
         file,
         type,
         upload_filename,
         extra_args={"ACL": "public-read", "ContentType": file.content_type},
     )
-    return url_dict[type]
+    try:
+        with transaction.atomic():
+            StoredImage.objects.create(
+                type=type, content_hash=content_hash, key=upload_filename
+            )
+    except IntegrityError:
+        S3DeleteTask.objects.create(bucket=type, key=upload_filename)
+        upload_filename = reuse_stored_image(type, content_hash)
+        if not upload_filename:
+            raise HttpError(400, "S3 service is not available")
+    return get_image_url(type, upload_filename)
 
 
 def censor_text(text: str) -> str:
     """
-    욕설 목록에 있는 모든 욕설을 text에 있는지 확인하기 위해 text.find()로 검색
+    욕설 목록으로 미리 만들어둔 검색기(Aho-Corasick)로 text를 한 번만 훑어서
     욕설이 포함된 경우 그 부분만 *로 바꿈
     """
-    censored_text = text
-    for bad_word in settings.BAD_WORDS_LIST:
-        bad_word_length = len(bad_word)
-        bad_word_index = text.find(bad_word)
+    return get_bad_words_matcher().censor(text)
 
-        while bad_word_index != -1:
-            censored_text = (
-                censored_text[:bad_word_index]
-                + "*" * bad_word_length
-                + censored_text[bad_word_index + bad_word_length :]
-            )
-            bad_word_index = text.find(bad_word, bad_word_index + 1)
-    return censored_text
+
+def is_cascade_delete(origin, *models) -> bool:
+    """
+    pre_delete/post_delete 시그널의 origin(delete()를 호출한 객체나 QuerySet)이
+    models 중 하나면 True, 부모와 함께 지워지는(CASCADE) 행인지 확인할 때 사용
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in models
 
 
 class SocialLoginUserProfile:
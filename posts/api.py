@@ -1,31 +1,50 @@
+import json
 from typing import List
 
-from django.db.models import Count
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Prefetch
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 from ninja import Form, Query
+from ninja.errors import HttpError
 from ninja.files import UploadedFile
-from ninja.pagination import PageNumberPagination, paginate
+from ninja.pagination import paginate
 
-from comments.models import Comment, CommentDelete
+from comments.models import COMMENT_ORDERING, Comment
+from cores.pagination import CursorPagination, paginate_by_cursor
 from cores.schemas import ContentIn, MessageOut, PostListFilters
 from cores.utils import (
     URLBugFixedRouter,
     delete_existing_image,
+    enqueue_image_variants,
     handle_upload_file,
     validate_upload_file,
 )
-from posts.models import Post, PostDelete, PostLike, PostReport
+from posts.cache import post_feed_cache, render_feed_items
+from posts.deletion import soft_delete_posts
+from posts.like_buffer import post_like_buffer
+from posts.likes import toggle_post_like
+from posts.models import (
+    POST_FEED_ORDERINGS,
+    Post,
+    PostLike,
+    PostReport,
+)
 from posts.schemas import (
     AdminGetDeletedPostOut,
     AdminGetPostListOut,
     AdminGetPostOut,
+    BulkDeletePostsIn,
+    BulkDeletePostsOut,
     CreatePostIn,
     DeletedPostOut,
     DeletePostIn,
-    GetPostListOut,
+    GetPostFeedItemOut,
+    GetPostFeedOut,
     GetPostOut,
     ModifyPostIn,
+    PostLikeOut,
 )
 from users.auth import AuthBearer, has_authority, is_admin
 
@@ -34,8 +53,85 @@ MB = 1024 * 1024
 router = URLBugFixedRouter(tags=["게시글 관련 API"], auth=AuthBearer())
 
 
+def comments_with_user_prefetch() -> Prefetch:
+    """
+    게시글 상세조회용 삭제 안된 댓글 목록(작성자 정보 포함)을 comments_list로 한 번에 가져옴
+    """
+    return Prefetch(
+        "comments",
+        queryset=Comment.objects.filter(is_deleted=False)
+        .select_related("user")
+        .order_by(*COMMENT_ORDERING),
+        to_attr="comments_list",
+    )
+
+
+def get_post_with_comments(queryset, post_id: int, comments_limit: int = None):
+    """
+    게시글 상세조회용 게시글과 삭제 안된 댓글 목록(comments_list)을 가져옴
+    - comments_limit이 없으면 댓글을 모두 가져옴
+    - comments_limit이 있으면 앞에서부터 comments_limit개만 가져오고,
+      댓글이 더 있으면 comments_has_more=True와 함께 다음 댓글 조회
+      (GET /posts/{post_id}/comments)에 쓸 comments_next_cursor를 넣어줌
+    - 어느 쪽이든 게시글 1번, 댓글 1번만 조회
+    """
+    if comments_limit is None:
+        return get_object_or_404(
+            queryset.prefetch_related(comments_with_user_prefetch()),
+            id=post_id,
+            is_deleted=False,
+        )
+
+    post = get_object_or_404(queryset, id=post_id, is_deleted=False)
+    post.comments_list, post.comments_next_cursor = paginate_by_cursor(
+        Comment.objects.filter(post_id=post.id, is_deleted=False).select_related(
+            "user"
+        ),
+        COMMENT_ORDERING,
+        None,
+        comments_limit,
+    )
+    post.comments_has_more = post.comments_next_cursor is not None
+    return post
+
+
+def get_liked_post_ids(request, feed_page) -> set:
+    """
+    목록 페이지에서 요청한 사용자가 좋아요한 게시글 id
+    - write-behind 사용 시 아직 DB에 반영 안 된 본인 토글도 합침
+    """
+    if not feed_page.post_ids:
+        return set()
+    liked_post_ids = set(
+        PostLike.objects.filter(
+            like_user_id=request.auth.id, post_id__in=feed_page.post_ids
+        ).values_list("post_id", flat=True)
+    )
+    if settings.POST_LIKE_WRITE_BEHIND:
+        pending = post_like_buffer.pending_likes(request.auth.id, feed_page.post_ids)
+        for post_id, is_liked in pending.items():
+            if is_liked:
+                liked_post_ids.add(post_id)
+            else:
+                liked_post_ids.discard(post_id)
+    return liked_post_ids
+
+
+def render_feed(request, feed_page) -> bytes:
+    """
+    캐시된 목록 페이지에 요청한 사용자의 좋아요 여부를 붙여서 JSON 배열로 만듦
+    - write-behind 사용 시 아직 DB에 반영 안 된 좋아요 수 변화도 get_post처럼 합침
+    """
+    likes_deltas = None
+    if settings.POST_LIKE_WRITE_BEHIND:
+        likes_deltas = post_like_buffer.pending_likes_deltas(feed_page.post_ids)
+    return render_feed_items(
+        feed_page, get_liked_post_ids(request, feed_page), likes_deltas
+    )
+
+
 @router.get("/admin", response=List[AdminGetPostListOut], summary="관리자 페이지 게시글 리스트 조회")
-@paginate(PageNumberPagination, page_size=10)
+@paginate(CursorPagination, page_size=10)
 def get_posts_by_admin(request, query: PostListFilters = Query(...)):
     """
     **관리자 페이지 게시글 조회**
@@ -44,38 +140,49 @@ def get_posts_by_admin(request, query: PostListFilters = Query(...)):
     - search: 사용자 닉네임으로 검색
     - reported: 신고건수 이상 글 조회(3입력하면 신고건수 3회 이상 글만 조회)
     - date: 글 작성기간으로 검색(형식: 2021-01-01~2021-01-31, 중간에 ~으로 구분)
-    - page: 1부터 시작하는 페이지네이션 번호
+    - cursor: 다음 페이지를 볼 때 이전 응답의 next_cursor 값 입력
+    - count는 최대 PAGINATION_COUNT_CACHE_TTL초 전 기준의 개수일 수 있음
     """
     is_admin(request)
-    post_filters = query.dict(exclude_none=True)
 
-    return (
-        Post.objects.annotate(reported_count=Count("reports", distinct=True))
+    return query.filter_queryset(
+        Post.objects.annotate(reported_count=F("reports_count"))
         .select_related("user")
-        .filter(is_deleted=False, **post_filters)
-        .prefetch_related("likes", "reports")
-        .order_by("-created_at")
+        .filter(is_deleted=False)
     )
 
 
+@router.post(
+    "/admin/delete/",
+    response={200: BulkDeletePostsOut},
+    summary="관리자 페이지 게시글 여러 개 삭제하기(soft delete)",
+)
+def delete_posts_by_admin(request, body: BulkDeletePostsIn):
+    """
+    관리자 페이지 용, 스팸 글 정리처럼 게시글 여러 개를 한 번에 삭제(application/json)
+    - post_ids: 삭제할 게시글 id 목록(최대 500개)
+    - delete_reason: 삭제 사유
+    - 게시글과 댓글 모두 is_deleted 값만 True로 바꾸고 삭제 기록을 남김
+    - 이미 삭제됐거나 없는 게시글 id는 건너뛰고, 실제로 삭제한 게시글 id 목록을 반환
+    """
+    is_admin(request)
+    post_ids = soft_delete_posts(body.post_ids, request.auth.id, body.delete_reason)
+    return 200, {"deleted_post_ids": post_ids}
+
+
 @router.get("/deleted/", response={200: List[DeletedPostOut]}, summary="삭제된 게시글 리스트 조회")
-@paginate(PageNumberPagination, page_size=10)
+@paginate(CursorPagination, ordering=("-updated_at", "-id"), page_size=10)
 def get_deleted_posts(request, query: PostListFilters = Query(...)):
     """
     **삭제된 게시글 목록 조회, 관리자만 가능**
     - 쿼리 파라미터는 PostListFilters에서 reported만 제외
+    - 최근에 삭제된(수정된) 순으로 정렬
     """
     is_admin(request)
-    post_filters = {
-        key: value
-        for key, value in query.dict().items()
-        if value and key != "reported_count__gte"
-    }
 
-    return (
-        Post.objects.select_related("user")
-        .filter(is_deleted=True, **post_filters)
-        .order_by("-updated_at")
+    return query.filter_queryset(
+        Post.objects.select_related("user").filter(is_deleted=True),
+        exclude={"reported_count__gte"},
     )
 
 
@@ -95,18 +202,73 @@ def get_deleted_post_by_admin(request, post_id: int):
     )
 
 
+@router.get("/feed", response={200: GetPostFeedOut}, summary="게시글 목록 조회(커서 방식)")
+def get_posts_feed(
+    request,
+    cursor: str = None,
+    limit: int = Query(9, ge=1, le=100),
+    sort: str = "-created_at",
+):
+    """
+    게시글 목록 커서 페이지네이션 조회, 한 페이지에 9개씩
+    - 정렬(sort) 기본값 최신순(-created_at), 좋아요순(likes)
+    - 첫 페이지는 cursor 없이 요청하고, 다음 페이지는 응답의 next_cursor를 cursor로 넣어서 요청
+    - next_cursor가 null이면 마지막 페이지
+    - 스크롤 중에 새 글이 올라와도 페이지 사이에 글이 중복되거나 빠지지 않음
+    - is_liked: 요청한 사용자의 좋아요 여부
+    """
+    has_authority(request)
+    if sort not in POST_FEED_ORDERINGS:
+        raise HttpError(400, "invalid sort type")
+
+    page = f"cursor:{cursor or ''}"
+    feed_page, token = post_feed_cache.get_page(sort, page, limit)
+    if feed_page is None:
+        posts, next_cursor = paginate_by_cursor(
+            Post.objects.filter(is_deleted=False).select_related("user"),
+            POST_FEED_ORDERINGS[sort],
+            cursor,
+            limit,
+        )
+        feed_page = post_feed_cache.set_page(token, page, limit, posts, next_cursor)
+
+    return HttpResponse(
+        b'{"items": %s, "next_cursor": %s}'
+        % (
+            render_feed(request, feed_page),
+            json.dumps(feed_page.next_cursor).encode(),
+        ),
+        content_type="application/json",
+    )
+
+
 @router.get("/{post_id}", response=GetPostOut, summary="게시글 상세 조회")
-def get_post(request, post_id: int):
+def get_post(request, post_id: int, comments_limit: int = Query(None, ge=1, le=100)):
     """
     게시글 상세 조회
     - 게시글/댓글 모두 is_deleted=False인것만 나옴
+    - 댓글 수와 상관없이 게시글(좋아요 여부 포함) 1번, 댓글(작성자 포함) 1번만 조회
+    - comments_limit: 앞에서부터 보여줄 댓글 수, 없으면 댓글 전체
+    - 나머지 댓글은 comments_next_cursor로 댓글 목록 조회 API에서 이어서 가져옴
     """
     has_authority(request)
-    post = get_object_or_404(
-        Post.objects.select_related("user"), id=post_id, is_deleted=False
+    post = get_post_with_comments(
+        Post.objects.select_related("user").annotate(
+            is_liked=Exists(
+                PostLike.objects.filter(
+                    post_id=OuterRef("pk"), like_user_id=request.auth.id
+                )
+            )
+        ),
+        post_id,
+        comments_limit,
     )
-    post.is_liked = post.likes.filter(like_user_id=request.auth.id).exists()
-    post.comments_list = post.comments.filter(is_deleted=False).order_by("created_at")
+    if settings.POST_LIKE_WRITE_BEHIND:
+        pending = post_like_buffer.pending_likes(request.auth.id, [post.id])
+        post.is_liked = pending.get(post.id, post.is_liked)
+        post.likes_count = max(
+            post.likes_count + post_like_buffer.pending_likes_delta(post.id), 0
+        )
     return post
 
 
@@ -122,13 +284,19 @@ def modify_post(
     post = get_object_or_404(Post, id=post_id, is_deleted=False)
     has_authority(request, user_id=post.user_id, user_check=True)
 
+    image_url = None
     if validate_upload_file(file):
-        delete_existing_image(post.image_url, type="post_images")
-        post.image_url = handle_upload_file(file, "post_images")
-
-    post.subject = body.subject
-    post.content = body.content
-    post.save()
+        image_url = handle_upload_file(file, "post_images")
+
+    # 새 사진 업로드가 끝난 뒤 기존 사진 삭제 요청과 게시글 수정을 함께 커밋
+    with transaction.atomic():
+        if image_url:
+            delete_existing_image(post.image_url, type="post_images")
+            enqueue_image_variants(image_url, "post_images")
+            post.image_url = image_url
+        post.subject = body.subject
+        post.content = body.content
+        post.save()
     return 200, {"message": "success"}
 
 
@@ -137,16 +305,17 @@ def modify_post(
     response={200: AdminGetPostOut},
     summary="관리자 페이지에서 삭제 안된 정상 게시글 상세조회",
 )
-def get_post_by_admin(request, post_id: int):
+def get_post_by_admin(
+    request, post_id: int, comments_limit: int = Query(None, ge=1, le=100)
+):
     """
     관리자 페이지 용, 삭제 안된 정상 게시글 상세조회
+    - comments_limit: 앞에서부터 보여줄 댓글 수, 없으면 댓글 전체
     """
     is_admin(request)
-    post = get_object_or_404(
-        Post.objects.select_related("user"), id=post_id, is_deleted=False
+    return 200, get_post_with_comments(
+        Post.objects.select_related("user"), post_id, comments_limit
     )
-    post.comments_list = post.comments.filter(is_deleted=False).order_by("created_at")
-    return 200, post
 
 
 @router.post(
@@ -161,26 +330,10 @@ def delete_post(request, post_id: int, body: DeletePostIn = Form(...)):
     """
     post = get_object_or_404(Post, id=post_id, is_deleted=False)
     has_authority(request, user_id=post.user_id, user_check=True)
-    post.is_deleted = True
-    post.save()
-    PostDelete.objects.create(
-        user_id=request.auth.id,
-        post_id=post_id,
-        delete_reason="글쓴이 본인이 삭제"
-        if post.user_id == request.auth.id
-        else body.delete_reason,
-    )
-    comment_delete_objs = [
-        CommentDelete(
-            user_id=item["user_id"],
-            comment_id=item["id"],
-            delete_reason="게시글 삭제로 인한 댓글 자동삭제",
-        )
-        for item in post.comments.filter(is_deleted=False).values("user_id", "id")
-    ]
-    CommentDelete.objects.bulk_create(comment_delete_objs)
-    Comment.objects.filter(post_id=post_id).update(
-        is_deleted=True, updated_at=timezone.now()
+    soft_delete_posts(
+        [post_id],
+        request.auth.id,
+        "글쓴이 본인이 삭제" if post.user_id == request.auth.id else body.delete_reason or "",
     )
 
     return 200, {"message": "success"}
@@ -214,48 +367,63 @@ def delete_post_from_db(request, post_id: int):
     """
     is_admin(request)
     post = get_object_or_404(Post, id=post_id)
-    delete_existing_image(post.image_url, type="post_images")
-    post.delete()
+    with transaction.atomic():
+        delete_existing_image(post.image_url, type="post_images")
+        post.delete()
 
     return 200, {"message": "success"}
 
 
 @router.post(
     "/{post_id}/likes",
-    response={200: MessageOut, 404: MessageOut},
+    response={200: PostLikeOut, 404: MessageOut},
     summary="게시글 좋아요 또는 좋아요 취소",
 )
 def create_post_like(request, post_id: int):
     """
     게시글 좋아요 생성, 사용자가 이미 해당 게시글을 좋아요한 상태면 좋아요 삭제
+    - 바뀐 좋아요 상태(is_liked)와 좋아요 수(post_likes_count)를 같이 반환
+    - POST_LIKE_WRITE_BEHIND가 켜져 있으면 버퍼에 기록하고 나중에 한 번에 DB에 반영
     """
     has_authority(request)
-    get_object_or_404(Post, id=post_id, is_deleted=False)
-
-    like, is_liked = PostLike.objects.get_or_create(
-        post_id=post_id, like_user_id=request.auth.id
-    )
-    if not is_liked:
-        like.delete()
-        return 200, {"message": "post like deleted"}
-
-    return 200, {"message": "post like created"}
+    if settings.POST_LIKE_WRITE_BEHIND:
+        like = post_like_buffer.toggle(post_id, request.auth.id)
+    else:
+        like = toggle_post_like(post_id, request.auth.id)
+    if like is None:
+        raise HttpError(404, "Not Found")
+
+    return 200, {
+        "message": "post like created" if like.is_liked else "post like deleted",
+        "is_liked": like.is_liked,
+        "post_likes_count": like.likes_count,
+    }
 
 
-@router.get("", response={200: List[GetPostListOut]}, summary="게시글 목록 조회")
+@router.get("", response={200: List[GetPostFeedItemOut]}, summary="게시글 목록 조회")
 def get_posts(request, offset: int = 0, limit: int = 9, sort: str = "-created_at"):
     """
     게시글 목록 조회, 한 페이지에 9개씩
     - 정렬(sort) 기본값 최신순(-created_at), 좋아요순(likes)
     - DB상에서 is_deleted=False인 게시글만 나옴
+    - is_liked: 요청한 사용자의 좋아요 여부
+    - 뒤쪽 페이지일수록 느려지므로 새 클라이언트는 GET /posts/feed(커서 방식) 사용
     """
     has_authority(request)
-    return (
-        200,
-        Post.objects.filter(is_deleted=False)
-        .select_related("user")
-        .prefetch_related("likes")
-        .order_by(sort)[offset : offset + limit],
+    page = f"offset:{offset}"
+    feed_page, token = post_feed_cache.get_page(sort, page, limit)
+    if feed_page is None:
+        ordering = POST_FEED_ORDERINGS.get(sort, (sort,))
+        posts = (
+            Post.objects.filter(is_deleted=False)
+            .select_related("user")
+            .order_by(*ordering)[offset : offset + limit]
+        )
+        feed_page = post_feed_cache.set_page(token, page, limit, posts)
+
+    return HttpResponse(
+        render_feed(request, feed_page),
+        content_type="application/json",
     )
 
 
@@ -269,5 +437,7 @@ def create_post(request, body: CreatePostIn = Form(...), file: UploadedFile = No
     if validate_upload_file(file):
         body_dict["image_url"] = handle_upload_file(file, "post_images")
 
-    Post.objects.create(user_id=request.auth.id, **body_dict)
+    with transaction.atomic():
+        post = Post.objects.create(user_id=request.auth.id, **body_dict)
+        enqueue_image_variants(post.image_url, "post_images")
     return 200, {"message": "success"}
@@ -0,0 +1,194 @@
+import json
+import uuid
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from ninja.responses import NinjaJSONEncoder
+
+from posts.models import POST_FEED_ORDERINGS
+from posts.schemas import GetPostListOut
+
+FEED_SORTS = tuple(POST_FEED_ORDERINGS)
+
+
+class FeedPage(NamedTuple):
+    """
+    캐시에 저장하는 게시글 목록 한 페이지
+    - fragments: 게시글마다 직렬화한 JSON bytes, 좋아요 수와 사용자별 값을 덧붙일 수 있게
+      post_likes_count와 마지막 "}"는 뺌
+    - likes_counts: 게시글마다 DB에서 읽은 좋아요 수, 아직 DB에 반영 안 된 좋아요(write-behind)를 더해서 보여줌
+    - built_at: 페이지를 만들려고 DB를 조회하기 전의 무효화 순번,
+      이보다 나중에 무효화된 게시글이 하나라도 있으면 다시 만듦
+    """
+
+    post_ids: List[int]
+    fragments: List[bytes]
+    likes_counts: List[int]
+    next_cursor: Optional[str]
+    built_at: int
+
+
+class FeedToken(NamedTuple):
+    """
+    DB 조회 전에 읽어둔 캐시 상태, 조회 중에 들어온 무효화를 놓치지 않도록 페이지를 이 값으로 저장
+    - generation: 정렬별 세대, 캐시하지 않는 정렬이면 None
+    - sequence: 게시글 무효화 순번
+    """
+
+    sort: str
+    generation: Optional[str]
+    sequence: int
+
+
+def serialize_post(post) -> bytes:
+    data = json.dumps(
+        GetPostListOut.from_orm(post).dict(exclude={"post_likes_count"}),
+        cls=NinjaJSONEncoder,
+    )
+    return data[:-1].encode()
+
+
+class PostFeedCache:
+    """
+    게시글 목록(GET /posts, GET /posts/feed) 응답을 (정렬, cursor/offset, limit)별로 저장하는 캐시
+    - 게시글을 JSON bytes로 저장해두므로 캐시에서 꺼낼 때 다시 직렬화하지 않음
+    - 정렬별 세대(generation) 값이 키에 들어가므로 세대를 바꾸면 그 정렬의 페이지가 모두 무효화됨
+      (글 작성/삭제처럼 목록 구성이 바뀌는 경우)
+    - 글 수정, 좋아요 변경 시에는 게시글별 버전에 무효화 순번(계속 증가하는 값)을 저장해서
+      페이지를 만든 뒤에 바뀐 글이 들어있는 페이지만 다시 만듦
+    - 좋아요가 몰릴 때도 캐시가 비지 않도록 좋아요 변경으로는 좋아요순 세대를 바꾸지 않음,
+      좋아요순 순서는 페이지가 만료(ttl)될 때 반영됨
+    - 세대와 순번은 DB 조회 전에 읽어서(get_page) 그 값으로 페이지를 저장(set_page)하므로
+      조회와 저장 사이에 들어온 무효화도 반영됨
+    - settings.POST_FEED_CACHE_ALIAS 캐시를 씀, 여러 워커가 무효화를 공유하려면 Redis 사용
+    """
+
+    # FeedPage 형식이 바뀌면 이전 형식으로 저장된 페이지를 읽지 않도록 바꿈
+    key_prefix = "post_feed:2"
+
+    def __init__(self, alias: str, ttl: float):
+        self.alias = alias
+        self.ttl = ttl
+
+    @property
+    def _cache(self):
+        return caches[self.alias]
+
+    def _generation_key(self, sort: str) -> str:
+        return f"{self.key_prefix}:generation:{sort}"
+
+    def _post_version_key(self, post_id: int) -> str:
+        return f"{self.key_prefix}:post:{post_id}"
+
+    def _sequence_key(self) -> str:
+        return f"{self.key_prefix}:sequence"
+
+    def _next_sequence(self) -> int:
+        key = self._sequence_key()
+        try:
+            return self._cache.incr(key)
+        except ValueError:
+            # 순번이 캐시에서 지워졌으면 이전 순번으로 만든 페이지가 새 버전보다 최신으로 보이지 않도록
+            # 모든 페이지를 무효화하고 다시 시작
+            self.invalidate_feed()
+            self._cache.add(key, 0, None)
+            return self._cache.incr(key)
+
+    def _generation(self, sort: str) -> str:
+        key = self._generation_key(sort)
+        generation = self._cache.get(key)
+        if generation is None:
+            self._cache.add(key, uuid.uuid4().hex, None)
+            generation = self._cache.get(key)
+        return generation
+
+    def _page_key(self, token: FeedToken, page: str, limit: int) -> str:
+        return f"{self.key_prefix}:{token.sort}:{token.generation}:{page}:{limit}"
+
+    def _is_fresh(self, feed_page: FeedPage) -> bool:
+        keys = [self._post_version_key(post_id) for post_id in feed_page.post_ids]
+        versions = self._cache.get_many(keys)
+        return all(version <= feed_page.built_at for version in versions.values())
+
+    def get_page(
+        self, sort: str, page: str, limit: int
+    ) -> Tuple[Optional[FeedPage], FeedToken]:
+        """
+        캐시된 페이지와 DB 조회 전의 캐시 상태(FeedToken)를 반환
+        - 페이지가 없거나 페이지를 만든 뒤 바뀐 게시글이 있으면 페이지는 None,
+          DB에서 다시 조회한 결과를 같이 받은 FeedToken으로 set_page에 저장
+        - FEED_SORTS 이외의 정렬은 무효화 대상이 아니므로 캐시하지 않음
+        """
+        if sort not in FEED_SORTS:
+            return None, FeedToken(sort, None, 0)
+        token = FeedToken(
+            sort, self._generation(sort), self._cache.get(self._sequence_key(), 0)
+        )
+        feed_page = self._cache.get(self._page_key(token, page, limit))
+        if feed_page is None or not self._is_fresh(feed_page):
+            return None, token
+        return feed_page, token
+
+    def set_page(
+        self,
+        token: FeedToken,
+        page: str,
+        limit: int,
+        posts: Sequence,
+        next_cursor: Optional[str] = None,
+    ) -> FeedPage:
+        feed_page = FeedPage(
+            post_ids=[post.id for post in posts],
+            fragments=[serialize_post(post) for post in posts],
+            likes_counts=[post.likes_count for post in posts],
+            next_cursor=next_cursor,
+            built_at=token.sequence,
+        )
+        if token.generation is not None:
+            self._cache.set(self._page_key(token, page, limit), feed_page, self.ttl)
+        return feed_page
+
+    def invalidate_post(self, post_id: int):
+        """
+        게시글 하나의 내용(제목, 사진, 좋아요 수 등)이 바뀌었을 때 그 글이 들어있는 페이지만 무효화
+        - 페이지보다 오래 남아있어야 버전이 만료돼서 바뀌지 않은 것처럼 보이는 일이 없음
+        """
+        self._cache.set(
+            self._post_version_key(post_id), self._next_sequence(), self.ttl * 2
+        )
+
+    def invalidate_feed(self, sorts: Sequence[str] = FEED_SORTS):
+        """
+        목록 구성이나 순서가 바뀌었을 때 sorts 정렬의 모든 페이지를 무효화
+        """
+        self._cache.set_many(
+            {self._generation_key(sort): uuid.uuid4().hex for sort in sorts}, None
+        )
+
+
+def render_feed_items(
+    feed_page: FeedPage, liked_post_ids: set, likes_deltas: Optional[dict] = None
+) -> bytes:
+    """
+    캐시된 게시글 JSON bytes 뒤에 좋아요 수(post_likes_count)와 요청한 사용자의 좋아요 여부(is_liked)를
+    덧붙여서 게시글 목록 JSON 배열을 만듦
+    - likes_deltas: 게시글별로 아직 DB에 반영 안 된 좋아요 수 변화, 캐시된 좋아요 수에 더함
+    """
+    likes_deltas = likes_deltas or {}
+    return b"[%s]" % b", ".join(
+        b'%s, "post_likes_count": %d, "is_liked": %s}'
+        % (
+            fragment,
+            max(likes_count + likes_deltas.get(post_id, 0), 0),
+            b"true" if post_id in liked_post_ids else b"false",
+        )
+        for post_id, fragment, likes_count in zip(
+            feed_page.post_ids, feed_page.fragments, feed_page.likes_counts
+        )
+    )
+
+
+post_feed_cache = PostFeedCache(
+    settings.POST_FEED_CACHE_ALIAS, settings.POST_FEED_CACHE_TTL
+)
@@ -0,0 +1,90 @@
+from typing import Iterable, List
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from comments.models import Comment, CommentDelete
+from posts.cache import post_feed_cache
+from posts.models import Post, PostDelete
+
+COMMENT_DELETE_REASON = "게시글 삭제로 인한 댓글 자동삭제"
+
+
+def insert_delete_logs(
+    log_model, source_model, source_field: str, filters: dict, user_column, reason
+) -> int:
+    """
+    삭제 기록(PostDelete, CommentDelete)을 INSERT ... SELECT 한 번으로 만듦
+    - filters 조건에 맞는 source_model 행마다 (user, source_field=행 id, delete_reason) 기록을 남김
+    - user_column: 삭제한 사용자 id(int) 또는 source_model의 사용자 컬럼 이름(str)
+    - 대상 행을 파이썬으로 읽어오지 않음
+    """
+    quote = connection.ops.quote_name
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    query = source_model.objects.filter(**filters).query
+    where_sql, where_params = query.get_compiler(connection=connection).compile(
+        query.where
+    )
+    if isinstance(user_column, str):
+        user_sql, user_params = quote(user_column), []
+    else:
+        user_sql, user_params = "%s", [user_column]
+
+    columns = ", ".join(
+        quote(log_model._meta.get_field(name).column)
+        for name in ("created_at", "updated_at", "user", source_field, "delete_reason")
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(log_model._meta.db_table)} ({columns}) "
+            f"SELECT %s, %s, {user_sql}, {quote(source_model._meta.pk.column)}, %s "
+            f"FROM {quote(source_model._meta.db_table)} WHERE {where_sql}",
+            [now, now, *user_params, reason, *where_params],
+        )
+        return cursor.rowcount
+
+
+def soft_delete_posts(
+    post_ids: Iterable[int], user_id: int, delete_reason: str
+) -> List[int]:
+    """
+    게시글 여러 개와 그 댓글을 한 트랜잭션에서 soft delete하고 실제로 삭제한 게시글 id 목록을 반환
+    - 이미 삭제된 게시글, 댓글은 건너뜀(삭제 기록도 남기지 않음)
+    - 게시글 삭제 기록(PostDelete)은 delete_reason, 댓글 삭제 기록(CommentDelete)은
+      댓글 작성자 기준으로 COMMENT_DELETE_REASON을 남김
+    - 삭제 기록은 INSERT ... SELECT, 삭제 처리는 삭제 안된 행만 대상으로 하는 UPDATE라서
+      댓글 수와 상관없이 쿼리 수가 일정함
+    - queryset.update()는 post_save 시그널을 보내지 않으므로 커밋 후 게시글 목록 캐시를 직접 무효화
+    """
+    with transaction.atomic():
+        post_ids = list(
+            Post.objects.select_for_update()
+            .filter(id__in=list(post_ids), is_deleted=False)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        if not post_ids:
+            return []
+
+        now = timezone.now()
+        insert_delete_logs(
+            PostDelete, Post, "post", {"id__in": post_ids}, user_id, delete_reason
+        )
+        comment_filters = {"post_id__in": post_ids, "is_deleted": False}
+        insert_delete_logs(
+            CommentDelete,
+            Comment,
+            "comment",
+            comment_filters,
+            Comment._meta.get_field("user").column,
+            COMMENT_DELETE_REASON,
+        )
+        Comment.objects.filter(**comment_filters).update(
+            is_deleted=True, updated_at=now
+        )
+        Post.objects.filter(id__in=post_ids).update(
+            is_deleted=True, comments_count=0, updated_at=now
+        )
+        transaction.on_commit(post_feed_cache.invalidate_feed)
+
+    return post_ids
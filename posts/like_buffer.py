@@ -0,0 +1,241 @@
+import atexit
+import threading
+from collections import Counter
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from posts.cache import post_feed_cache
+from posts.likes import PostLikeState
+from posts.models import Post, PostLike
+from users.models import User
+
+FLUSH_CHUNK_SIZE = 500
+
+
+class PendingLike(NamedTuple):
+    """
+    - is_liked: 사용자가 마지막으로 토글한 좋아요 상태
+    - was_liked: 처음 토글할 때의 DB 좋아요 상태, 둘이 다를 때만 DB에 반영할 게 있음
+    """
+
+    is_liked: bool
+    was_liked: bool
+
+
+class PostLikeBuffer:
+    """
+    게시글 좋아요 토글 write-behind 버퍼(프로세스 메모리)
+    - 토글은 (게시글, 사용자)별 마지막 상태만 남기므로 같은 사용자가 여러 번 누르면 하나로 합쳐짐
+    - flush_interval초마다 모아둔 토글을 한 트랜잭션에서 좋아요 삭제/추가 몇 번과
+      게시글당 좋아요 수 UPDATE 한 번으로 반영해서, 인기 게시글 행에 요청마다 잠금이 걸리지 않음
+    - 아직 반영 안 된 토글은 pending_likes(), pending_likes_delta()로 조회 결과에 합쳐서
+      본인이 누른 좋아요는 바로 보임
+    - 프로세스별 버퍼이므로 다른 워커에서는 최대 flush_interval초 동안 반영 전 상태가 보이고,
+      반영 전 좋아요 수는 근사값
+    - flush_interval이 0이면 자동으로 반영하지 않음(flush()를 직접 호출)
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[Tuple[int, int], PendingLike] = {}
+        self._flushing: Dict[Tuple[int, int], PendingLike] = {}
+        self._deltas = Counter()
+        self._timer = None
+        if flush_interval:
+            atexit.register(self.flush)
+
+    def _set_pending(self, key: Tuple[int, int], like: Optional[PendingLike]):
+        previous = self._pending.pop(key, None)
+        if previous:
+            self._deltas[key[0]] -= previous.is_liked - previous.was_liked
+        if like and like.is_liked != like.was_liked:
+            self._pending[key] = like
+            self._deltas[key[0]] += like.is_liked - like.was_liked
+
+    def toggle(self, post_id: int, user_id: int) -> Optional[PostLikeState]:
+        """
+        좋아요 토글을 버퍼에 기록하고 바뀐 상태를 반환, 삭제된 글이거나 없는 글이면 None
+        - DB는 잠금 없는 조회 한 번만 함
+        """
+        row = (
+            Post.objects.filter(id=post_id, is_deleted=False)
+            .annotate(
+                is_liked=Exists(
+                    PostLike.objects.filter(
+                        post_id=OuterRef("pk"), like_user_id=user_id
+                    )
+                )
+            )
+            .values_list("likes_count", "is_liked")
+            .first()
+        )
+        if row is None:
+            return None
+
+        likes_count, db_is_liked = row
+        key = (post_id, user_id)
+        with self._lock:
+            # 반영 중인 토글이 있으면 반영이 끝난 뒤의 DB 상태를 기준으로 함
+            base = self._pending.get(key) or self._flushing.get(key)
+            is_liked = not (base.is_liked if base else db_is_liked)
+            if key in self._pending:
+                was_liked = self._pending[key].was_liked
+            elif key in self._flushing:
+                was_liked = self._flushing[key].is_liked
+            else:
+                was_liked = db_is_liked
+            self._set_pending(key, PendingLike(is_liked, was_liked))
+            likes_count = max(likes_count + self._deltas[post_id], 0)
+            pending_count = len(self._pending)
+            self._schedule_flush()
+
+        if pending_count >= self.max_pending:
+            self.flush()
+        return PostLikeState(is_liked, likes_count)
+
+    def pending_likes(self, user_id: int, post_ids: Iterable[int]) -> Dict[int, bool]:
+        """
+        user_id 사용자의 아직 DB에 반영 안 된 게시글별 좋아요 상태
+        """
+        with self._lock:
+            result = {}
+            for post_id in post_ids:
+                key = (post_id, user_id)
+                like = self._pending.get(key) or self._flushing.get(key)
+                if like:
+                    result[post_id] = like.is_liked
+            return result
+
+    def pending_likes_delta(self, post_id: int) -> int:
+        with self._lock:
+            return self._deltas[post_id]
+
+    def pending_likes_deltas(self, post_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        게시글별로 아직 DB에 반영 안 된 좋아요 수 변화, 변화가 없는 게시글은 빠짐
+        """
+        with self._lock:
+            return {
+                post_id: self._deltas[post_id]
+                for post_id in post_ids
+                if self._deltas.get(post_id)
+            }
+
+    def _schedule_flush(self):
+        if self.flush_interval and self._timer is None and self._pending:
+            self._timer = threading.Timer(self.flush_interval, self._flush_later)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_later(self):
+        try:
+            self.flush()
+        finally:
+            # 타이머 스레드의 DB 연결은 다른 요청이 쓰지 않으므로 닫음
+            connections.close_all()
+            with self._lock:
+                self._timer = None
+                self._schedule_flush()
+
+    def flush(self) -> int:
+        """
+        모아둔 토글을 DB에 반영하고 반영한 토글 수를 반환
+        - 좋아요 삭제는 DELETE ... RETURNING, 추가는 INSERT ... ON CONFLICT DO NOTHING RETURNING으로
+          실제로 바뀐 행만 세서 게시글마다 좋아요 수를 한 번씩 증감
+        - 삭제된 게시글/사용자의 좋아요는 추가하지 않음
+        - 실패하면 그 사이 새로 토글되지 않은 항목을 버퍼에 되돌리고 예외를 올려보냄
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._flushing = batch
+                self._deltas = Counter()
+            if not batch:
+                return 0
+            try:
+                post_ids = apply_pending_likes(batch)
+            except Exception:
+                with self._lock:
+                    for key, like in batch.items():
+                        if key not in self._pending:
+                            self._set_pending(key, like)
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+        if post_ids:
+            for post_id in post_ids:
+                post_feed_cache.invalidate_post(post_id)
+        return len(batch)
+
+
+def chunked(items: list, size: int = FLUSH_CHUNK_SIZE):
+    for index in range(0, len(items), size):
+        yield items[index : index + size]
+
+
+def apply_pending_likes(batch: Dict[Tuple[int, int], PendingLike]) -> list:
+    """
+    버퍼의 토글을 한 트랜잭션에서 DB에 반영하고 좋아요 수가 바뀐 게시글 id 목록을 반환
+    """
+    quote = connection.ops.quote_name
+    like_table = quote(PostLike._meta.db_table)
+    like_user, like_post, created_at, updated_at = (
+        quote(PostLike._meta.get_field(name).column)
+        for name in ("like_user", "post", "created_at", "updated_at")
+    )
+    post_table, user_table = quote(Post._meta.db_table), quote(User._meta.db_table)
+    post_id_column = quote(Post._meta.pk.column)
+    user_id_column = quote(User._meta.pk.column)
+    is_deleted = quote(Post._meta.get_field("is_deleted").column)
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+
+    likes = [key for key, like in batch.items() if like.is_liked]
+    unlikes = [key for key, like in batch.items() if not like.is_liked]
+    deltas = Counter()
+    with transaction.atomic(), connection.cursor() as cursor:
+        for keys in chunked(unlikes):
+            values = ", ".join(["(%s, %s)"] * len(keys))
+            cursor.execute(
+                f"DELETE FROM {like_table} WHERE ({like_post}, {like_user}) "
+                f"IN (VALUES {values}) RETURNING {like_post}",
+                [value for key in keys for value in key],
+            )
+            for (post_id,) in cursor.fetchall():
+                deltas[post_id] -= 1
+
+        for keys in chunked(likes):
+            values = ", ".join(["(%s, %s)"] * len(keys))
+            # VALUES 컬럼 이름은 PostgreSQL, SQLite 모두 column1, column2
+            cursor.execute(
+                f"INSERT INTO {like_table} ({created_at}, {updated_at}, {like_post}, {like_user}) "
+                f"SELECT %s, %s, likes.column1, likes.column2 FROM (VALUES {values}) likes "
+                f"JOIN {post_table} ON {post_table}.{post_id_column} = likes.column1 "
+                f"JOIN {user_table} ON {user_table}.{user_id_column} = likes.column2 "
+                f"WHERE {post_table}.{is_deleted} = %s "
+                f"ON CONFLICT ({like_user}, {like_post}) DO NOTHING RETURNING {like_post}",
+                [now, now, *[value for key in keys for value in key], False],
+            )
+            for (post_id,) in cursor.fetchall():
+                deltas[post_id] += 1
+
+        for post_id, delta in deltas.items():
+            if delta:
+                Post.adjust_counter(post_id, "likes_count", delta)
+    return [post_id for post_id, delta in deltas.items() if delta]
+
+
+post_like_buffer = PostLikeBuffer(
+    settings.POST_LIKE_FLUSH_INTERVAL_MS / 1000
+    if settings.POST_LIKE_WRITE_BEHIND
+    else 0,
+    settings.POST_LIKE_BUFFER_MAX_PENDING,
+)
@@ -0,0 +1,71 @@
+from typing import NamedTuple, Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from posts.models import Post, PostLike
+from posts.signals import invalidate_feed_by_like
+
+
+class PostLikeState(NamedTuple):
+    is_liked: bool
+    likes_count: int
+
+
+def toggle_post_like(post_id: int, user_id: int) -> Optional[PostLikeState]:
+    """
+    게시글 좋아요 토글, 바뀐 좋아요 상태와 좋아요 수를 반환(삭제된 글이거나 없는 글이면 None)
+    - 좋아요가 있으면 DELETE ... RETURNING 한 번으로 삭제하고,
+      없으면 INSERT ... ON CONFLICT DO NOTHING으로 추가해서 조회 후 추가(get_or_create)하는 경합이 없음
+    - 좋아요 수(likes_count)도 같은 트랜잭션에서 UPDATE ... RETURNING으로 바꾸고 바로 읽음
+    - raw SQL이라 PostLike 시그널이 동작하지 않으므로 커밋 후 게시글 목록 캐시를 직접 무효화
+    """
+    quote = connection.ops.quote_name
+    like_table = quote(PostLike._meta.db_table)
+    like_id, like_user, like_post, created_at, updated_at = (
+        quote(PostLike._meta.get_field(name).column)
+        for name in ("id", "like_user", "post", "created_at", "updated_at")
+    )
+    post_table = quote(Post._meta.db_table)
+    post_id_column, is_deleted, likes_count = (
+        quote(Post._meta.get_field(name).column)
+        for name in ("id", "is_deleted", "likes_count")
+    )
+    post_exists = (
+        f"SELECT 1 FROM {post_table} WHERE {post_id_column} = %s AND {is_deleted} = %s"
+    )
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {like_table} WHERE {like_user} = %s AND {like_post} = %s "
+            f"AND EXISTS ({post_exists}) RETURNING {like_id}",
+            [user_id, post_id, post_id, False],
+        )
+        if cursor.fetchone():
+            is_liked, delta = False, -1
+        else:
+            cursor.execute(
+                f"INSERT INTO {like_table} ({created_at}, {updated_at}, {like_user}, {like_post}) "
+                f"SELECT %s, %s, %s, {post_id_column} FROM {post_table} "
+                f"WHERE {post_id_column} = %s AND {is_deleted} = %s "
+                f"ON CONFLICT ({like_user}, {like_post}) DO NOTHING RETURNING {like_id}",
+                [now, now, user_id, post_id, False],
+            )
+            # 같은 사용자의 동시 요청이 먼저 추가했으면(충돌) 좋아요 상태는 그대로 두고 수만 읽음
+            is_liked, delta = True, 1 if cursor.fetchone() else 0
+
+        cursor.execute(
+            f"UPDATE {post_table} SET {likes_count} = "
+            f"CASE WHEN {likes_count} + %s < 0 THEN 0 ELSE {likes_count} + %s END "
+            f"WHERE {post_id_column} = %s AND {is_deleted} = %s RETURNING {likes_count}",
+            [delta, delta, post_id, False],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            transaction.set_rollback(True)
+            return None
+
+    if delta:
+        transaction.on_commit(lambda: invalidate_feed_by_like(post_id))
+    return PostLikeState(is_liked, row[0])
@@ -0,0 +1,154 @@
+import random
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.test.utils import CaptureQueriesContext
+from ninja import Field
+
+from comments.models import Comment
+from cores.models import UserAccountType
+from posts.models import Post, PostLike, PostReport
+from posts.schemas import AdminGetPostListOut, GetPostListOut
+from users.models import User
+
+
+class LegacyGetPostListOut(GetPostListOut):
+    post_likes_count: int = Field(..., alias="likes.count")
+
+
+class LegacyAdminGetPostListOut(AdminGetPostListOut):
+    post_likes_count: int = Field(..., alias="likes.count")
+
+
+def legacy_feed(limit):
+    posts = (
+        Post.objects.filter(is_deleted=False)
+        .select_related("user")
+        .prefetch_related("likes")
+        .order_by("-created_at")[:limit]
+    )
+    return [LegacyGetPostListOut.from_orm(post).dict() for post in posts]
+
+
+def counter_feed(limit):
+    posts = (
+        Post.objects.filter(is_deleted=False)
+        .select_related("user")
+        .order_by("-created_at")[:limit]
+    )
+    return [GetPostListOut.from_orm(post).dict() for post in posts]
+
+
+def legacy_admin_feed(limit):
+    posts = (
+        Post.objects.annotate(reported_count=Count("reports", distinct=True))
+        .select_related("user")
+        .filter(is_deleted=False)
+        .prefetch_related("likes", "reports")
+        .order_by("-created_at")[:limit]
+    )
+    return [LegacyAdminGetPostListOut.from_orm(post).dict() for post in posts]
+
+
+def counter_admin_feed(limit):
+    posts = (
+        Post.objects.annotate(reported_count=F("reports_count"))
+        .select_related("user")
+        .filter(is_deleted=False)
+        .order_by("-created_at")[:limit]
+    )
+    return [AdminGetPostListOut.from_orm(post).dict() for post in posts]
+
+
+class RollbackBenchmark(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "게시글 목록 조회 시 좋아요 수를 COUNT/prefetch로 구할 때와 카운터 컬럼으로 구할 때의 쿼리 수, 속도 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=200)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--limit", type=int, default=9)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        # 벤치마크용 데이터는 트랜잭션 안에서 만들고 끝나면 모두 롤백함
+        try:
+            with transaction.atomic():
+                self.create_fixtures(options)
+                self.run_benchmark(options)
+                raise RollbackBenchmark
+        except RollbackBenchmark:
+            pass
+
+    def create_fixtures(self, options):
+        rng = random.Random(options["seed"])
+        users = User.objects.bulk_create(
+            User(
+                email=f"bench-feed-{index}@togedog.com",
+                nickname=f"bench{index}",
+                password="bench",
+                account_type=UserAccountType.EMAIL.value,
+            )
+            for index in range(options["users"])
+        )
+        posts = Post.objects.bulk_create(
+            Post(user=rng.choice(users), subject=f"bench {index}", content="bench")
+            for index in range(options["posts"])
+        )
+        likes, reports, comments = [], [], []
+        for post in posts:
+            for user in rng.sample(users, rng.randrange(len(users) + 1)):
+                likes.append(PostLike(post=post, like_user=user))
+            for user in rng.sample(users, rng.randrange(3)):
+                reports.append(
+                    PostReport(
+                        post=post,
+                        reporter_user=user,
+                        reported_user=post.user,
+                        content="-",
+                    )
+                )
+            for user in rng.sample(users, rng.randrange(5)):
+                comments.append(Comment(post=post, user=user, content="bench"))
+        # bulk_create는 시그널을 보내지 않으므로 카운터는 한 번에 다시 계산함
+        PostLike.objects.bulk_create(likes)
+        PostReport.objects.bulk_create(reports)
+        Comment.objects.bulk_create(comments)
+        for post in posts:
+            post.likes_count = post.likes.count()
+            post.reports_count = post.reports.count()
+            post.comments_count = post.comments.filter(is_deleted=False).count()
+        Post.objects.bulk_update(
+            posts, ["likes_count", "reports_count", "comments_count"]
+        )
+        self.stdout.write(
+            f"posts: {len(posts)}, likes: {len(likes)}, "
+            f"reports: {len(reports)}, comments: {len(comments)}"
+        )
+
+    def run_benchmark(self, options):
+        limit = options["limit"]
+        for name, legacy, counter in (
+            ("GET /posts", legacy_feed, counter_feed),
+            ("GET /posts/admin", legacy_admin_feed, counter_admin_feed),
+        ):
+            for label, func in (("legacy ", legacy), ("counter", counter)):
+                with CaptureQueriesContext(connection) as context:
+                    result = func(limit)
+                seconds = min(
+                    timeit.repeat(
+                        lambda: func(limit), number=1, repeat=options["repeat"]
+                    )
+                )
+                self.stdout.write(
+                    f"{name:<17} {label}: {len(context.captured_queries)} queries, "
+                    f"{seconds * 1000:.2f}ms for {len(result)} posts"
+                )
+            if legacy(limit) != counter(limit):
+                self.stderr.write(f"{name}: result mismatch")
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from comments.models import Comment
+from posts.models import Post, PostLike, PostReport
+
+
+def count_by_post(model, **filters):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(post_id=OuterRef("pk"), **filters)
+            .order_by()
+            .values("post_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = "게시글의 좋아요/댓글/신고 수 컬럼을 실제 테이블 기준으로 다시 계산"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--post-id", type=int, action="append", dest="post_ids")
+        parser.add_argument("--dry-run", action="store_true", help="값이 틀린 게시글 수만 출력")
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if options["post_ids"]:
+            posts = posts.filter(id__in=options["post_ids"])
+
+        with transaction.atomic():
+            drifted = (
+                posts.annotate(
+                    actual_likes_count=count_by_post(PostLike),
+                    actual_comments_count=count_by_post(Comment, is_deleted=False),
+                    actual_reports_count=count_by_post(PostReport),
+                )
+                .exclude(
+                    likes_count=F("actual_likes_count"),
+                    comments_count=F("actual_comments_count"),
+                    reports_count=F("actual_reports_count"),
+                )
+                .values_list("id", flat=True)
+            )
+            drifted_ids = list(drifted)
+            if not options["dry_run"] and drifted_ids:
+                Post.objects.filter(id__in=drifted_ids).update(
+                    likes_count=count_by_post(PostLike),
+                    comments_count=count_by_post(Comment, is_deleted=False),
+                    reports_count=count_by_post(PostReport),
+                )
+
+        action = "found" if options["dry_run"] else "rebuilt"
+        self.stdout.write(f"{action} {len(drifted_ids)} post(s) with wrong counters")
@@ -0,0 +1,57 @@
+# Generated by Django 4.1 on 2026-10-18 01:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_by_post(model, **filters):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(post_id=OuterRef("pk"), **filters)
+            .order_by()
+            .values("post_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def fill_post_counters(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    PostLike = apps.get_model("posts", "PostLike")
+    PostReport = apps.get_model("posts", "PostReport")
+    Comment = apps.get_model("comments", "Comment")
+    Post.objects.update(
+        likes_count=count_by_post(PostLike),
+        comments_count=count_by_post(Comment, is_deleted=False),
+        reports_count=count_by_post(PostReport),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0007_alter_comment_content"),
+        ("posts", "0011_postlike_unique_post_like"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="likes_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="reports_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_post_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.1 on 2026-10-18 01:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0013_post_feed_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["-updated_at", "-id"],
+                name="post_deleted_updated_at_idx",
+            ),
+        ),
+    ]
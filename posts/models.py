@@ -1,7 +1,17 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
 
 from cores.models import TimeStampedModel
+from cores.images import get_image_variant_url
+
+# 게시글 목록 정렬 기준, 마지막에 id를 넣어서 같은 값끼리도 순서가 고정되게 함
+# Post.Meta.indexes의 인덱스와 같은 순서여야 함
+POST_FEED_ORDERINGS = {
+    "-created_at": ("-created_at", "-id"),
+    "likes": ("-likes_count", "-id"),
+}
 
 
 class Post(TimeStampedModel):
@@ -13,14 +23,54 @@ class Post(TimeStampedModel):
     image_url = models.CharField(
         max_length=500, default=settings.DEFAULT_POST_IMAGE_URL
     )
+    # image_url 사진을 줄인 WebP 사진 주소, generate_image_variants 워커가 채움
+    image_variants = models.JSONField(default=dict, blank=True)
     is_deleted = models.BooleanField(default=False)
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    reports_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         db_table = "post"
+        indexes = [
+            # 게시글 목록 커서 페이지네이션(최신순, 좋아요순)용 인덱스
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="post_created_at_id_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["-likes_count", "-id"],
+                name="post_likes_count_id_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            # 관리자 페이지 삭제된 게시글 목록용 인덱스
+            models.Index(
+                fields=["-updated_at", "-id"],
+                name="post_deleted_updated_at_idx",
+                condition=models.Q(is_deleted=True),
+            ),
+        ]
 
     def __str__(self):
         return self.subject
 
+    @classmethod
+    def adjust_counter(cls, post_id: int, field: str, delta: int):
+        """
+        좋아요/댓글/신고 수 컬럼(field)을 delta만큼 DB에서 바로 증감, 0 밑으로는 내려가지 않음
+        - updated_at은 바뀌지 않음
+        """
+        cls.objects.filter(id=post_id).update(**{field: Greatest(F(field) + delta, 0)})
+
+    @property
+    def feed_image_url(self):
+        return get_image_variant_url(self.image_url, self.image_variants, "feed")
+
+    @property
+    def detail_image_url(self):
+        return get_image_variant_url(self.image_url, self.image_variants, "detail")
+
     @property
     def get_likes_count(self):
         return self.likes.count()
@@ -17,7 +17,7 @@ class GetCommentOut(ModelSchema):
     user_id: int
     post_id: int
     user_nickname: str = Field(..., alias="user.nickname")
-    user_thumbnail: str = Field(..., alias="user.thumbnail_url")
+    user_thumbnail: str = Field(..., alias="user.avatar_url")
 
     class Config:
         model = Comment
@@ -27,12 +27,30 @@ class GetCommentOut(ModelSchema):
 class GetPostListOut(ModelSchema):
     user_id: int
     user_nickname: str = Field(..., alias="user.nickname")
-    user_thumbnail: str = Field(..., alias="user.thumbnail_url")
-    post_likes_count: int = Field(..., alias="likes.count")
+    user_thumbnail: str = Field(..., alias="user.avatar_url")
+    image_url: str = Field(..., alias="feed_image_url")
+    post_likes_count: int = Field(..., alias="likes_count")
 
     class Config:
         model = Post
-        model_exclude = ["user", "is_deleted", "content"]
+        model_exclude = [
+            "user",
+            "is_deleted",
+            "content",
+            "likes_count",
+            "comments_count",
+            "reports_count",
+            "image_variants",
+        ]
+
+
+class GetPostFeedItemOut(GetPostListOut):
+    is_liked: bool
+
+
+class GetPostFeedOut(Schema):
+    items: List[GetPostFeedItemOut]
+    next_cursor: Optional[str]
 
 
 class AdminGetPostListOut(GetPostListOut):
@@ -55,27 +73,49 @@ class DeletePostIn(Schema):
     delete_reason: Optional[str]
 
 
+class BulkDeletePostsIn(Schema):
+    post_ids: List[int] = Field(..., min_items=1, max_items=500)
+    delete_reason: str = Field(..., max_length=200)
+
+
+class BulkDeletePostsOut(Schema):
+    deleted_post_ids: List[int]
+
+
+class PostLikeOut(Schema):
+    message: str
+    is_liked: bool
+    post_likes_count: int
+
+
 class DeletedPostOut(ModelSchema):
     user_nickname: str = Field(..., alias="user.nickname")
     user_mbti: str = Field(..., alias="user.mbti")
 
     class Config:
         model = Post
-        model_fields = "__all__"
+        model_exclude = [
+            "likes_count",
+            "comments_count",
+            "reports_count",
+            "image_variants",
+        ]
 
 
 class GetPostOut(Schema):
     id: int
     user_id: int
     user_nickname: str = Field(..., alias="user.nickname")
-    user_thumbnail: str = Field(..., alias="user.thumbnail_url")
+    user_thumbnail: str = Field(..., alias="user.avatar_url")
     subject: str
     content: str
-    image_url: str
+    image_url: str = Field(..., alias="detail_image_url")
     created_at: datetime
-    post_likes_count: int = Field(..., alias="get_likes_count")
+    post_likes_count: int = Field(..., alias="likes_count")
     is_liked: bool
     comments_list: List[GetCommentOut]
+    comments_has_more: bool = False
+    comments_next_cursor: Optional[str] = None
     # comments: List[GetCommentOut] = Field(..., alias='get_comments_not_deleted')
 
     class Config:
@@ -98,6 +138,8 @@ class AdminGetPostOut(Schema):
     user_thumbnail: str = Field(..., alias="user.thumbnail_url")
     user_created_at: Optional[datetime] = Field(..., alias="user.created_at")
     comments_list: List[GetCommentOut]
+    comments_has_more: bool = False
+    comments_next_cursor: Optional[str] = None
     # comments: Optional[List] = Field(..., alias='get_comments_not_deleted')
 
     class Config:
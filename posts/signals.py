@@ -0,0 +1,147 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, QuerySet, Subquery
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from comments.models import Comment
+from cores.utils import is_cascade_delete
+from posts.cache import post_feed_cache
+from posts.models import Post, PostLike, PostReport
+from users.models import User
+
+# 이 모델의 delete()로 함께 지워지는 좋아요/신고/댓글은 행마다 글의 수를 줄이지 않음
+# (Post는 곧 지워지고, User는 pre_delete에서 글마다 한 번에 줄임)
+CASCADE_ORIGINS = (Post, User)
+# 게시글 목록에 보이는 글쓴이 정보(닉네임, 프로필 사진)
+USER_FEED_FIELDS = {"nickname", "thumbnail_url", "thumbnail_variants"}
+
+
+@receiver(post_save, sender=PostLike)
+def increase_likes_count(sender, instance, created, **kwargs):
+    if created:
+        Post.adjust_counter(instance.post_id, "likes_count", 1)
+        transaction.on_commit(lambda: invalidate_feed_by_like(instance.post_id))
+
+
+@receiver(post_delete, sender=PostLike)
+def decrease_likes_count(sender, instance, origin=None, **kwargs):
+    if is_cascade_delete(origin, *CASCADE_ORIGINS):
+        return
+    Post.adjust_counter(instance.post_id, "likes_count", -1)
+    transaction.on_commit(lambda: invalidate_feed_by_like(instance.post_id))
+
+
+def invalidate_feed_by_like(post_id: int):
+    """
+    좋아요 수가 바뀐 글이 들어있는 페이지만 무효화
+    - 좋아요마다 좋아요순 목록 전체를 무효화하면 좋아요가 몰릴 때 캐시가 계속 비어 있으므로
+      좋아요순 순서 변경은 페이지가 만료(POST_FEED_CACHE_TTL)될 때 반영됨
+    """
+    post_feed_cache.invalidate_post(post_id)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_post_feed_on_save(sender, instance, created, **kwargs):
+    """
+    create_post, delete_post(soft delete)는 목록 구성이 바뀌므로 목록 전체를,
+    modify_post는 수정한 글이 들어있는 페이지만 무효화
+    - 커밋 전에 무효화하면 다른 요청이 커밋 전 내용을 다시 캐시할 수 있으므로 커밋 후에 무효화
+    """
+    if created or instance.is_deleted:
+        transaction.on_commit(post_feed_cache.invalidate_feed)
+    else:
+        transaction.on_commit(lambda: post_feed_cache.invalidate_post(instance.id))
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_post_feed_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(post_feed_cache.invalidate_feed)
+
+
+@receiver(post_save, sender="users.User")
+def invalidate_post_feed_on_user_save(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """
+    목록에 글쓴이 닉네임, 프로필 사진이 들어가므로 기존 사용자의 그 정보가 바뀌면 목록 전체를 무효화
+    - update_fields로 저장한 필드에 목록에 보이는 필드(USER_FEED_FIELDS)가 없으면
+      (deactivate_user 등) 무효화하지 않음
+    """
+    if created:
+        return
+    if update_fields is not None and not USER_FEED_FIELDS & update_fields:
+        return
+    transaction.on_commit(post_feed_cache.invalidate_feed)
+
+
+@receiver(post_save, sender=PostReport)
+def increase_reports_count(sender, instance, created, **kwargs):
+    if created:
+        Post.adjust_counter(instance.post_id, "reports_count", 1)
+
+
+@receiver(post_delete, sender=PostReport)
+def decrease_reports_count(sender, instance, origin=None, **kwargs):
+    if is_cascade_delete(origin, *CASCADE_ORIGINS):
+        return
+    Post.adjust_counter(instance.post_id, "reports_count", -1)
+
+
+@receiver(post_save, sender=Comment)
+def increase_comments_count(sender, instance, created, **kwargs):
+    """
+    삭제되지 않은 댓글 수만 셈
+    - 댓글 soft delete는 delete_comment, delete_post에서 직접 줄임
+    """
+    if created and not instance.is_deleted:
+        Post.adjust_counter(instance.post_id, "comments_count", 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comments_count(sender, instance, origin=None, **kwargs):
+    if is_cascade_delete(origin, *CASCADE_ORIGINS):
+        return
+    if not instance.is_deleted:
+        Post.adjust_counter(instance.post_id, "comments_count", -1)
+
+
+def decrease_post_counter(field: str, rows: QuerySet):
+    """
+    곧 지워질 행(rows)의 수를 글마다 세서 글의 field 컬럼을 UPDATE 한 번으로 줄임
+    """
+    counts = (
+        rows.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Post.objects.filter(id__in=rows.values("post")).update(
+        **{field: Greatest(F(field) - Subquery(counts), 0)}
+    )
+
+
+@receiver(pre_delete, sender=User)
+def decrease_post_counters_on_user_delete(sender, instance, **kwargs):
+    """
+    delete_user_account로 사용자와 함께 지워지는 좋아요/신고/댓글 수를 남는 글(다른 사용자의 글)에서 줄임
+    - 사용자의 글은 함께 지워지므로 건너뜀
+    """
+    decrease_post_counter(
+        "likes_count",
+        PostLike.objects.filter(like_user=instance).exclude(post__user=instance),
+    )
+    decrease_post_counter(
+        "reports_count",
+        PostReport.objects.filter(
+            Q(reporter_user=instance) | Q(reported_user=instance)
+        ).exclude(post__user=instance),
+    )
+    decrease_post_counter(
+        "comments_count",
+        Comment.objects.filter(user=instance, is_deleted=False).exclude(
+            post__user=instance
+        ),
+    )
+    transaction.on_commit(post_feed_cache.invalidate_feed)
@@ -1,12 +1,23 @@
+import json
+from io import StringIO
 from unittest.mock import patch
 
 from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
 from django.core.files.base import ContentFile
+from django.db import connection
 from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from comments.models import Comment, CommentDelete
+from cores.pagination import encode_cursor
+from posts.cache import post_feed_cache
+from posts.like_buffer import PostLikeBuffer
 from posts.models import Post, PostDelete, PostLike, PostReport
+from users.models import User
 from users.tests import UserTest
 
 
@@ -79,11 +90,51 @@ class GetPostsByAdminTest(PostTest):
                 }
             ],
             "count": Post.objects.filter(is_deleted=False).count(),
+            "next_cursor": None,
         }
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), results)
 
+    def test_success_get_posts_by_admin_next_page(self):
+        for index in range(10):
+            Post.objects.create(user=self.test_user_1, subject=f"admin {index}")
+        expected_ids = list(
+            Post.objects.filter(is_deleted=False)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+
+        first_page = self.client.get(
+            reverse("api-1.0.0:get_posts_by_admin"),
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        ).json()
+        second_page = self.client.get(
+            reverse("api-1.0.0:get_posts_by_admin"),
+            {"cursor": first_page["next_cursor"]},
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        ).json()
+
+        self.assertEqual(
+            [item["id"] for item in first_page["items"] + second_page["items"]],
+            expected_ids,
+        )
+        self.assertEqual(first_page["count"], 11)
+        self.assertEqual(second_page["count"], 11)
+        self.assertEqual(second_page["next_cursor"], None)
+
+    def test_success_get_posts_by_admin_search_nickname(self):
+        Post.objects.create(user=self.test_admin, subject="admin post")
+        response = self.client.get(
+            reverse("api-1.0.0:get_posts_by_admin"),
+            {"search": "테스"},
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["id"] for item in response.json()["items"]], [self.test_post.id]
+        )
+
     def test_fail_405_get_posts_by_admin(self):
         response = self.client.post(
             reverse("api-1.0.0:get_posts_by_admin"),
@@ -125,6 +176,7 @@ class GetDeletedPostsTest(PostTest):
                 }
             ],
             "count": Post.objects.filter(is_deleted=True).count(),
+            "next_cursor": None,
         }
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), results)
@@ -233,6 +285,8 @@ class GetPostTest(PostTest):
                     is_deleted=False
                 ).order_by("created_at")
             ],
+            "comments_has_more": False,
+            "comments_next_cursor": None,
         }
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), results)
@@ -388,6 +442,8 @@ class GetPostByAdminTest(PostTest):
                     is_deleted=False
                 ).order_by("created_at")
             ],
+            "comments_has_more": False,
+            "comments_next_cursor": None,
         }
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), results)
@@ -415,6 +471,78 @@ class GetPostByAdminTest(PostTest):
         self.assertEqual(response.json(), {"detail": "forbidden"})
 
 
+class PostDetailQueryCountTest(PostTest):
+    def add_comments(self, count):
+        for index in range(count):
+            user = User.objects.create(
+                nickname=f"댓글{index}",
+                email=f"comment{index}@test.com",
+                account_type="email",
+            )
+            Comment.objects.create(user=user, post=self.test_post, content="comment")
+
+    def count_queries(self, view_name, jwt, data=None):
+        url = reverse(f"api-1.0.0:{view_name}", kwargs={"post_id": self.test_post.id})
+        # 인증 캐시를 채워서 게시글 조회 쿼리만 셈
+        self.client.get(url, data, HTTP_AUTHORIZATION=f"Bearer {jwt}")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, data, HTTP_AUTHORIZATION=f"Bearer {jwt}")
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response.json()
+
+    def test_get_post_query_count(self):
+        one_comment_queries, _ = self.count_queries("get_post", self.user_jwt)
+        self.add_comments(5)
+        queries, response = self.count_queries("get_post", self.user_jwt)
+
+        self.assertEqual(queries, 2)
+        self.assertEqual(queries, one_comment_queries)
+        self.assertEqual(len(response["comments_list"]), 6)
+        self.assertEqual(response["comments_list"][-1]["user_nickname"], "댓글4")
+        self.assertEqual(response["is_liked"], True)
+        self.assertEqual(response["post_likes_count"], 1)
+
+    def test_get_post_by_admin_query_count(self):
+        one_comment_queries, _ = self.count_queries("get_post_by_admin", self.admin_jwt)
+        self.add_comments(5)
+        queries, response = self.count_queries("get_post_by_admin", self.admin_jwt)
+
+        self.assertEqual(queries, 2)
+        self.assertEqual(queries, one_comment_queries)
+        self.assertEqual(len(response["comments_list"]), 6)
+
+    def test_get_post_with_comments_limit(self):
+        self.add_comments(5)
+        queries, response = self.count_queries(
+            "get_post", self.user_jwt, {"comments_limit": 4}
+        )
+
+        self.assertEqual(queries, 2)
+        self.assertEqual(len(response["comments_list"]), 4)
+        self.assertEqual(response["comments_list"][-1]["user_nickname"], "댓글2")
+        self.assertEqual(response["comments_has_more"], True)
+
+        rest = self.client.get(
+            reverse("api-1.0.0:get_comments", kwargs={"post_id": self.test_post.id}),
+            {"cursor": response["comments_next_cursor"]},
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        rest = json.loads(b"".join(rest.streaming_content))
+        self.assertEqual(
+            [comment["user_nickname"] for comment in rest["items"]], ["댓글3", "댓글4"]
+        )
+        self.assertIsNone(rest["next_cursor"])
+
+    def test_get_post_by_admin_with_comments_limit_covering_all(self):
+        _, response = self.count_queries(
+            "get_post_by_admin", self.admin_jwt, {"comments_limit": 1}
+        )
+
+        self.assertEqual(len(response["comments_list"]), 1)
+        self.assertEqual(response["comments_has_more"], False)
+        self.assertIsNone(response["comments_next_cursor"])
+
+
 class DeletePostTest(PostTest):
     def test_success_delete_post(self):
         response = self.client.post(
@@ -465,6 +593,115 @@ class DeletePostTest(PostTest):
         self.assertEqual(response.status_code, 404)
         self.assertEqual(response.json(), {"detail": "Not Found"})
 
+    def test_success_delete_post_skips_deleted_comments(self):
+        deleted_comment = Comment.objects.create(
+            user=self.test_admin,
+            post=self.test_post,
+            content="deleted",
+            is_deleted=True,
+        )
+        admin_comment = Comment.objects.create(
+            user=self.test_admin, post=self.test_post, content="admin"
+        )
+        self.client.post(
+            reverse("api-1.0.0:delete_post", kwargs={"post_id": self.test_post.id}),
+            data={"delete_reason": "spam"},
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+
+        self.assertEqual(
+            PostDelete.objects.get(post_id=self.test_post.id).delete_reason, "spam"
+        )
+        self.assertEqual(
+            sorted(CommentDelete.objects.values_list("comment_id", "user_id")),
+            [
+                (self.test_post_comment.id, self.test_user_1.id),
+                (admin_comment.id, self.test_admin.id),
+            ],
+        )
+        self.assertFalse(CommentDelete.objects.filter(comment=deleted_comment).exists())
+        self.assertEqual(Post.objects.get(id=self.test_post.id).comments_count, 0)
+
+    def test_delete_post_query_count(self):
+        for index in range(10):
+            Comment.objects.create(
+                user=self.test_user_1, post=self.test_post, content=f"{index}"
+            )
+        # 인증 캐시를 채워서 게시글 삭제 쿼리만 셈
+        self.client.get(
+            reverse("api-1.0.0:get_post", kwargs={"post_id": self.test_post.id}),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                reverse("api-1.0.0:delete_post", kwargs={"post_id": self.test_post.id}),
+                HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        # 게시글 조회, 잠금, 게시글/댓글 삭제 기록 INSERT, 댓글/게시글 UPDATE + 트랜잭션
+        self.assertLessEqual(len(context.captured_queries), 8)
+        self.assertEqual(CommentDelete.objects.count(), 11)
+
+
+class DeletePostsByAdminTest(PostTest):
+    def delete_posts(self, jwt, post_ids, delete_reason="spam"):
+        return self.client.post(
+            reverse("api-1.0.0:delete_posts_by_admin"),
+            data={"post_ids": post_ids, "delete_reason": delete_reason},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {jwt}",
+        )
+
+    def test_success_delete_posts_by_admin(self):
+        spam_posts = [
+            Post.objects.create(user=self.test_user_1, subject=f"spam{index}")
+            for index in range(3)
+        ]
+        for post in spam_posts:
+            Comment.objects.create(user=self.test_admin, post=post, content="comment")
+        post_ids = [post.id for post in spam_posts]
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.delete_posts(
+                self.admin_jwt, [*post_ids, self.test_deleted_post.id, 12345]
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"deleted_post_ids": post_ids})
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(
+            Post.objects.filter(id__in=post_ids, is_deleted=True).count(), 3
+        )
+        self.assertEqual(
+            set(
+                PostDelete.objects.filter(post_id__in=post_ids).values_list(
+                    "user_id", "delete_reason"
+                )
+            ),
+            {(self.test_admin.id, "spam")},
+        )
+        self.assertEqual(
+            CommentDelete.objects.filter(comment__post_id__in=post_ids).count(), 3
+        )
+        self.assertFalse(
+            Comment.objects.filter(post_id__in=post_ids, is_deleted=False).exists()
+        )
+        self.assertEqual(
+            PostDelete.objects.filter(post=self.test_deleted_post).count(), 1
+        )
+        self.assertEqual(Post.objects.get(id=self.test_post.id).is_deleted, False)
+
+    def test_fail_422_delete_posts_by_admin_without_post_ids(self):
+        response = self.delete_posts(self.admin_jwt, [])
+        self.assertEqual(response.status_code, 422)
+
+    def test_fail_403_delete_posts_by_admin(self):
+        response = self.delete_posts(self.user_jwt, [self.test_post.id])
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {"detail": "forbidden"})
+        self.assertEqual(Post.objects.get(id=self.test_post.id).is_deleted, False)
+
 
 class ReportPostTest(PostTest):
     def test_success_report_test(self):
@@ -586,7 +823,10 @@ class CreatePostLikeTest(PostTest):
         )
         self.assertEqual(post_like.exists(), True)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json(), {"message": "post like created"})
+        self.assertEqual(
+            response.json(),
+            {"message": "post like created", "is_liked": True, "post_likes_count": 2},
+        )
 
         response = self.client.post(
             reverse(
@@ -599,7 +839,55 @@ class CreatePostLikeTest(PostTest):
         )
         self.assertEqual(post_like.exists(), False)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json(), {"message": "post like deleted"})
+        self.assertEqual(
+            response.json(),
+            {"message": "post like deleted", "is_liked": False, "post_likes_count": 1},
+        )
+
+    def test_create_post_like_query_count(self):
+        url = reverse(
+            "api-1.0.0:create_post_like", kwargs={"post_id": self.test_post.id}
+        )
+        # 인증 캐시를 채워서 좋아요 토글 쿼리만 셈
+        self.client.get(
+            reverse("api-1.0.0:get_post", kwargs={"post_id": self.test_post.id}),
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        for expected_queries, is_liked in [(3, True), (2, False)]:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    url, HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}"
+                )
+            queries = [
+                query["sql"]
+                for query in context.captured_queries
+                if "SAVEPOINT" not in query["sql"]
+            ]
+            # 좋아요: DELETE, INSERT, UPDATE / 좋아요 취소: DELETE, UPDATE
+            self.assertEqual(len(queries), expected_queries)
+            self.assertEqual(response.json()["is_liked"], is_liked)
+
+    def test_fail_404_create_post_like_on_deleted_post(self):
+        response = self.client.post(
+            reverse(
+                "api-1.0.0:create_post_like",
+                kwargs={"post_id": self.test_deleted_post.id},
+            ),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"detail": "Not Found"})
+
+        self.test_post.is_deleted = True
+        self.test_post.save()
+        response = self.client.post(
+            reverse(
+                "api-1.0.0:create_post_like", kwargs={"post_id": self.test_post.id}
+            ),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(PostLike.objects.filter(id=self.test_post_like.id).exists())
 
     def test_fail_405_create_post_like(self):
         response = self.client.get(
@@ -663,6 +951,7 @@ class GetPostsTest(PostTest):
                 "user_nickname": post.user.nickname,
                 "user_thumbnail": post.user.thumbnail_url,
                 "post_likes_count": post.likes.count(),
+                "is_liked": post.likes.filter(like_user=self.test_user_1).exists(),
             }
             for post in posts
         ]
@@ -702,6 +991,373 @@ class GetPostsTest(PostTest):
     #         print(e)
 
 
+@override_settings(POST_LIKE_WRITE_BEHIND=True)
+class PostLikeBufferTest(PostTest):
+    def setUp(self):
+        super().setUp()
+        self.buffer = PostLikeBuffer(flush_interval=0, max_pending=100)
+        self.buffer_patcher = patch("posts.api.post_like_buffer", self.buffer)
+        self.buffer_patcher.start()
+
+    def tearDown(self):
+        self.buffer_patcher.stop()
+        super().tearDown()
+
+    def toggle_like(self, jwt, post_id=None):
+        return self.client.post(
+            reverse(
+                "api-1.0.0:create_post_like",
+                kwargs={"post_id": post_id or self.test_post.id},
+            ),
+            HTTP_AUTHORIZATION=f"Bearer {jwt}",
+        )
+
+    def get_post(self, jwt):
+        return self.client.get(
+            reverse("api-1.0.0:get_post", kwargs={"post_id": self.test_post.id}),
+            HTTP_AUTHORIZATION=f"Bearer {jwt}",
+        ).json()
+
+    def admin_like_exists(self):
+        return PostLike.objects.filter(
+            post=self.test_post, like_user=self.test_admin
+        ).exists()
+
+    def test_toggles_are_coalesced_until_flush(self):
+        for is_liked in [True, False, True]:
+            response = self.toggle_like(self.admin_jwt)
+            self.assertEqual(response.json()["is_liked"], is_liked)
+        self.assertEqual(response.json()["post_likes_count"], 2)
+        self.assertFalse(self.admin_like_exists())
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.test_post.refresh_from_db()
+        self.assertTrue(self.admin_like_exists())
+        self.assertEqual(self.test_post.likes_count, 2)
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_toggle_back_to_stored_state_is_dropped(self):
+        self.toggle_like(self.admin_jwt)
+        self.toggle_like(self.admin_jwt)
+
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertFalse(self.admin_like_exists())
+
+    def test_feeds_merge_pending_likes_count(self):
+        def get_items(name):
+            return self.client.get(
+                reverse(f"api-1.0.0:{name}"),
+                HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+            ).json()
+
+        # 캐시된 목록 페이지에도 아직 반영 안 된 좋아요 수를 더함
+        get_items("get_posts")
+        get_items("get_posts_feed")
+        self.toggle_like(self.admin_jwt)
+        for items in [get_items("get_posts"), get_items("get_posts_feed")["items"]]:
+            self.assertEqual(
+                (items[0]["is_liked"], items[0]["post_likes_count"]), (True, 2)
+            )
+
+        self.buffer.flush()
+        self.toggle_like(self.admin_jwt)
+        items = get_items("get_posts_feed")["items"]
+        self.assertEqual(
+            (items[0]["is_liked"], items[0]["post_likes_count"]), (False, 1)
+        )
+
+    def test_reads_merge_pending_toggles(self):
+        self.toggle_like(self.admin_jwt)
+        self.toggle_like(self.user_jwt)
+
+        admin_post = self.get_post(self.admin_jwt)
+        self.assertEqual(
+            (admin_post["is_liked"], admin_post["post_likes_count"]), (True, 1)
+        )
+        self.assertEqual(self.get_post(self.user_jwt)["is_liked"], False)
+        response = self.client.get(
+            reverse("api-1.0.0:get_posts"),
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertEqual(response.json()[0]["is_liked"], True)
+
+        self.buffer.flush()
+        self.test_post.refresh_from_db()
+        self.assertEqual(self.test_post.likes_count, 1)
+        self.assertEqual(
+            list(PostLike.objects.values_list("like_user_id", flat=True)),
+            [self.test_admin.id],
+        )
+
+    def test_flush_when_buffer_is_full(self):
+        self.buffer.max_pending = 1
+        self.toggle_like(self.admin_jwt)
+        self.assertTrue(self.admin_like_exists())
+
+    def test_flush_skips_deleted_posts(self):
+        self.toggle_like(self.admin_jwt)
+        self.assertEqual(self.toggle_like(self.admin_jwt, 12345).status_code, 404)
+        Post.objects.filter(id=self.test_post.id).update(is_deleted=True)
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertFalse(self.admin_like_exists())
+
+    def test_failed_flush_keeps_pending_toggles(self):
+        self.toggle_like(self.admin_jwt)
+
+        with patch("posts.like_buffer.apply_pending_likes", side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                self.buffer.flush()
+        self.assertEqual(self.get_post(self.admin_jwt)["is_liked"], True)
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertTrue(self.admin_like_exists())
+
+
+class PostFeedCacheTest(PostTest):
+    def get_posts(self, jwt):
+        response = self.client.get(
+            reverse("api-1.0.0:get_posts"), HTTP_AUTHORIZATION=f"Bearer {jwt}"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cached_feed_overlays_is_liked_per_user(self):
+        user_posts = self.get_posts(self.user_jwt)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_posts(self.user_jwt), user_posts)
+        admin_posts = self.get_posts(self.admin_jwt)
+
+        self.assertEqual(user_posts[0]["is_liked"], True)
+        self.assertEqual(admin_posts[0]["is_liked"], False)
+        self.assertEqual(
+            {**admin_posts[0], "is_liked": True},
+            user_posts[0],
+        )
+
+    def test_like_toggle_invalidates_cached_feed(self):
+        self.get_posts(self.user_jwt)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(
+                    "api-1.0.0:create_post_like", kwargs={"post_id": self.test_post.id}
+                ),
+                HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+            )
+        posts = self.get_posts(self.admin_jwt)
+        self.assertEqual(posts[0]["post_likes_count"], 2)
+        self.assertEqual(posts[0]["is_liked"], True)
+
+    def test_like_toggle_keeps_likes_sort_pages(self):
+        other_post = Post.objects.create(user=self.test_admin, subject="other")
+        # 무효화 순번이 처음 생길 때는 모든 페이지를 무효화하므로 미리 만들어둠
+        post_feed_cache.invalidate_post(other_post.id)
+        _, token = post_feed_cache.get_page("likes", "test", 1)
+        post_feed_cache.set_page(token, "test", 1, [self.test_post])
+
+        # 페이지에 없는 글의 좋아요로는 좋아요순 페이지를 무효화하지 않음
+        for post_id in [other_post.id, self.test_post.id]:
+            self.assertIsNotNone(post_feed_cache.get_page("likes", "test", 1)[0])
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(
+                    reverse("api-1.0.0:create_post_like", kwargs={"post_id": post_id}),
+                    HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+                )
+        self.assertIsNone(post_feed_cache.get_page("likes", "test", 1)[0])
+
+    def test_user_changes_invalidate_cached_feed_only_for_shown_fields(self):
+        def modify_user(data):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.patch(
+                    reverse(
+                        "api-1.0.0:modify_user_info",
+                        kwargs={"user_id": self.test_user_1.id},
+                    ),
+                    data=encode_multipart(data=data, boundary=BOUNDARY),
+                    content_type=MULTIPART_CONTENT,
+                    HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+                )
+            return post_feed_cache.get_page("-created_at", "offset:0", 9)[0]
+
+        self.get_posts(self.user_jwt)
+        self.assertIsNotNone(modify_user({"mbti": "INFP"}))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse(
+                    "api-1.0.0:deactivate_user", kwargs={"user_id": self.test_admin.id}
+                ),
+                HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+            )
+        self.assertIsNotNone(post_feed_cache.get_page("-created_at", "offset:0", 9)[0])
+
+        self.assertIsNone(modify_user({"nickname": "새닉네임"}))
+        self.assertEqual(self.get_posts(self.user_jwt)[0]["user_nickname"], "새닉네임")
+
+    def test_post_changes_invalidate_cached_feed(self):
+        self.get_posts(self.user_jwt)
+
+        # 커밋 전에는 무효화하지 않음
+        with self.captureOnCommitCallbacks() as callbacks:
+            new_post = Post.objects.create(user=self.test_user_1, subject="new post")
+        self.assertEqual(
+            [post["id"] for post in self.get_posts(self.user_jwt)], [self.test_post.id]
+        )
+        for callback in callbacks:
+            callback()
+        self.assertEqual(
+            [post["id"] for post in self.get_posts(self.user_jwt)],
+            [new_post.id, self.test_post.id],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("api-1.0.0:modify_post", kwargs={"post_id": self.test_post.id}),
+                data=encode_multipart(
+                    data={"subject": "modified", "content": "modified"},
+                    boundary=BOUNDARY,
+                ),
+                content_type=MULTIPART_CONTENT,
+                HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+            )
+        self.assertEqual(self.get_posts(self.user_jwt)[1]["subject"], "modified")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("api-1.0.0:delete_post", kwargs={"post_id": new_post.id}),
+                HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+            )
+        self.assertEqual(
+            [post["id"] for post in self.get_posts(self.user_jwt)], [self.test_post.id]
+        )
+
+    def test_invalidation_during_page_build_is_not_lost(self):
+        posts = list(Post.objects.filter(is_deleted=False))
+
+        # 페이지를 만드는 중(DB 조회 후 저장 전)에 게시글이 바뀜
+        _, token = post_feed_cache.get_page("-created_at", "test", 9)
+        post_feed_cache.invalidate_post(self.test_post.id)
+        post_feed_cache.set_page(token, "test", 9, posts)
+        self.assertIsNone(post_feed_cache.get_page("-created_at", "test", 9)[0])
+
+        # 목록 구성이 바뀜
+        _, token = post_feed_cache.get_page("-created_at", "test", 9)
+        post_feed_cache.invalidate_feed()
+        post_feed_cache.set_page(token, "test", 9, posts)
+        self.assertIsNone(post_feed_cache.get_page("-created_at", "test", 9)[0])
+
+        _, token = post_feed_cache.get_page("-created_at", "test", 9)
+        post_feed_cache.set_page(token, "test", 9, posts)
+        self.assertIsNotNone(post_feed_cache.get_page("-created_at", "test", 9)[0])
+
+    def test_cursor_feed_is_cached(self):
+        first_response = self.client.get(
+            reverse("api-1.0.0:get_posts_feed"),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        with self.assertNumQueries(1):
+            cached_response = self.client.get(
+                reverse("api-1.0.0:get_posts_feed"),
+                HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+            )
+        self.assertEqual(cached_response.json(), first_response.json())
+        self.assertEqual(cached_response.json()["items"][0]["is_liked"], True)
+
+
+class GetPostsFeedTest(PostTest):
+    def get_feed(self, **params):
+        return self.client.get(
+            reverse("api-1.0.0:get_posts_feed"),
+            params,
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+
+    def get_all_pages(self, **params):
+        post_ids, cursor = [], None
+        while True:
+            if cursor:
+                params["cursor"] = cursor
+            response = self.get_feed(**params)
+            self.assertEqual(response.status_code, 200)
+            post_ids += [item["id"] for item in response.json()["items"]]
+            cursor = response.json()["next_cursor"]
+            if cursor is None:
+                return post_ids
+
+    def test_success_get_posts_feed(self):
+        posts = [
+            Post.objects.create(user=self.test_user_1, subject=f"feed {index}")
+            for index in range(4)
+        ]
+        # created_at이 같은 글도 id로 순서가 정해져야 함
+        Post.objects.filter(id__in=[post.id for post in posts]).update(
+            created_at=self.test_post.created_at
+        )
+        expected_ids = list(
+            Post.objects.filter(is_deleted=False)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+
+        response = self.get_feed(limit=2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["items"]), 2)
+        self.assertEqual(
+            response.json()["items"][0]["post_likes_count"],
+            Post.objects.get(id=expected_ids[0]).likes_count,
+        )
+        self.assertEqual(self.get_all_pages(limit=2), expected_ids)
+
+    def test_success_get_posts_feed_new_post_while_scrolling(self):
+        for index in range(3):
+            Post.objects.create(user=self.test_user_1, subject=f"feed {index}")
+        expected_ids = list(
+            Post.objects.filter(is_deleted=False)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+
+        first_page = self.get_feed(limit=2).json()
+        Post.objects.create(user=self.test_user_1, subject="new post")
+        second_page = self.get_feed(limit=2, cursor=first_page["next_cursor"]).json()
+        self.assertEqual(
+            [item["id"] for item in first_page["items"] + second_page["items"]],
+            expected_ids,
+        )
+        self.assertEqual(second_page["next_cursor"], None)
+
+    def test_success_get_posts_feed_sort_by_likes(self):
+        popular_post = Post.objects.create(user=self.test_user_1, subject="popular")
+        PostLike.objects.create(like_user=self.test_user_1, post=popular_post)
+        PostLike.objects.create(like_user=self.test_admin, post=popular_post)
+        Post.objects.create(user=self.test_user_1, subject="no likes")
+        expected_ids = list(
+            Post.objects.filter(is_deleted=False)
+            .order_by("-likes_count", "-id")
+            .values_list("id", flat=True)
+        )
+
+        self.assertEqual(expected_ids[0], popular_post.id)
+        self.assertEqual(self.get_all_pages(limit=1, sort="likes"), expected_ids)
+
+    def test_fail_400_get_posts_feed(self):
+        invalid_cursor_response = self.get_feed(cursor="invalid")
+        self.assertEqual(invalid_cursor_response.status_code, 400)
+        self.assertEqual(invalid_cursor_response.json(), {"detail": "invalid cursor"})
+
+        # created_at 자리에 문자열이 아닌 값을 넣어서 조작한 커서
+        tampered_cursor_response = self.get_feed(cursor=encode_cursor([123, 5]))
+        self.assertEqual(tampered_cursor_response.status_code, 400)
+        self.assertEqual(tampered_cursor_response.json(), {"detail": "invalid cursor"})
+
+        invalid_sort_response = self.get_feed(sort="subject")
+        self.assertEqual(invalid_sort_response.status_code, 400)
+        self.assertEqual(invalid_sort_response.json(), {"detail": "invalid sort type"})
+
+    def test_fail_401_get_posts_feed(self):
+        response = self.client.get(reverse("api-1.0.0:get_posts_feed"))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"detail": "Unauthorized"})
+
+
 class CreatePostTest(PostTest):
     def test_success_create_post_without_file(self):
         post_input = {"subject": "foo", "content": "bar"}
@@ -828,3 +1484,125 @@ class PostModelPropertyTest(PostTest):
             self.test_post.comments.filter(is_deleted=False).order_by("created_at"),
             transform=lambda x: x,
         )
+
+
+class PostCountersTest(PostTest):
+    def assertCounters(self, post, likes, comments, reports):
+        post.refresh_from_db()
+        self.assertEqual(
+            (post.likes_count, post.comments_count, post.reports_count),
+            (likes, comments, reports),
+        )
+
+    def test_counters_follow_likes_comments_reports(self):
+        self.assertCounters(self.test_post, likes=1, comments=1, reports=1)
+
+        self.client.post(
+            reverse(
+                "api-1.0.0:create_post_like", kwargs={"post_id": self.test_post.id}
+            ),
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertCounters(self.test_post, likes=2, comments=1, reports=1)
+        self.client.post(
+            reverse(
+                "api-1.0.0:create_post_like", kwargs={"post_id": self.test_post.id}
+            ),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertCounters(self.test_post, likes=1, comments=1, reports=1)
+
+        self.client.post(
+            reverse("api-1.0.0:report_post", kwargs={"post_id": self.test_post.id}),
+            data={"content": "test report"},
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertCounters(self.test_post, likes=1, comments=1, reports=2)
+
+        response = self.client.post(
+            reverse("api-1.0.0:create_comment", kwargs={"post_id": self.test_post.id}),
+            data={"content": "new comment"},
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertCounters(self.test_post, likes=1, comments=2, reports=2)
+
+        self.client.delete(
+            reverse(
+                "api-1.0.0:delete_comment",
+                kwargs={
+                    "post_id": self.test_post.id,
+                    "comment_id": response.json()["id"],
+                },
+            ),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertCounters(self.test_post, likes=1, comments=1, reports=2)
+
+        self.client.post(
+            reverse("api-1.0.0:delete_post", kwargs={"post_id": self.test_post.id}),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertCounters(self.test_post, likes=1, comments=0, reports=2)
+
+    @patch("cores.utils.file_handler")
+    def test_delete_post_from_db_does_not_update_deleted_post(self, mock_patch):
+        Comment.objects.bulk_create(
+            Comment(user=self.test_admin, post=self.test_post, content=f"{index}")
+            for index in range(30)
+        )
+        PostLike.objects.create(like_user=self.test_admin, post=self.test_post)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.delete(
+                reverse(
+                    "api-1.0.0:delete_post_from_db",
+                    kwargs={"post_id": self.test_post.id},
+                ),
+                HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+            )
+        self.assertEqual(response.status_code, 200)
+        # 함께 지워지는 좋아요/댓글/신고마다 지워질 글을 수정하지 않음
+        self.assertFalse(
+            [
+                query["sql"]
+                for query in context.captured_queries
+                if query["sql"].startswith('UPDATE "post"')
+            ]
+        )
+        self.test_user_1.refresh_from_db()
+        self.assertEqual(self.test_user_1.reported_count, 0)
+
+    def test_delete_user_decreases_counters_of_remaining_posts(self):
+        admin_post = Post.objects.create(user=self.test_admin, subject="admin")
+        Comment.objects.create(user=self.test_admin, post=self.test_post, content="1")
+        PostLike.objects.create(like_user=self.test_admin, post=self.test_post)
+        PostLike.objects.create(like_user=self.test_user_1, post=admin_post)
+        self.assertCounters(self.test_post, likes=2, comments=2, reports=1)
+
+        self.test_admin.delete()
+        self.assertCounters(self.test_post, likes=1, comments=1, reports=0)
+
+    def test_rebuild_post_counters(self):
+        Post.objects.filter(id=self.test_post.id).update(
+            likes_count=10, comments_count=10, reports_count=10
+        )
+        call_command("rebuild_post_counters", stdout=StringIO())
+        self.assertCounters(self.test_post, likes=1, comments=1, reports=1)
+
+    def test_get_posts_query_count_does_not_grow_with_posts(self):
+        def count_feed_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(
+                    reverse("api-1.0.0:get_posts"),
+                    HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+                )
+            self.assertEqual(response.status_code, 200)
+            return len(context.captured_queries)
+
+        count_feed_queries()
+        one_post_queries = count_feed_queries()
+        for index in range(8):
+            post = Post.objects.create(user=self.test_user_1, subject=f"{index}")
+            PostLike.objects.create(like_user=self.test_admin, post=post)
+        self.assertEqual(count_feed_queries(), one_post_queries)
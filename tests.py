@@ -222,6 +222,17 @@ class TestCookie(UserTest):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), results)
 
+    def test_fail_401_cookie_auth_test_without_cookie(self):
+        response = Client().get(reverse("api-1.0.0:cookie_auth_test"))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"detail": "Unauthorized"})
+
+    def test_fail_400_cookie_auth_test_with_invalid_cookie(self):
+        self.test_cookie_client.cookies["access_token"] = "qwerasdfzxcv"
+        response = self.test_cookie_client.get(reverse("api-1.0.0:cookie_auth_test"))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "invalid token"})
+
     def test_fail_405_cookie_auth_test(self):
         self.test_cookie_client.cookies = self.test_cookie_user_login_response.cookies
         response = self.client.post(reverse("api-1.0.0:cookie_auth_test"))
@@ -3,9 +3,22 @@ import os
 import socketio
 from django.core.asgi import get_asgi_application
 
-# from chat.socketio import sio_async
-
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "togedog_dj.settings")
 
 django_app = get_asgi_application()
-# application = socketio.ASGIApp(sio_async, django_app)
+
+# Django 설정이 끝난 뒤에 채팅 서버를 import
+from chat.mongodb import chat_message_buffer, start_ensure_indexes  # noqa: E402
+from chat.socketio import sio  # noqa: E402
+
+# /socket.io/ 요청은 채팅 서버(socketio.AsyncServer)가, 나머지는 Django가 처리
+# 서버가 시작할 때(lifespan startup) 채팅 메시지 인덱스 생성을 백그라운드로 시작하고
+# (MongoDB에 연결할 수 없어도 서버는 뜨고 인덱스는 연결될 때까지 다시 시도),
+# 정상 종료될 때(lifespan shutdown) 버퍼에 남은 채팅 메시지를 저장
+# 실행 예: uvicorn togedog_dj.asgi:application --host 0.0.0.0 --port 8000
+application = socketio.ASGIApp(
+    sio,
+    django_app,
+    on_startup=start_ensure_indexes,
+    on_shutdown=chat_message_buffer.close,
+)
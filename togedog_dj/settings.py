@@ -43,6 +43,33 @@ PASSWORD_SALT = PASSWORD_SALT
 PASSWORD_HASHERS = PASSWORD_HASHERS
 ALGORITHM = ALGORITHM
 
+# JWT 인증 시 사용자/토큰 캐시 설정(TTL 단위: 초)
+# 여러 워커가 사용자 캐시를 공유하려면 AUTH_USER_CACHE_BACKEND를
+# "users.cache.DjangoCacheUserBackend"로 바꾸고 CACHES에 Redis를 설정
+AUTH_USER_CACHE_BACKEND = "users.cache.LocalUserBackend"
+AUTH_USER_CACHE_OPTIONS = {}
+AUTH_USER_CACHE_SIZE = 10000
+AUTH_USER_CACHE_TTL = 30
+AUTH_TOKEN_CACHE_SIZE = 10000
+AUTH_TOKEN_CACHE_TTL = 60 * 60
+
+# 관리자 목록 페이지네이션 전체 개수 캐시 시간(초)
+PAGINATION_COUNT_CACHE_TTL = 30
+# 조건 없는 목록의 행 수가 이 값 이상이면 PostgreSQL 통계 추정치를 전체 개수로 사용
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 100000
+
+# 게시글 목록 응답 캐시(posts.cache.PostFeedCache), TTL 단위: 초
+# 여러 워커가 무효화를 공유하려면 CACHES에 Redis를 설정
+# (예: {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://127.0.0.1:6379"}})
+POST_FEED_CACHE_ALIAS = "default"
+POST_FEED_CACHE_TTL = 60
+# 게시글 좋아요 write-behind(posts.like_buffer.PostLikeBuffer) 사용 여부
+# 켜면 좋아요 토글을 프로세스 메모리에 모아두고 POST_LIKE_FLUSH_INTERVAL_MS마다 한 번에 DB에 반영
+# 모아둔 토글이 POST_LIKE_BUFFER_MAX_PENDING개를 넘으면 요청 처리 중에 바로 반영
+POST_LIKE_WRITE_BEHIND = False
+POST_LIKE_FLUSH_INTERVAL_MS = 200
+POST_LIKE_BUFFER_MAX_PENDING = 5000
+
 APPEND_SLASH = False
 
 # for Django debug toolbar and Django Ninja
@@ -181,17 +208,48 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 BAD_WORDS_LIST = BAD_WORDS_LIST
+# 욕설 목록(bad_word 테이블) 변경 여부를 확인하는 주기(초)
+BAD_WORDS_RELOAD_INTERVAL = 30
 
 # AWS S3
 AWS_ACCESS_KEY_ID = AWS_ACCESS_KEY_ID
 AWS_SECRET_ACCESS_KEY = AWS_SECRET_ACCESS_KEY
 AWS_S3_REGION_NAME = AWS_S3_REGION_NAME
 AWS_S3_ENDPOINT_URL = AWS_S3_ENDPOINT_URL
+# S3 클라이언트 설정(cores.utils.S3Service)
+# 연결 풀 크기: 동시 요청 수 x 업로드 1개당 동시 전송 수(S3_MAX_CONCURRENCY)보다 크게
+S3_MAX_POOL_CONNECTIONS = 32
+# 재시도 포함 최대 시도 횟수(standard 재시도 모드)
+S3_MAX_ATTEMPTS = 3
+S3_CONNECT_TIMEOUT = 3
+S3_READ_TIMEOUT = 10
+# 업로드 최대 50MB 기준, 16MB 이상이면 8MB씩 나눠서 최대 4개 동시 전송(multipart)
+S3_MULTIPART_THRESHOLD = 16 * 1024 * 1024
+S3_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+S3_MAX_CONCURRENCY = 4
 
 POST_IMAGES_URL = POST_IMAGES_URL
 PROFILE_IMAGES_URL = PROFILE_IMAGES_URL
 DEFAULT_USER_THUMBNAIL_URL = DEFAULT_USER_THUMBNAIL_URL
 DEFAULT_POST_IMAGE_URL = DEFAULT_POST_IMAGE_URL
+# S3 이미지 삭제 대기열(S3DeleteTask) 처리 설정
+# delete_objects 한 번에 삭제할 개수(S3 최대 1000개)
+S3_DELETE_BATCH_SIZE = 1000
+# 실패 시 재시도 대기 시간(초), 실패할 때마다 2배씩 늘어남
+S3_DELETE_RETRY_DELAY = 30
+S3_DELETE_MAX_ATTEMPTS = 8
+# 워커가 가져간 작업을 다른 워커가 가져가지 않는 시간(초), 워커가 죽으면 이 시간 뒤에 다시 처리됨
+S3_DELETE_LEASE_SECONDS = 300
+# S3 직접 업로드(presigned POST) 양식 유효 시간(초)
+IMAGE_UPLOAD_EXPIRES = 600
+# 완료되지 않은 업로드 세션을 만료 후 이 시간(초)이 지나면 정리
+IMAGE_UPLOAD_CLEANUP_DELAY = 3600
+# 줄인 WebP 사진 생성(generate_image_variants) 설정
+# 변환에 쓰는 프로세스 수, 한 번에 가져오는 작업 수(원본을 메모리에 올리므로 작게 유지)
+IMAGE_VARIANT_WORKERS = 2
+IMAGE_VARIANT_BATCH_SIZE = 8
+IMAGE_VARIANT_RETRY_DELAY = 60
+IMAGE_VARIANT_MAX_ATTEMPTS = 3
 
 # Social Login
 KAKAO_REDIRECT_URI = KAKAO_REDIRECT_URI
@@ -208,3 +266,12 @@ GOOGLE_PROFILE_URI = GOOGLE_PROFILE_URI
 
 # MongoDB
 MONGODB_ADDRESS = MONGODB_ADDRESS
+# 채팅 메시지는 모아서 CHAT_MESSAGE_BATCH_SIZE개가 되거나 CHAT_MESSAGE_FLUSH_INTERVAL_MS가 지나면 한 번에 저장
+# 저장 안 된 메시지가 CHAT_MESSAGE_BUFFER_MAX_PENDING개를 넘으면 메시지 전송이 저장될 때까지 기다림
+CHAT_MESSAGE_BATCH_SIZE = 200
+CHAT_MESSAGE_FLUSH_INTERVAL_MS = 100
+CHAT_MESSAGE_BUFFER_MAX_PENDING = 5000
+# 채팅 서버 프로세스 여러 개가 방을 공유할 메시지 큐(redis://, amqp://, memory://), 빈 값이면 프로세스 하나
+# 메시지 큐를 쓰면 채팅 연결 인증의 사용자 캐시도 공유해야 하므로 CACHES에 Redis를 설정
+CHAT_MESSAGE_QUEUE_URL = ""
+CHAT_MESSAGE_QUEUE_CHANNEL = "togedog-chat"
@@ -1,10 +1,9 @@
-import socketio
+import os
+
 from django.core.wsgi import get_wsgi_application
 
-from chat.socketio import sio
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "togedog_dj.settings")
 
 # django wsgi app
+# 채팅(socket.io)은 asyncio 서버라서 ASGI 앱(togedog_dj.asgi)으로만 서비스함
 application = get_wsgi_application()
-
-# wrap with socketio's middleware
-application = socketio.WSGIApp(sio, application)
@@ -2,23 +2,26 @@ from typing import List
 
 from django.conf import settings
 from django.contrib.auth.hashers import check_password, make_password
-from django.db.models import Count
+from django.db import transaction
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from ninja import Form, Query
 from ninja.files import UploadedFile
-from ninja.pagination import PageNumberPagination, paginate
+from ninja.pagination import paginate
 
 from cores.models import UserAccountType, UserStatus
+from cores.pagination import CursorPagination
 from cores.schemas import MessageOut, UserListFilters
 from cores.utils import (SocialLoginUserProfile, URLBugFixedRouter,
                          create_user_login_response, delete_existing_image,
-                         handle_upload_file, validate_upload_file)
-from users.auth import AuthBearer, has_authority, is_admin
+                         enqueue_image_variants, handle_upload_file,
+                         validate_upload_file)
+from users.auth import (AuthBearer, has_authority, is_admin,
+                        jwt_authenticator)
 from users.models import NAME_AND_NICKNAME_MAX_LENGTH, User
-from users.schemas import (EmailSignupCheckIn, EmailUserSigninIn,
-                           EmailUserSignupIn, ModifyUserIn, TestKakaoToken,
-                           UserDetailOut, UserListOut)
+from users.schemas import (AuthCacheStatsOut, EmailSignupCheckIn,
+                           EmailUserSigninIn, EmailUserSignupIn, ModifyUserIn,
+                           TestKakaoToken, UserDetailOut, UserListOut)
 
 
 router = URLBugFixedRouter(tags=["사용자 관련 API"])
@@ -27,7 +30,7 @@ router = URLBugFixedRouter(tags=["사용자 관련 API"])
 @router.get(
     "", response=List[UserListOut], auth=[AuthBearer()], summary="관리자페이지 사용자 목록 조회"
 )
-@paginate(PageNumberPagination, page_size=10)
+@paginate(CursorPagination, page_size=10)
 def get_user_list(request, query: UserListFilters = Query(...)):
     """
     사용자 목록 조회
@@ -36,23 +39,16 @@ def get_user_list(request, query: UserListFilters = Query(...)):
         - search: 사용자 닉네임 검색
         - reported: 정수를 넣으면 그 값 이상 신고받은 사용자 검색
         - date: "2022-01-01~2022-12-31" 형식으로 넣으면 사용자 가입일의 범위로 검색
-        - page: 1부터 시작하는 페이지네이션 번호
+        - cursor: 다음 페이지를 볼 때 이전 응답의 next_cursor 값 입력
     - 리스폰스
         - items: 사용자 상세정보 목록(배열), 10개씩 페이지네이션 됨
         - 기본값으로 가입일 최신 순으로 정렬됨
-        - count: 결과로 나온 사용자 정보의 전체 개수
+        - count: 결과로 나온 사용자 정보의 전체 개수(캐시 또는 추정치라 정확하지 않을 수 있음)
+        - next_cursor: 다음 페이지 커서, 마지막 페이지면 null
     """
     is_admin(request)
-    user_filters = query.dict(exclude_none=True)
 
-    return (
-        User.objects.annotate(
-            reported_count=Count("post_reported", distinct=True)
-            + Count("comment_reported", distinct=True)
-        )
-        .filter(**user_filters)
-        .order_by("-created_at")
-    )
+    return query.filter_queryset(User.objects.all())
 
 
 @router.get("/logout", summary="로그아웃")
@@ -142,18 +138,27 @@ def modify_user_info(
     user = get_object_or_404(User, id=user_id)
     body_dict = body.dict()
     res = {}
+    # 바뀐 필드만 저장해서 목록 캐시 등 시그널이 필요할 때만 동작하게 함
+    update_fields = ["updated_at"]
 
     if validate_upload_file(file):
-        delete_existing_image(user.thumbnail_url, "user_thumbnail")
-        user.thumbnail_url = handle_upload_file(file, "user_thumbnail")
-        res["user_thumbnail_url"] = user.thumbnail_url
+        res["user_thumbnail_url"] = handle_upload_file(file, "user_thumbnail")
 
     for attr, value in body_dict.items():
         if value and hasattr(user, attr):
+            if getattr(user, attr) != value:
+                update_fields.append(attr)
             setattr(user, attr, value)
             res[f"{attr}_input"] = value
 
-    user.save()
+    # 새 사진 업로드가 끝난 뒤 기존 사진 삭제 요청과 사용자 정보 저장을 함께 커밋
+    with transaction.atomic():
+        if "user_thumbnail_url" in res:
+            delete_existing_image(user.thumbnail_url, "user_thumbnail")
+            enqueue_image_variants(res["user_thumbnail_url"], "user_thumbnail")
+            user.thumbnail_url = res["user_thumbnail_url"]
+            update_fields.append("thumbnail_url")
+        user.save(update_fields=update_fields)
     return JsonResponse(res, status=200)
 
 
@@ -185,7 +190,7 @@ def deactivate_user(request, user_id: int):
     is_admin(request)
     user = get_object_or_404(User, id=user_id)
     user.status = UserStatus.BANNED.value
-    user.save()
+    user.save(update_fields=["status", "updated_at"])
 
     return 200, {"message": "success"}
 
@@ -203,6 +208,23 @@ def main_login_check(request):
     return 200, request.auth
 
 
+@router.get(
+    "/auth/cache-stats",
+    response={200: AuthCacheStatsOut},
+    auth=AuthBearer(),
+    summary="인증 캐시 적중/실패 횟수 조회",
+)
+def get_auth_cache_stats(request):
+    """
+    요청을 처리한 서버 프로세스의 인증 캐시 적중/실패 횟수 조회, 관리자만 가능
+    - request_hit: 같은 요청 안에서 다시 인증해서 기억해둔 사용자를 쓴 횟수
+    - token_hit/token_miss: 검증된 JWT 캐시 적중/실패 횟수
+    - user_hit/user_miss: 사용자 캐시 적중/실패(DB 조회) 횟수
+    """
+    is_admin(request)
+    return 200, jwt_authenticator.stats()
+
+
 @router.post(
     "/login/email",
     response={200: MessageOut, 400: MessageOut, 404: MessageOut},
@@ -230,22 +252,14 @@ def email_user_login(request, body: EmailUserSigninIn):
     auth=AuthBearer(),
     summary="차단 계정 목록 조회",
 )
-@paginate(PageNumberPagination, page_size=10)
+@paginate(CursorPagination, page_size=10)
 def get_banned_user_list(request, query: UserListFilters = Query(...)):
     """
     차단 계정 목록 조회
     """
     is_admin(request)
-    user_filters = query.dict(exclude_none=True)
 
-    return (
-        User.objects.annotate(
-            reported_count=Count("post_reported", distinct=True)
-            + Count("comment_reported", distinct=True)
-        )
-        .filter(status=UserStatus.BANNED.value, **user_filters)
-        .order_by("-created_at")
-    )
+    return query.filter_queryset(User.objects.filter(status=UserStatus.BANNED.value))
 
 
 @router.post("/test/kakaotoken/", summary="카카오 소셜 로그인")
@@ -1,9 +1,15 @@
+import copy
+import threading
+import time
+from collections import Counter
+
 import jwt
 from django.conf import settings
 from ninja.errors import HttpError
 from ninja.security import APIKeyCookie, HttpBearer
 
 from cores.models import UserStatus
+from users.cache import chat_user_backend, token_cache, user_backend
 from users.models import User
 
 
@@ -37,24 +43,127 @@ def is_admin(request):
         raise HttpError(403, "forbidden")
 
 
-class AuthBearer(HttpBearer):
-    def authenticate(self, request, token):
+class JWTAuthenticator:
+    """
+    AuthBearer, CookieKey, auth_cookie가 함께 쓰는 JWT 인증 엔진
+    - 토큰 검증 결과는 프로세스별 token_cache에, 사용자 정보는 user_backend에 캐시
+    - 같은 요청 안에서 여러 번 인증하면 request에 기억해둔 사용자를 그대로 사용
+    - 캐시 적중/실패 횟수를 stats()로 확인 가능
+    """
+
+    request_memo_attr = "_jwt_auth_memo"
+    user_load_lock_count = 64
+
+    def __init__(self, user_backend):
+        self.user_backend = user_backend
+        self._stats = Counter()
+        self._stats_lock = threading.Lock()
+        # 같은 사용자를 동시에 조회하면 한 스레드만 DB에서 읽음(사용자 id별로 나눈 잠금)
+        self._user_load_locks = [
+            threading.Lock() for _ in range(self.user_load_lock_count)
+        ]
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                name: self._stats[name]
+                for name in (
+                    "request_hit",
+                    "token_hit",
+                    "token_miss",
+                    "user_hit",
+                    "user_miss",
+                )
+            }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats.clear()
+
+    def authenticate(self, request, token: str) -> User:
+        memo = getattr(request, self.request_memo_attr, None)
+        if memo is not None and memo[0] == token:
+            self._count("request_hit")
+            return memo[1]
+
+        user = self.get_user(self.get_user_id(token))
+        setattr(request, self.request_memo_attr, (token, user))
+        return user
+
+    def get_user_id(self, token: str) -> int:
+        """
+        JWT를 검증해서 user id를 반환
+        - 한 번 검증한 토큰은 토큰 만료시각까지(최대 AUTH_TOKEN_CACHE_TTL초) 다시 decode하지 않음
+        """
+        cached = token_cache.get(token)
+        if cached is not None:
+            user_id, exp = cached
+            if exp > time.time():
+                self._count("token_hit")
+                return user_id
+            token_cache.delete(token)
+            raise HttpError(401, "token expired")
+
+        self._count("token_miss")
         try:
             payload = jwt.decode(
                 token, settings.SECRET_KEY, algorithms=settings.ALGORITHM
             )
-            self.user = User.objects.get(id=payload["user"])
-
-        except User.DoesNotExist as e:
-            raise HttpError(400, "user does not exist") from e
+            user_id = payload["user"]
 
         except jwt.ExpiredSignatureError as e:
             raise HttpError(401, "token expired") from e
 
-        except jwt.DecodeError as e:
+        except (jwt.DecodeError, KeyError) as e:
             raise HttpError(400, "invalid token") from e
 
-        return self.user
+        exp = payload.get("exp")
+        if exp is not None:
+            token_cache.set(token, (user_id, exp), ttl=exp - time.time())
+        return user_id
+
+    def get_user(self, user_id: int) -> User:
+        """
+        user id로 사용자 조회, 조회 결과는 user_backend에 AUTH_USER_CACHE_TTL초 동안 캐시
+        - 사용자 정보가 수정/삭제되면 users.signals에서 캐시를 지움
+        - 여러 요청이 같은 객체를 공유하지 않도록 복사본을 반환
+        - 캐시에 없는 사용자를 여러 스레드가 동시에 조회하면(재접속 폭주 등) DB 조회는 한 번만 함
+        """
+        user = self.user_backend.get(user_id)
+        if user is None:
+            with self._user_load_locks[hash(user_id) % self.user_load_lock_count]:
+                user = self.user_backend.get(user_id)
+                if user is None:
+                    self._count("user_miss")
+                    try:
+                        user = User.objects.get(id=user_id)
+                    except User.DoesNotExist as e:
+                        raise HttpError(400, "user does not exist") from e
+                    self.user_backend.set(user_id, user)
+                    return copy.copy(user)
+
+        self._count("user_hit")
+        return copy.copy(user)
+
+    def authenticate_token(self, token: str) -> User:
+        """
+        request 없이 JWT만으로 인증(채팅 서버 socket.io 연결 등)
+        """
+        return self.get_user(self.get_user_id(token))
+
+
+jwt_authenticator = JWTAuthenticator(user_backend)
+# 채팅 서버(chat.socketio) 연결 인증용, 프로세스 사이에 공유되는 사용자 캐시 사용
+chat_jwt_authenticator = JWTAuthenticator(chat_user_backend)
+
+
+class AuthBearer(HttpBearer):
+    def authenticate(self, request, token):
+        return jwt_authenticator.authenticate(request, token)
 
 
 class CheckAuthUserAdmin(AuthBearer):
@@ -69,29 +178,17 @@ class CookieKey(APIKeyCookie):
     param_name: str = "access_token"
 
     def authenticate(self, request, key):
-        try:
-            payload = jwt.decode(
-                key, settings.SECRET_KEY, algorithms=settings.ALGORITHM
-            )
-            self.user = User.objects.get(id=payload["user"])
-
-        except User.DoesNotExist as e:
-            raise HttpError(400, "user does not exist") from e
-
-        except jwt.ExpiredSignatureError as e:
-            raise HttpError(401, "token expired") from e
-
-        except jwt.DecodeError as e:
-            raise HttpError(400, "invalid token") from e
-
-        return self.user
+        return jwt_authenticator.authenticate(request, key)
 
 
 cookie_key = CookieKey()
 
 
 def auth_cookie(request):
-    cookie_type = "access_token"
-    jwt_cookie = request.COOKIES.get(cookie_type)
-    payload = jwt.decode(jwt_cookie, settings.SECRET_KEY, algorithms=settings.ALGORITHM)
-    return User.objects.get(id=payload["user"])
+    """
+    access_token 쿠키로 인증, 쿠키가 없으면 None을 반환해서 401 에러
+    """
+    jwt_cookie = request.COOKIES.get("access_token")
+    if not jwt_cookie:
+        return None
+    return jwt_authenticator.authenticate(request, jwt_cookie)
@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.module_loading import import_string
+
+from users.models import User
+
+
+class LRUTTLCache:
+    """
+    프로세스 안에서만 쓰는 크기 제한(LRU) + 만료시간(TTL) 캐시
+    - maxsize를 넘으면 가장 오래 안 쓴 항목부터 버림
+    - ttl초가 지난 항목은 꺼낼 때 버림
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class LocalUserBackend:
+    """
+    프로세스 메모리(LRUTTLCache)에 User 객체를 저장하는 사용자 캐시 백엔드
+    - 가장 빠르지만 다른 프로세스의 캐시는 지울 수 없어서
+      다른 워커에서는 최대 AUTH_USER_CACHE_TTL초 동안 이전 정보가 보일 수 있음
+    """
+
+    # 여러 프로세스가 같은 캐시를 보는지 여부
+    is_shared = False
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = LRUTTLCache(maxsize, ttl)
+
+    def get(self, user_id: int) -> Optional[User]:
+        return self._cache.get(user_id)
+
+    def set(self, user_id: int, user: User):
+        self._cache.set(user_id, user)
+
+    def delete(self, user_id: int):
+        self._cache.delete(user_id)
+
+
+class DjangoCacheUserBackend:
+    """
+    Django 캐시(settings.CACHES)에 User 객체를 저장하는 사용자 캐시 백엔드
+    - CACHES에 Redis(django.core.cache.backends.redis.RedisCache)를 설정하면
+      모든 워커가 캐시를 공유하므로 차단/수정이 모든 프로세스에 바로 반영됨
+    - 로컬 개발/테스트에서는 locmem 캐시가 Redis 대신 쓰임
+    """
+
+    key_prefix = "auth:user:"
+
+    def __init__(self, maxsize: int, ttl: float, alias: str = "default"):
+        # 캐시 크기 제한은 Django 캐시 설정(MAX_ENTRIES 등)을 따름
+        self.ttl = ttl
+        self.alias = alias
+
+    @property
+    def _cache(self):
+        return caches[self.alias]
+
+    @property
+    def is_shared(self) -> bool:
+        return not isinstance(self._cache, LocMemCache)
+
+    def get(self, user_id: int) -> Optional[User]:
+        return self._cache.get(f"{self.key_prefix}{user_id}")
+
+    def set(self, user_id: int, user: User):
+        self._cache.set(f"{self.key_prefix}{user_id}", user, self.ttl)
+
+    def delete(self, user_id: int):
+        self._cache.delete(f"{self.key_prefix}{user_id}")
+
+
+def create_user_backend():
+    backend_class = import_string(settings.AUTH_USER_CACHE_BACKEND)
+    return backend_class(
+        maxsize=settings.AUTH_USER_CACHE_SIZE,
+        ttl=settings.AUTH_USER_CACHE_TTL,
+        **settings.AUTH_USER_CACHE_OPTIONS,
+    )
+
+
+# user id -> User 객체, settings.AUTH_USER_CACHE_BACKEND로 저장소 선택
+user_backend = create_user_backend()
+# 검증이 끝난 JWT 문자열 -> (user id, 토큰 만료시각 timestamp)
+token_cache = LRUTTLCache(settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_TOKEN_CACHE_TTL)
+
+
+def create_chat_user_backend():
+    """
+    채팅 서버 연결 인증에 쓰는 사용자 캐시 백엔드
+    - 채팅 서버 프로세스가 여러 개면 차단 등으로 지운 캐시가 모든 프로세스에 보여야 하므로
+      AUTH_USER_CACHE_BACKEND가 프로세스 메모리 캐시(LocalUserBackend)면 Django 캐시를 씀
+    """
+    if isinstance(user_backend, LocalUserBackend):
+        return DjangoCacheUserBackend(
+            maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL
+        )
+    return user_backend
+
+
+chat_user_backend = create_chat_user_backend()
+
+
+def invalidate_user(user_id: int):
+    user_backend.delete(user_id)
+    if chat_user_backend is not user_backend:
+        chat_user_backend.delete(user_id)
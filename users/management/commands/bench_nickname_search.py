@@ -0,0 +1,111 @@
+import hashlib
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from cores.models import UserAccountType
+from cores.search import search_by_nickname
+from users.models import User
+
+SEARCH_TERMS = ["a1", "b7e", "c0ff", "9d2a1", "zzzz"]
+
+SEED_USERS_SQL = """
+INSERT INTO "user" (
+    nickname, email, user_type, status, account_type, thumbnail_url,
+    address, mbti, reported_count, created_at, updated_at
+)
+SELECT
+    substr(md5(i::text), 1, 8),
+    'bench' || i || '@togedog.com',
+    'normal', 'active', %s, %s, '', 'none', 0,
+    now() - i * interval '1 second',
+    now()
+FROM generate_series(1, %s) AS i
+"""
+
+
+class RollbackBenchmark(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "관리자 페이지 닉네임 검색(search) 속도 측정, PostgreSQL에서는 pg_trgm 인덱스 사용 전후 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        # 벤치마크용 사용자는 트랜잭션 안에서 만들고 끝나면 모두 롤백함
+        try:
+            with transaction.atomic():
+                started_at = time.perf_counter()
+                self.seed_users(options["users"], options["batch_size"])
+                self.stdout.write(
+                    f"seeded {options['users']} users "
+                    f"in {time.perf_counter() - started_at:.1f}s "
+                    f"({connection.vendor})"
+                )
+                self.run_benchmark(options["repeat"])
+                raise RollbackBenchmark
+        except RollbackBenchmark:
+            pass
+
+    def seed_users(self, count, batch_size):
+        thumbnail_url = User._meta.get_field("thumbnail_url").get_default()
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    SEED_USERS_SQL,
+                    [UserAccountType.EMAIL.value, thumbnail_url, count],
+                )
+                cursor.execute('ANALYZE "user"')
+            return
+
+        now = timezone.now()
+        for start in range(1, count + 1, batch_size):
+            User.objects.bulk_create(
+                User(
+                    nickname=hashlib.md5(str(index).encode()).hexdigest()[:8],
+                    email=f"bench{index}@togedog.com",
+                    account_type=UserAccountType.EMAIL.value,
+                    created_at=now - timedelta(seconds=index),
+                )
+                for index in range(start, min(start + batch_size, count + 1))
+            )
+
+    def measure(self, term, repeat):
+        """
+        관리자 사용자 목록 첫 페이지(10개 + 전체 개수)를 구하는 시간(ms)
+        """
+        queryset = search_by_nickname(User.objects.all(), "nickname", term)
+        timings = []
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            list(queryset.order_by("-created_at", "-id")[:11])
+            count = queryset.count()
+            timings.append((time.perf_counter() - started_at) * 1000)
+        return count, statistics.median(timings)
+
+    def run_benchmark(self, repeat):
+        is_postgresql = connection.vendor == "postgresql"
+        for term in SEARCH_TERMS:
+            count, indexed_ms = self.measure(term, repeat)
+            line = f"search={term!r:<8} matches={count:<8} {indexed_ms:9.2f}ms"
+            if is_postgresql:
+                # GIN 인덱스는 bitmap scan으로만 쓰이므로 끄면 인덱스 없는 전체 스캔과 같음
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_bitmapscan = off")
+                    _, seq_scan_ms = self.measure(term, repeat)
+                    cursor.execute("SET LOCAL enable_bitmapscan = on")
+                line += f" (without pg_trgm index: {seq_scan_ms:9.2f}ms)"
+            self.stdout.write(line)
+
+        if is_postgresql:
+            queryset = search_by_nickname(User.objects.all(), "nickname", "c0ff")
+            self.stdout.write(queryset.explain(analyze=True))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from chat.models import ChatReport
+from comments.models import CommentReport
+from posts.models import PostReport
+from users.models import User
+
+
+def count_reports(model):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(reported_user_id=OuterRef("pk"))
+            .order_by()
+            .values("reported_user_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def actual_reported_count():
+    return (
+        count_reports(PostReport)
+        + count_reports(CommentReport)
+        + count_reports(ChatReport)
+    )
+
+
+class Command(BaseCommand):
+    help = "사용자의 신고받은 횟수(reported_count)를 게시글/댓글/채팅 신고 테이블 기준으로 다시 계산"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="값이 틀린 사용자 수만 출력")
+
+    def handle(self, *args, **options):
+        drifted_ids = list(
+            User.objects.annotate(actual_reported_count=actual_reported_count())
+            .exclude(reported_count=F("actual_reported_count"))
+            .values_list("id", flat=True)
+        )
+        if not options["dry_run"] and drifted_ids:
+            User.objects.filter(id__in=drifted_ids).update(
+                reported_count=actual_reported_count()
+            )
+
+        action = "found" if options["dry_run"] else "rebuilt"
+        self.stdout.write(
+            f"{action} {len(drifted_ids)} user(s) with wrong reported_count"
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 4.1 on 2026-10-18 01:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0010_user_user_email_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="user_created_at_id_idx"
+            ),
+        ),
+    ]
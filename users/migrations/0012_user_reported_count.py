@@ -0,0 +1,49 @@
+# Generated by Django 4.1 on 2026-10-18 01:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_reports(model):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(reported_user_id=OuterRef("pk"))
+            .order_by()
+            .values("reported_user_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def fill_reported_count(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    PostReport = apps.get_model("posts", "PostReport")
+    CommentReport = apps.get_model("comments", "CommentReport")
+    ChatReport = apps.get_model("chat", "ChatReport")
+    User.objects.update(
+        reported_count=count_reports(PostReport)
+        + count_reports(CommentReport)
+        + count_reports(ChatReport)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0002_messagesavetest"),
+        ("comments", "0007_alter_comment_content"),
+        ("posts", "0014_post_post_deleted_updated_at_idx"),
+        ("users", "0011_user_user_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="reported_count",
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(fill_reported_count, migrations.RunPython.noop),
+    ]
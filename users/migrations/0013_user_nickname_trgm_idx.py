@@ -0,0 +1,46 @@
+# Generated by Django 4.1 on 2026-10-18 01:35
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    """
+    PostgreSQL 전용 인덱스(GIN, pg_trgm)는 PostgreSQL에서만 만듦
+    - SeparateDatabaseAndState의 database_operations로만 써서 모델 상태(User.Meta.indexes)에는 넣지 않음
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0012_user_reported_count"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                AddPostgresIndex(
+                    model_name="user",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("nickname"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="user_nickname_trgm_idx",
+                    ),
+                ),
+            ],
+        ),
+    ]
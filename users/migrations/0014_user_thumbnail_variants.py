@@ -0,0 +1,18 @@
+# Generated by Django 4.1 on 2026-10-18 01:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0013_user_nickname_trgm_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="thumbnail_variants",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
 
+from cores.images import get_image_variant_url
 from cores.models import (EnumField, TimeStampedModel, UserAccountType,
                           UserStatus, UserType)
 
@@ -19,14 +22,21 @@ class User(TimeStampedModel):
     thumbnail_url = models.CharField(
         max_length=500, default=settings.DEFAULT_USER_THUMBNAIL_URL
     )
+    # thumbnail_url 사진을 줄인 WebP 사진 주소, generate_image_variants 워커가 채움
+    thumbnail_variants = models.JSONField(default=dict, blank=True)
     address = models.CharField(max_length=20, blank=True)
     mbti = models.CharField(max_length=4, default="none")
+    # 게시글/댓글/채팅 메시지로 신고받은 횟수, 신고 생성/삭제 시그널(users/signals.py)로 관리
+    reported_count = models.PositiveIntegerField(default=0, db_index=True)
 
     class Meta:
         db_table = "user"
         indexes = [
             models.Index(fields=["email"], name="user_email_idx"),
+            models.Index(fields=["-created_at", "-id"], name="user_created_at_id_idx"),
         ]
+        # 닉네임 부분 검색(cores.search.search_by_nickname)용 pg_trgm GIN 인덱스 user_nickname_trgm_idx는
+        # PostgreSQL 전용이라 모델에 두지 않고 migrations/0013에서 DB에만 만듦
 
     @property
     def get_user_info_dict(self):
@@ -45,6 +55,21 @@ class User(TimeStampedModel):
     def __str__(self):
         return self.nickname
 
+    @property
+    def avatar_url(self):
+        return get_image_variant_url(
+            self.thumbnail_url, self.thumbnail_variants, "avatar"
+        )
+
+    @classmethod
+    def adjust_reported_count(cls, user_id: int, delta: int):
+        """
+        신고받은 횟수를 delta만큼 DB에서 바로 증감, 0 밑으로는 내려가지 않음
+        """
+        cls.objects.filter(id=user_id).update(
+            reported_count=Greatest(F("reported_count") + delta, 0)
+        )
+
 
 class UserTestCount(models.Model):
     test_count = models.PositiveIntegerField()
@@ -73,5 +73,13 @@ class ModifyUserIn(Schema):
     _validated_nickname = validator("nickname", allow_reuse=True)(validate_name)
 
 
+class AuthCacheStatsOut(Schema):
+    request_hit: int
+    token_hit: int
+    token_miss: int
+    user_hit: int
+    user_miss: int
+
+
 class TestKakaoToken(Schema):
     token: str
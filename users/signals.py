@@ -0,0 +1,93 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, Q, QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from cores.utils import is_cascade_delete
+from users.cache import invalidate_user
+from users.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    사용자 정보 수정(modify_user_info), 비활성화(deactivate_user), 탈퇴(delete_user_account) 등으로
+    User가 저장/삭제되면 인증용 사용자 캐시에서 지워서 다음 요청부터 바로 반영되게 함
+    - 커밋 전에는 다른 요청이 이전 정보를 다시 캐시할 수 있으므로 커밋한 뒤에 한 번 더 지움
+    """
+    user_id = instance.id
+    invalidate_user(user_id)
+    transaction.on_commit(lambda: invalidate_user(user_id))
+
+
+@receiver(post_save, sender="posts.PostReport")
+@receiver(post_save, sender="comments.CommentReport")
+@receiver(post_save, sender="chat.ChatReport")
+def increase_reported_count(sender, instance, created, **kwargs):
+    """
+    report_post, report_comment, report_chat_message로 신고가 생기면
+    신고받은 사용자의 reported_count를 1 올림
+    """
+    if created:
+        User.adjust_reported_count(instance.reported_user_id, 1)
+
+
+@receiver(post_delete, sender="posts.PostReport")
+@receiver(post_delete, sender="comments.CommentReport")
+@receiver(post_delete, sender="chat.ChatReport")
+def decrease_reported_count(sender, instance, origin=None, **kwargs):
+    # 글/사용자와 함께 지워지는 신고는 아래 pre_delete에서 한 번에 줄임
+    if is_cascade_delete(origin, apps.get_model("posts.Post"), User):
+        return
+    User.adjust_reported_count(instance.reported_user_id, -1)
+
+
+def decrease_reported_counts(reports: QuerySet):
+    """
+    곧 지워질 신고(reports)의 수를 신고받은 사용자마다 세서 한 번에 줄임
+    """
+    counts = (
+        reports.order_by()
+        .values("reported_user_id")
+        .annotate(count=Count("id", distinct=True))
+    )
+    for row in counts:
+        User.adjust_reported_count(row["reported_user_id"], -row["count"])
+
+
+@receiver(pre_delete, sender="posts.Post")
+def decrease_reported_count_on_post_delete(sender, instance, origin=None, **kwargs):
+    """
+    delete_post_from_db로 글과 함께 지워지는 글/댓글 신고 수를 신고받은 사용자에게서 줄임
+    """
+    if is_cascade_delete(origin, User):
+        return
+    decrease_reported_counts(
+        apps.get_model("posts.PostReport").objects.filter(post=instance)
+    )
+    decrease_reported_counts(
+        apps.get_model("comments.CommentReport").objects.filter(comment__post=instance)
+    )
+
+
+@receiver(pre_delete, sender=User)
+def decrease_reported_count_on_user_delete(sender, instance, **kwargs):
+    """
+    delete_user_account로 사용자와 함께 지워지는 신고 중 다른 사용자가 신고받은 것의 수를 줄임
+    - 사용자가 한 신고, 사용자의 글/댓글에 달린 신고가 함께 지워짐
+    """
+    reports = [
+        apps.get_model("posts.PostReport").objects.filter(
+            Q(reporter_user=instance) | Q(post__user=instance)
+        ),
+        apps.get_model("comments.CommentReport").objects.filter(
+            Q(reporter_user=instance)
+            | Q(comment__user=instance)
+            | Q(comment__post__user=instance)
+        ),
+        apps.get_model("chat.ChatReport").objects.filter(reporter_user=instance),
+    ]
+    for queryset in reports:
+        decrease_reported_counts(queryset.exclude(reported_user=instance))
@@ -1,17 +1,25 @@
 import json
 import jwt
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from io import StringIO
 from unittest.mock import MagicMock, patch
 
 from django.conf import settings
 from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
 from django.core.files.base import ContentFile
-from django.test import Client, TestCase
+from django.test import Client, RequestFactory, TestCase
 from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
 from django.urls import reverse
 
+from comments.models import Comment, CommentReport
 from cores.utils import create_user_login_response, generate_jwt
+from posts.models import Post, PostReport
+from users.auth import JWTAuthenticator
+from users.cache import DjangoCacheUserBackend, LocalUserBackend, user_backend
 from users.models import User
 
 
@@ -63,6 +71,7 @@ class UserTest(TestCase):
 
     def tearDown(self):
         User.objects.all().delete()
+        cache.clear()
 
 
 class EmailUserSignupTest(UserTest):
@@ -196,10 +205,31 @@ class GetUserListTest(UserTest):
                 },
             ],
             "count": User.objects.all().count(),
+            "next_cursor": None,
         }
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), results)
 
+    def test_success_get_user_list_search_nickname(self):
+        response = self.client.get(
+            reverse("api-1.0.0:get_user_list"),
+            {"search": " 테스 "},
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["id"] for item in response.json()["items"]], [self.test_user_1.id]
+        )
+
+        response = self.client.get(
+            reverse("api-1.0.0:get_user_list"),
+            {"search": "ADM"},
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertEqual(
+            [item["id"] for item in response.json()["items"]], [self.test_admin.id]
+        )
+
     def test_fail_422_get_user_list_by_wrong_date_range(self):
         response = self.client.get(
             reverse("api-1.0.0:get_user_list") + "?date=2022-01-01_2022-12-31",
@@ -374,6 +404,151 @@ class MainLoginCheckTest(UserTest):
         self.assertContains(response, "Method not allowed", status_code=405)
 
 
+class AuthBearerCacheTest(UserTest):
+    def test_success_reuse_cached_user_and_token(self):
+        self.client.post(
+            reverse("api-1.0.0:main_login_check"),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        with self.assertNumQueries(0), patch("users.auth.jwt.decode") as mock_decode:
+            response = self.client.post(
+                reverse("api-1.0.0:main_login_check"),
+                HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+            )
+        mock_decode.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["id"], self.test_user_1.id)
+
+    def test_success_invalidate_cached_user_by_deactivate_user(self):
+        self.client.post(
+            reverse("api-1.0.0:main_login_check"),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.client.patch(
+            reverse(
+                "api-1.0.0:deactivate_user", kwargs={"user_id": self.test_user_1.id}
+            ),
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        response = self.client.post(
+            reverse("api-1.0.0:main_login_check"),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertEqual(response.json()["status"], "banned")
+
+    def test_success_invalidate_cached_user_after_commit(self):
+        stale_user = User.objects.get(id=self.test_user_1.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.test_user_1.status = "banned"
+            self.test_user_1.save()
+            # 커밋 전에 다른 요청이 이전 정보를 다시 캐시함
+            user_backend.set(self.test_user_1.id, stale_user)
+
+        response = self.client.post(
+            reverse("api-1.0.0:main_login_check"),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertEqual(response.json()["status"], "banned")
+
+    def test_fail_400_cached_token_of_deleted_user(self):
+        self.client.post(
+            reverse("api-1.0.0:main_login_check"),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.client.delete(
+            reverse(
+                "api-1.0.0:delete_user_account", kwargs={"user_id": self.test_user_1.id}
+            ),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        response = self.client.post(
+            reverse("api-1.0.0:main_login_check"),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "user does not exist"})
+
+    def test_fail_401_expired_token(self):
+        expired_jwt = jwt.encode(
+            {"user": self.test_user_1.id, "exp": int(time.time()) - 1},
+            settings.SECRET_KEY,
+            algorithm=settings.ALGORITHM,
+        )
+        response = self.client.post(
+            reverse("api-1.0.0:main_login_check"),
+            HTTP_AUTHORIZATION=f"Bearer {expired_jwt}",
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"detail": "token expired"})
+
+
+class JWTAuthenticatorTest(UserTest):
+    def setUp(self):
+        super().setUp()
+        self.authenticator = JWTAuthenticator(LocalUserBackend(maxsize=10, ttl=60))
+        self.request = RequestFactory().get("/")
+
+    def test_success_request_memo(self):
+        user = self.authenticator.authenticate(self.request, self.user_jwt)
+        with self.assertNumQueries(0):
+            memo_user = self.authenticator.authenticate(self.request, self.user_jwt)
+        self.assertIs(memo_user, user)
+        self.assertEqual(self.authenticator.stats()["request_hit"], 1)
+
+    def test_success_stats(self):
+        self.authenticator.authenticate(RequestFactory().get("/"), self.user_jwt)
+        self.authenticator.authenticate(RequestFactory().get("/"), self.user_jwt)
+        stats = self.authenticator.stats()
+        self.assertEqual(stats["user_miss"], 1)
+        self.assertEqual(stats["user_hit"], 1)
+
+    def test_success_concurrent_user_load(self):
+        def slow_get(**kwargs):
+            time.sleep(0.05)
+            return self.test_user_1
+
+        with patch("users.auth.User.objects.get", side_effect=slow_get) as mock_get:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                users = list(
+                    executor.map(
+                        lambda _: self.authenticator.get_user(self.test_user_1.id),
+                        range(8),
+                    )
+                )
+
+        mock_get.assert_called_once_with(id=self.test_user_1.id)
+        self.assertEqual({user.id for user in users}, {self.test_user_1.id})
+        self.assertEqual(self.authenticator.stats()["user_hit"], 7)
+
+    def test_success_django_cache_user_backend(self):
+        backend = DjangoCacheUserBackend(maxsize=10, ttl=60)
+        authenticator = JWTAuthenticator(backend)
+        authenticator.authenticate(RequestFactory().get("/"), self.user_jwt)
+        self.assertEqual(backend.get(self.test_user_1.id).id, self.test_user_1.id)
+
+        backend.delete(self.test_user_1.id)
+        self.assertIsNone(backend.get(self.test_user_1.id))
+
+    def test_success_get_auth_cache_stats(self):
+        response = self.client.get(
+            reverse("api-1.0.0:get_auth_cache_stats"),
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.json()),
+            {"request_hit", "token_hit", "token_miss", "user_hit", "user_miss"},
+        )
+
+    def test_fail_403_get_auth_cache_stats(self):
+        response = self.client.get(
+            reverse("api-1.0.0:get_auth_cache_stats"),
+            HTTP_AUTHORIZATION=f"Bearer {self.user_jwt}",
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {"detail": "forbidden"})
+
+
 class EmailUserLoginTest(UserTest):
     def test_success_email_user_login(self):
         data = {
@@ -446,6 +621,115 @@ class DeleteUserAccountTest(UserTest):
         self.assertEqual(response.json(), {"detail": "Not Found"})
 
 
+class UserReportedCountTest(UserTest):
+    def setUp(self):
+        super().setUp()
+        self.test_post = Post.objects.create(user=self.test_user_1, subject="Test")
+        self.test_comment = Comment.objects.create(
+            user=self.test_user_1, post=self.test_post, content="Test"
+        )
+
+    def assertReportedCount(self, count):
+        self.test_user_1.refresh_from_db()
+        self.assertEqual(self.test_user_1.reported_count, count)
+
+    @patch("chat.api.get_message")
+    def test_reported_count_follows_reports(self, mock_patch):
+        self.client.post(
+            reverse("api-1.0.0:report_post", kwargs={"post_id": self.test_post.id}),
+            data={"content": "test report"},
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertReportedCount(1)
+
+        self.client.post(
+            reverse(
+                "api-1.0.0:report_comment",
+                kwargs={
+                    "post_id": self.test_post.id,
+                    "comment_id": self.test_comment.id,
+                },
+            ),
+            data={"content": "test report"},
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertReportedCount(2)
+
+        mock_patch.return_value = {"sender_id": self.test_user_1.id}
+        self.client.post(
+            reverse("api-1.0.0:report_chat_message"),
+            data=json.dumps(
+                {
+                    "reported_user_id": self.test_user_1.id,
+                    "message_id": "12345",
+                    "message_text": "test message",
+                    "content": "test content",
+                }
+            ),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertReportedCount(3)
+
+        PostReport.objects.all().delete()
+        self.assertReportedCount(2)
+
+    def test_reported_count_follows_cascade_delete(self):
+        for reporter in (self.test_admin, self.test_user_1):
+            PostReport.objects.create(
+                reporter_user=reporter,
+                reported_user=self.test_user_1,
+                post=self.test_post,
+                content="test report",
+            )
+        admin_post = Post.objects.create(user=self.test_admin, subject="admin")
+        PostReport.objects.create(
+            reporter_user=self.test_user_1,
+            reported_user=self.test_admin,
+            post=admin_post,
+            content="test report",
+        )
+        self.assertReportedCount(2)
+
+        # 글과 함께 지워진 신고 수를 한 번에 줄임
+        self.test_post.delete()
+        self.assertReportedCount(0)
+
+        # 탈퇴한 사용자가 한 신고는 신고받은 사용자의 수에서 빠짐
+        self.test_user_1.delete()
+        self.test_admin.refresh_from_db()
+        self.assertEqual(self.test_admin.reported_count, 0)
+
+    def test_get_user_list_filter_by_reported_count(self):
+        CommentReport.objects.create(
+            reporter_user=self.test_admin,
+            reported_user=self.test_user_1,
+            comment=self.test_comment,
+            content="test report",
+        )
+        response = self.client.get(
+            reverse("api-1.0.0:get_user_list"),
+            {"reported": 1},
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_jwt}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(item["id"], item["reported_count"]) for item in response.json()["items"]],
+            [(self.test_user_1.id, 1)],
+        )
+
+    def test_rebuild_user_reported_counts(self):
+        PostReport.objects.create(
+            reporter_user=self.test_admin,
+            reported_user=self.test_user_1,
+            post=self.test_post,
+            content="test report",
+        )
+        User.objects.update(reported_count=10)
+        call_command("rebuild_user_reported_counts", stdout=StringIO())
+        self.assertReportedCount(1)
+
+
 class GetBannedUserListTest(UserTest):
     def test_success_get_banned_user_list(self):
         self.test_user_1.status = "banned"
@@ -471,6 +755,7 @@ class GetBannedUserListTest(UserTest):
                 }
             ],
             "count": 1,
+            "next_cursor": None,
         }
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), results)